@@ -0,0 +1,213 @@
+"""
+Concurrent-session capacity of one worker process.
+
+Runs N simulated sessions at once — the real agents, AgentSession, tools and
+data-channel bridge via src.harness, with a scripted LLM whose first-token
+latency follows a log-normal distribution — and replays booking and order
+conversations (typed turns plus UI form updates). For each N it reports:
+
+- throughput        completed user turns per second
+- turn_ms           user input → reply finished (p50 / p95 / p99), LLM latency included
+- p95_vs_single     p95 turn time relative to the N=1 level
+- cpu_percent       process CPU over the level's wall time (100 = one core)
+- rss_mb_per_session  RSS growth per session while all N are open
+- loop_lag_ms       event-loop lag p95 / p99 and slow callbacks (src.loop_monitor)
+
+Each level runs in a fresh process, after an unmeasured warm-up booking and
+order session. So RSS and CPU cover the N sessions only, not imports, caches or
+memory a previous level left behind.
+
+Worker load thresholds come from the N where p95_vs_single or loop lag
+starts to climb.
+
+Run from the agent/ directory:
+    python -m benchmarks.bench_capacity
+    python -m benchmarks.bench_capacity --sessions 1,10,25,50 --ttft-ms 400 --think-ms 800
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import math
+import multiprocessing
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import psutil
+
+from src.availability import TableAvailability
+from src.dataclass import BOOKING_FORM_ID
+from src.harness import Reply, ScriptedLLM, SessionHarness, tool_returned, user_said
+from src.loop_monitor import LoopMonitor
+from src.menu import MenuCatalog
+
+_FILLER = "Sure, I can help with that. Is there anything else you would like to add before we continue?"
+
+# (user turn, UI messages sent right after it)
+BOOKING_SCRIPT = [
+    ("hi there", []),
+    ("I want to book a table", []),
+    ("I'm Priya Sharma, we are four", []),
+    ("next friday at 8 pm", [("FORM_UPDATE", {"formId": BOOKING_FORM_ID, "values": {"special_requests": "window seat"}})]),
+    ("my number is 9876543210", []),
+    ("that's all, thanks", []),
+]
+ORDER_SCRIPT = [
+    ("hello", []),
+    ("I'd like to order food", []),
+    ("two margherita pizzas please", []),
+    ("and a tiramisu", []),
+    ("actually remove the tiramisu", []),
+    ("that's all, thanks", []),
+]
+
+RULES = [
+    (user_said("book a table"), Reply(tool_calls=[("to_reservation", {})])),
+    (user_said("order food"), Reply(tool_calls=[("to_order_food", {})])),
+    (user_said("priya"), Reply(tool_calls=[("save_booking_fields", {"customer_name": "Priya Sharma", "no_of_guests": 4})])),
+    (user_said("friday"), Reply(tool_calls=[("save_booking_fields", {"reservation_date": "next friday", "reservation_time": "8 pm"})])),
+    (user_said("number is"), Reply(tool_calls=[("save_booking_fields", {"customer_phone": "9876543210"})])),
+    (user_said("margherita"), Reply(tool_calls=[("add_to_cart", {"item": "margherita pizza", "quantity": 2})])),
+    (user_said("remove"), Reply(tool_calls=[("remove_from_cart", {"item": "tiramisu"})])),
+    (user_said("tiramisu"), Reply(tool_calls=[("add_to_cart", {"item": "tiramisu"})])),
+    (tool_returned("save_booking_fields"), Reply("Got it, I have saved that. What else should I note down?")),
+    (tool_returned("add_to_cart"), Reply("Added to your cart. Anything else?")),
+    (tool_returned("remove_from_cart"), Reply("Removed it from your cart.")),
+]
+
+
+def _percentile(values: list[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))]
+
+
+async def _session(
+    index: int,
+    rng: random.Random,
+    ttft_ms: float,
+    ttft_sigma: float,
+    tokens_per_second: float,
+    think_ms: float,
+    availability: TableAvailability,
+    menu: MenuCatalog,
+    turn_ms: list[float],
+    ready: asyncio.Event,
+) -> None:
+    mu = math.log(ttft_ms / 1000)
+    llm = ScriptedLLM(RULES, default=Reply(_FILLER), ttft=lambda: rng.lognormvariate(mu, ttft_sigma), tokens_per_second=tokens_per_second)
+    script = BOOKING_SCRIPT if index % 2 == 0 else ORDER_SCRIPT
+    await asyncio.sleep(rng.uniform(0, think_ms / 1000))   # don't start every session in lockstep
+
+    async with SessionHarness(llm, availability=availability, menu=menu) as h:
+        for text, ui_messages in script:
+            start = time.perf_counter()
+            await h.say(text)
+            turn_ms.append((time.perf_counter() - start) * 1000)
+            for msg_type, payload in ui_messages:
+                h.room.send_ui(msg_type, payload)
+            await asyncio.sleep(rng.expovariate(1000 / think_ms))
+        await ready.wait()   # stay open until every session has finished, so RSS covers all N
+
+
+async def _level(n: int, seed: int, **options: float) -> dict:
+    availability = TableAvailability(":memory:")
+    menu = MenuCatalog()
+    warm_up = asyncio.Event()
+    warm_up.set()
+    # The first booking and order sessions in the process pay for lazy imports and caches — keep them out of the numbers
+    await asyncio.gather(*(
+        _session(i, random.Random(seed + i), turn_ms=[], availability=availability, menu=menu, ready=warm_up, **options)
+        for i in (-2, -1)
+    ))
+
+    gc.collect()
+    process = psutil.Process()
+    rss_before = process.memory_info().rss
+    cpu_before = process.cpu_times()
+    monitor = LoopMonitor(slow_callback_ms=50, sample_seconds=0.01)
+    monitor.start()
+
+    turn_ms: list[float] = []
+    done = asyncio.Event()
+    rss_peak = rss_before
+
+    async def sample_rss() -> None:
+        nonlocal rss_peak
+        while True:
+            rss_peak = max(rss_peak, process.memory_info().rss)
+            await asyncio.sleep(0.05)
+
+    start = time.perf_counter()
+    sampler = asyncio.create_task(sample_rss())
+    sessions = [
+        asyncio.create_task(_session(i, random.Random(seed + i), turn_ms=turn_ms, availability=availability,
+                                     menu=menu, ready=done, **options))
+        for i in range(n)
+    ]
+    expected_turns = sum(len(BOOKING_SCRIPT if i % 2 == 0 else ORDER_SCRIPT) for i in range(n))
+    while len(turn_ms) < expected_turns and not any(t.done() and t.exception() for t in sessions):
+        await asyncio.sleep(0.05)
+    wall = time.perf_counter() - start
+    done.set()
+    await asyncio.gather(*sessions)
+    sampler.cancel()
+    monitor.stop()
+
+    cpu_after = process.cpu_times()
+    cpu = (cpu_after.user - cpu_before.user) + (cpu_after.system - cpu_before.system)
+    return {
+        "sessions": n,
+        "turns": len(turn_ms),
+        "wall_s": round(wall, 2),
+        "throughput_turns_per_s": round(len(turn_ms) / wall, 2),
+        "turn_ms": {f"p{round(q * 100)}": round(_percentile(turn_ms, q), 1) for q in (0.5, 0.95, 0.99)},
+        "cpu_percent": round(cpu / wall * 100, 1),
+        "rss_mb_per_session": round((rss_peak - rss_before) / n / 2**20, 2),
+        "loop_lag_ms": {
+            "p95": round(monitor.lag.percentile(0.95), 1),
+            "p99": round(monitor.lag.percentile(0.99), 1),
+            "slow_callbacks": sum(s.count for s in monitor.agents.values()),
+        },
+    }
+
+
+def _run_level(n: int, seed: int, options: dict[str, float]) -> dict:
+    return asyncio.run(_level(n, seed, **options))
+
+
+def run(
+    sessions: tuple[int, ...] = (1, 5, 10, 20),
+    ttft_ms: float = 300.0,
+    ttft_sigma: float = 0.4,
+    tokens_per_second: float = 200.0,
+    think_ms: float = 300.0,
+    seed: int = 7,
+) -> dict:
+    options = {"ttft_ms": ttft_ms, "ttft_sigma": ttft_sigma, "tokens_per_second": tokens_per_second, "think_ms": think_ms}
+    levels = []
+    for n in sessions:
+        with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+            levels.append(pool.submit(_run_level, n, seed, options).result())
+    single_p95 = levels[0]["turn_ms"]["p95"] or 1.0
+    for level in levels:
+        level["p95_vs_single"] = round(level["turn_ms"]["p95"] / single_p95, 2)
+    return {"levels": levels, "options": options, "baseline_sessions": sessions[0]}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sessions", default="1,5,10,20", help="comma-separated concurrency levels")
+    parser.add_argument("--ttft-ms", type=float, default=300.0, help="median LLM time to first token")
+    parser.add_argument("--ttft-sigma", type=float, default=0.4, help="log-normal sigma of the TTFT")
+    parser.add_argument("--tokens-per-second", type=float, default=200.0)
+    parser.add_argument("--think-ms", type=float, default=300.0, help="mean user pause between turns")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    print(json.dumps(run(
+        tuple(int(n) for n in args.sessions.split(",")),
+        args.ttft_ms, args.ttft_sigma, args.tokens_per_second, args.think_ms, args.seed,
+    ), indent=2))
@@ -0,0 +1,48 @@
+"""
+Throughput benchmark for src.datetime_resolver over the test corpus.
+
+Run from the agent/ directory:
+    python -m benchmarks.bench_datetime_resolver
+"""
+
+import json
+import time
+from datetime import datetime
+from pathlib import Path
+
+from src.datetime_resolver import resolve_date, resolve_time
+
+CORPUS_PATH = Path(__file__).parent.parent / "tests" / "data" / "datetime_corpus.json"
+
+
+def run(rounds: int = 200) -> dict:
+    corpus = json.loads(CORPUS_PATH.read_text())
+    now = datetime.fromisoformat(corpus["now"])
+    dates = [c["text"] for c in corpus["dates"]]
+    times = [c["text"] for c in corpus["times"]]
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for text in dates:
+            resolve_date(text, now)
+    date_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for text in times:
+            resolve_time(text)
+    time_elapsed = time.perf_counter() - start
+
+    date_hits = sum(resolve_date(c["text"], now)[0] == c["expected"] for c in corpus["dates"])
+    time_hits = sum(resolve_time(c["text"])[0] == c["expected"] for c in corpus["times"])
+    return {
+        "date_us_per_call": round(date_elapsed / (rounds * len(dates)) * 1e6, 2),
+        "time_us_per_call": round(time_elapsed / (rounds * len(times)) * 1e6, 2),
+        "date_accuracy": round(date_hits / len(dates), 3),
+        "time_accuracy": round(time_hits / len(times), 3),
+        "corpus_size": len(dates) + len(times),
+    }
+
+
+if __name__ == "__main__":
+    print(json.dumps(run(), indent=2))
@@ -0,0 +1,243 @@
+"""
+Micro-benchmarks for the per-turn and per-message hot paths, with a stored
+baseline to catch regressions in review.
+
+Cases run on realistic fixtures: a 200-item chat history (with tool calls
+and stale state snapshots), a 40-line cart and full booking form. Each case
+reports the fastest of several samples in µs per call, with the GC paused and
+every sample running for at least _MIN_SAMPLE_SECONDS: the minimum is the run
+least disturbed by the rest of the machine, so it is what repeats best.
+Output is stable JSON (sorted keys, rounded values) so baselines diff cleanly.
+
+Run from the agent/ directory:
+    python -m benchmarks.bench_hot_paths                   # print results
+    python -m benchmarks.bench_hot_paths --save-baseline   # write benchmarks/baselines/hot_paths.json
+    python -m benchmarks.bench_hot_paths --compare         # exit 1 if a case is >25% (and >2 µs) slower than the baseline
+
+Baselines are machine-specific: regenerate them on the machine that compares.
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import sys
+import time
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from types import SimpleNamespace
+
+from livekit import rtc
+from livekit.agents import llm
+from livekit.agents.voice import ModelSettings
+
+from src.agents.reservation import Reservation
+from src.dataclass import BOOKING_FORM_ID, ORDER_FORM_ID, OrderFormData, UserData
+from src.fn import send_to_ui, summarize_agent_handoff
+from src.harness import FakeRoom, Reply, ScriptedLLM
+
+BASELINE_PATH = Path(__file__).parent / "baselines" / "hot_paths.json"
+DEFAULT_TOLERANCE = 0.25
+# Differences below this many µs per call are timer / scheduler noise, never a regression
+NOISE_FLOOR_US = 2.0
+
+_HISTORY_TURNS = 50      # x 4 items (user, tool call, tool output, assistant) = 200 items
+_CART_LINES = 40
+_REPEATS = 15
+_MIN_SAMPLE_SECONDS = 0.05
+
+BOOKING = {
+    "customer_name": "Priya Sharma",
+    "customer_phone": "9876543210",
+    "no_of_guests": 4,
+    "reservation_date": "2026-10-24",
+    "reservation_time": "19:30",
+    "special_requests": "window seat, high chair",
+}
+
+
+# ── Fixtures ────────────────────────────────────────────────────────────
+
+
+def cart_items(lines: int = _CART_LINES) -> list[dict]:
+    return [
+        {"id": i, "name": f"Dish {i}", "price": 150.0 + i, "quantity": 1 + i % 3, "category": "Mains",
+         "emoji": "🍝", "description": "House special with seasonal vegetables"}
+        for i in range(1, lines + 1)
+    ]
+
+
+def long_history(turns: int = _HISTORY_TURNS) -> llm.ChatContext:
+    ctx = llm.ChatContext.empty()
+    ctx.add_message(role="system", content="You are the reservation assistant. " * 20)
+    for i in range(turns):
+        if i % 10 == 0:
+            ctx.add_message(role="system", content=f"{Reservation._STATE_MARKER}\nstale snapshot {i}")
+        ctx.add_message(role="user", content=f"For {i % 8 + 1} people on friday at half past seven, name Priya")
+        ctx.items.append(llm.FunctionCall(call_id=f"c{i}", name="save_booking_fields",
+                                          arguments=json.dumps({"no_of_guests": i % 8 + 1})))
+        ctx.items.append(llm.FunctionCallOutput(call_id=f"c{i}", name="save_booking_fields",
+                                                output='{"saved": ["no_of_guests"], "errors": {}}', is_error=False))
+        ctx.add_message(role="assistant", content="Got it. What time would you like the table for?")
+    return ctx
+
+
+def full_userdata() -> UserData:
+    userdata = UserData()
+    userdata.booking.update(BOOKING)
+    userdata.order.update({"items": cart_items()})
+    userdata.update_meta({"current_page": "booking", "page_switch_trigger": None})
+    return userdata
+
+
+def _packet(msg_type: str, payload: dict) -> rtc.DataPacket:
+    data = json.dumps({"id": "msg_1", "timestamp": 0, "type": msg_type, "payload": payload}).encode()
+    return rtc.DataPacket(data=data, kind=rtc.DataPacketKind.KIND_RELIABLE, participant=None, topic="ui-to-agent")
+
+
+def _reservation(userdata: UserData) -> Reservation:
+    agent = Reservation(None)
+    agent._userdata = userdata
+    agent.UI_DEBOUNCE_SECONDS = 3600   # keep the debounced reply from ever firing
+    return agent
+
+
+# ── Timing ──────────────────────────────────────────────────────────────
+
+
+def _time_sync(fn: Callable[[], object], number: int, min_seconds: float = _MIN_SAMPLE_SECONDS) -> float:
+    samples = []
+    gc.collect()
+    gc.disable()
+    try:
+        for _ in range(_REPEATS):
+            calls, start = 0, time.perf_counter()
+            while True:
+                for _ in range(number):
+                    fn()
+                calls += number
+                elapsed = time.perf_counter() - start
+                if elapsed >= min_seconds:
+                    break
+            samples.append(elapsed / calls * 1e6)
+    finally:
+        gc.enable()
+    return min(samples)
+
+
+async def _time_async(fn: Callable[[], Awaitable[object]], number: int, min_seconds: float = _MIN_SAMPLE_SECONDS) -> float:
+    samples = []
+    gc.collect()
+    gc.disable()
+    try:
+        for _ in range(_REPEATS):
+            calls, start = 0, time.perf_counter()
+            while True:
+                for _ in range(number):
+                    await fn()
+                calls += number
+                elapsed = time.perf_counter() - start
+                if elapsed >= min_seconds:
+                    break
+            samples.append(elapsed / calls * 1e6)
+    finally:
+        gc.enable()
+    return min(samples)
+
+
+# ── Cases ───────────────────────────────────────────────────────────────
+
+
+def _sync_cases(scale: float) -> dict[str, float]:
+    n = lambda base: max(1, int(base * scale))  # noqa: E731
+    userdata = full_userdata()
+    agent = _reservation(userdata)
+    history = long_history()
+    settings = ModelSettings()
+    tools = agent.tools
+    items = cart_items()
+
+    def rebuild_context() -> None:
+        agent.llm_node(history, tools, settings)   # an unstarted async generator: only our context work runs
+
+    return {
+        "userdata_summarize": _time_sync(userdata.summarize, n(2000)),
+        "summarize_form_booking": _time_sync(lambda: userdata.summarize_form(BOOKING_FORM_ID), n(5000)),
+        "summarize_form_order_40_lines": _time_sync(lambda: userdata.summarize_form(ORDER_FORM_ID), n(2000)),
+        "order_form_update_40_lines": _time_sync(lambda: OrderFormData().update({"items": items}), n(1000)),
+        "reservation_llm_node_200_items": _time_sync(rebuild_context, n(300)),
+    }
+
+
+async def _async_cases(scale: float) -> dict[str, float]:
+    n = lambda base: max(1, int(base * scale))  # noqa: E731
+    agent = _reservation(full_userdata())
+    booking_packet = _packet("FORM_UPDATE", {"formId": BOOKING_FORM_ID, "values": BOOKING})
+    order_packet = _packet("FORM_UPDATE", {"formId": ORDER_FORM_ID, "values": {"items": cart_items()}})
+
+    async def on_data(packet: rtc.DataPacket) -> None:
+        agent._on_data_received(packet)
+
+    ctx = SimpleNamespace(room=FakeRoom("bench-room"))
+    prefill = {"formId": ORDER_FORM_ID, "values": full_userdata().order.to_dict()}
+
+    async def publish() -> None:
+        await send_to_ui(ctx, "FORM_PREFILL", prefill)
+        ctx.room.published.clear()
+
+    summarizer = ScriptedLLM(default=Reply("The user is booking a table for four on friday at 7:30."))
+    short_prev, long_prev = long_history(1), long_history()
+    current = llm.ChatContext.empty()
+    current.add_message(role="system", content="You are the order assistant.")
+
+    try:
+        return {
+            "on_data_received_form_update_booking": await _time_async(lambda: on_data(booking_packet), n(2000)),
+            "on_data_received_form_update_order_40_lines": await _time_async(lambda: on_data(order_packet), n(1000)),
+            "send_to_ui_form_prefill_40_lines": await _time_async(publish, n(1000)),
+            "handoff_merge_short": await _time_async(lambda: summarize_agent_handoff(short_prev, current, summarizer), n(1000)),
+            "handoff_merge_200_items": await _time_async(lambda: summarize_agent_handoff(long_prev, current, summarizer), n(50)),
+        }
+    finally:
+        agent._debounce_task.cancel()
+        await summarizer.aclose()
+
+
+def run(scale: float = 1.0) -> dict:
+    results = {**_sync_cases(scale), **asyncio.run(_async_cases(scale))}
+    return {
+        "us_per_call": {name: round(value, 2) for name, value in sorted(results.items())},
+        "fixtures": {"history_items": len(long_history().items), "cart_lines": _CART_LINES},
+    }
+
+
+def compare(results: dict, baseline: dict, tolerance: float = DEFAULT_TOLERANCE) -> dict:
+    """Per case: baseline, current and ratio; regressions are cases slower than 1 + tolerance
+    and by more than NOISE_FLOOR_US."""
+    cases, regressions = {}, []
+    for name, current in results["us_per_call"].items():
+        before = baseline["us_per_call"].get(name)
+        ratio = round(current / before, 2) if before else None
+        cases[name] = {"baseline": before, "current": current, "ratio": ratio}
+        if ratio is not None and ratio > 1 + tolerance and current - before > NOISE_FLOOR_US:
+            regressions.append(name)
+    return {"cases": cases, "noise_floor_us": NOISE_FLOOR_US, "regressions": regressions, "tolerance": tolerance}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Hot-path micro-benchmarks")
+    parser.add_argument("--save-baseline", action="store_true", help=f"write results to {BASELINE_PATH.name}")
+    parser.add_argument("--compare", action="store_true", help="compare against the stored baseline")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply iteration counts (e.g. 0.1 for a smoke run)")
+    args = parser.parse_args()
+
+    results = run(args.scale)
+    if args.save_baseline:
+        BASELINE_PATH.parent.mkdir(exist_ok=True)
+        BASELINE_PATH.write_text(json.dumps(results, indent=2, sort_keys=True) + "\n")
+    if args.compare:
+        report = compare(results, json.loads(BASELINE_PATH.read_text()), args.tolerance)
+        print(json.dumps(report, indent=2, sort_keys=True))
+        sys.exit(1 if report["regressions"] else 0)
+    print(json.dumps(results, indent=2, sort_keys=True))
@@ -0,0 +1,57 @@
+"""
+Accuracy and latency benchmark for the Greeter's local intent fast path.
+
+Reports how many labelled utterances are routed without the LLM, how often
+those routes are right, and how long one classification takes.
+
+Run from the agent/ directory:
+    python -m benchmarks.bench_intent
+"""
+
+import json
+import time
+from pathlib import Path
+
+from src.intent import IntentClassifier
+from src.variables import INTENT_FAST_PATH_MIN_CONFIDENCE
+
+UTTERANCES_PATH = Path(__file__).parent.parent / "tests" / "data" / "intent_utterances.json"
+
+
+def run(rounds: int = 500, min_confidence: float = INTENT_FAST_PATH_MIN_CONFIDENCE) -> dict:
+    cases = json.loads(UTTERANCES_PATH.read_text())
+    texts = [c["text"] for c in cases]
+
+    start = time.perf_counter()
+    classifier = IntentClassifier()
+    train_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for text in texts:
+            classifier.classify(text)
+    elapsed = time.perf_counter() - start
+
+    correct = routed = routed_correct = requests = 0
+    for case in cases:
+        result = classifier.classify(case["text"])
+        correct += result.intent == case["intent"]
+        requests += case["intent"] != "other"
+        if result.routes(min_confidence):
+            routed += 1
+            routed_correct += result.intent == case["intent"]
+
+    return {
+        "train_ms": round(train_ms, 3),
+        "us_per_classify": round(elapsed / (rounds * len(texts)) * 1e6, 2),
+        "accuracy": round(correct / len(cases), 3),
+        "fast_path_precision": round(routed_correct / routed, 3) if routed else None,
+        "fast_path_recall": round(routed_correct / requests, 3) if requests else None,
+        "routed": routed,
+        "utterance_count": len(cases),
+        "min_confidence": min_confidence,
+    }
+
+
+if __name__ == "__main__":
+    print(json.dumps(run(), indent=2))
@@ -0,0 +1,63 @@
+"""
+Latency and prompt-size benchmark for src.knowledge.KnowledgeBase.
+
+Compares a cold BM25 ranking with a cached lookup, and the tokens one
+lookup_info result adds to the prompt with pasting the whole knowledge base.
+
+Run from the agent/ directory:
+    python -m benchmarks.bench_knowledge
+"""
+
+import json
+import time
+from pathlib import Path
+
+from src.knowledge import KnowledgeBase, _terms
+
+QUERIES_PATH = Path(__file__).parent.parent / "tests" / "data" / "faq_queries.json"
+CHARS_PER_TOKEN = 4
+
+
+def run(rounds: int = 500) -> dict:
+    cases = json.loads(QUERIES_PATH.read_text())
+    queries = [c["query"] for c in cases]
+
+    start = time.perf_counter()
+    kb = KnowledgeBase()
+    build_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for query in queries:
+            kb._rank(_terms(query))
+    cold = time.perf_counter() - start
+
+    kb.warm()
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for query in queries:
+            kb.search(query, k=2)
+    cached = time.perf_counter() - start
+
+    hits = 0
+    returned_chars = 0
+    for case in cases:
+        matches = kb.search(case["query"], k=2)
+        hits += (matches[0].passage.id if matches else None) == case["expected"]
+        returned_chars += sum(len(m.passage.text) for m in matches)
+    total_chars = sum(len(p.text) for p in kb.passages)
+
+    return {
+        "build_ms": round(build_ms, 3),
+        "us_per_rank": round(cold / (rounds * len(queries)) * 1e6, 2),
+        "us_per_cached_search": round(cached / (rounds * len(queries)) * 1e6, 2),
+        "cache_hit_rate": round(kb.stats.hit_rate, 3),
+        "accuracy": round(hits / len(cases), 3),
+        "tokens_per_lookup": round(returned_chars / len(cases) / CHARS_PER_TOKEN),
+        "tokens_whole_knowledge_base": round(total_chars / CHARS_PER_TOKEN),
+        "passage_count": len(kb.passages),
+    }
+
+
+if __name__ == "__main__":
+    print(json.dumps(run(), indent=2))
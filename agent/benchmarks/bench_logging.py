@@ -0,0 +1,143 @@
+"""
+Event-loop time spent in agent_flow logging: synchronous FileHandler vs the
+queue pipeline in src.log_pipeline.
+
+Each call logs a UI payload the way send_to_ui does. Only the caller's time is
+measured — that is the time the event loop is blocked. The "slow disk" rows
+add 1 ms per write to show a disk stall reaching (or not reaching) the loop.
+
+Like in a livekit job process, the root logger carries livekit's IPC
+LogQueueHandler (format + pickle on the caller), so a logger that still
+propagates pays for it on every call — "queued_propagating" shows that cost.
+
+Run from the agent/ directory:
+    python -m benchmarks.bench_logging
+"""
+
+import contextlib
+import json
+import logging
+import socket
+import tempfile
+import threading
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
+from livekit.agents.ipc.log_queue import LogQueueHandler
+from livekit.agents.utils.aio.duplex_unix import DuplexClosed, _Duplex
+
+from src.log_pipeline import JsonFormatter, start_queue_logging
+
+PAYLOAD = {
+    "formId": "booking",
+    "values": {"customer_name": "Priya Sharma", "customer_phone": "9876543210", "no_of_guests": 4,
+               "reservation_date": "2026-10-24", "reservation_time": "19:30", "special_requests": "window seat"},
+}
+_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+_BURST = 20
+_GAP_SECONDS = 0.005
+
+
+class _SlowFileHandler(logging.FileHandler):
+    def emit(self, record: logging.LogRecord) -> None:
+        time.sleep(0.001)
+        super().emit(record)
+
+
+def _file_handler(path: Path, slow: bool) -> logging.Handler:
+    handler = (_SlowFileHandler if slow else logging.FileHandler)(path)
+    handler.setFormatter(logging.Formatter(_FORMAT))
+    return handler
+
+
+@contextlib.contextmanager
+def _job_root_handler() -> Iterator[None]:
+    """Attach livekit's IPC log handler to the root logger, with a thread draining the other end."""
+    job_sock, main_sock = socket.socketpair()
+    main = _Duplex.open(main_sock)
+
+    def drain() -> None:
+        with contextlib.suppress(DuplexClosed):
+            while True:
+                main.recv_bytes()
+
+    drainer = threading.Thread(target=drain, daemon=True)
+    drainer.start()
+    handler = LogQueueHandler(_Duplex.open(job_sock))
+    root = logging.getLogger()
+    root.addHandler(handler)
+    try:
+        yield
+    finally:
+        root.removeHandler(handler)
+        handler.close()
+        handler.thread.join()
+        drainer.join()
+        main.close()
+
+
+def _time_calls(logger: logging.Logger, rounds: int, lazy: bool) -> float:
+    """Caller time per call. Calls come in short bursts with idle gaps, like a real turn,
+    so the writer thread drains between bursts instead of competing for the GIL throughout."""
+    elapsed = 0.0
+    for burst in range(0, rounds, _BURST):
+        start = time.perf_counter()
+        for _ in range(min(_BURST, rounds - burst)):
+            if lazy:
+                logger.info("📤 Sent to UI: %s - %s", "FORM_PREFILL", PAYLOAD, extra={"category": "ui_io"})
+            else:
+                logger.info(f"📤 Sent to UI: FORM_PREFILL - {PAYLOAD}")
+        elapsed += time.perf_counter() - start
+        time.sleep(_GAP_SECONDS)
+    return elapsed / rounds * 1e6
+
+
+def _sync(tmp: Path, name: str, rounds: int, slow: bool) -> float:
+    logger = logging.getLogger(f"bench.{name}")
+    logger.setLevel(logging.INFO)
+    handler = _file_handler(tmp / f"{name}.log", slow)
+    logger.addHandler(handler)
+    try:
+        return _time_calls(logger, rounds, lazy=False)
+    finally:
+        logger.removeHandler(handler)
+        handler.close()
+
+
+def _queued(
+    tmp: Path, name: str, rounds: int, slow: bool, sample_rates: dict | None = None, propagate: bool = False
+) -> float:
+    logger = logging.getLogger(f"bench.{name}")
+    logger.setLevel(logging.INFO)
+    json_handler = logging.FileHandler(tmp / f"{name}.jsonl")
+    json_handler.setFormatter(JsonFormatter())
+    listener = start_queue_logging(logger, [_file_handler(tmp / f"{name}.log", slow), json_handler], sample_rates)
+    logger.propagate = propagate  # start_queue_logging turns it off; back on to show what it saved
+    try:
+        return _time_calls(logger, rounds, lazy=True)
+    finally:
+        listener.stop()   # drains the queue — not counted, it runs off the loop in production
+        for handler in listener.handlers:
+            handler.close()
+
+
+def run(rounds: int = 2000) -> dict:
+    with tempfile.TemporaryDirectory() as tmp_dir, _job_root_handler():
+        tmp = Path(tmp_dir)
+        slow_rounds = max(1, rounds // 10)
+        return {
+            "us_per_call": {
+                "sync_file": round(_sync(tmp, "sync", rounds, slow=False), 2),
+                "queued": round(_queued(tmp, "queued", rounds, slow=False), 2),
+                "queued_propagating": round(_queued(tmp, "propagating", rounds, slow=False, propagate=True), 2),
+                "queued_sampled_10pct": round(_queued(tmp, "sampled", rounds, slow=False, sample_rates={"ui_io": 0.1}), 2),
+                "sync_file_slow_disk": round(_sync(tmp, "sync_slow", slow_rounds, slow=True), 2),
+                "queued_slow_disk": round(_queued(tmp, "queued_slow", slow_rounds, slow=True), 2),
+            },
+            "rounds": rounds,
+        }
+
+
+if __name__ == "__main__":
+    print(json.dumps(run(), indent=2))
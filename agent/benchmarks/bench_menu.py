@@ -0,0 +1,45 @@
+"""
+Latency benchmark for src.menu.MenuCatalog.search over the test query set.
+
+Run from the agent/ directory:
+    python -m benchmarks.bench_menu
+"""
+
+import json
+import time
+from pathlib import Path
+
+from src.menu import MenuCatalog
+
+QUERIES_PATH = Path(__file__).parent.parent / "tests" / "data" / "menu_queries.json"
+
+
+def run(rounds: int = 500) -> dict:
+    cases = json.loads(QUERIES_PATH.read_text())
+    queries = [c["query"] for c in cases]
+
+    start = time.perf_counter()
+    menu = MenuCatalog()
+    build_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for query in queries:
+            menu.search(query)
+    elapsed = time.perf_counter() - start
+
+    hits = 0
+    for case in cases:
+        matches = menu.search(case["query"])
+        hits += (matches[0].item.name if matches else None) == case["expected"]
+    return {
+        "build_ms": round(build_ms, 3),
+        "us_per_search": round(elapsed / (rounds * len(queries)) * 1e6, 2),
+        "searches_per_second": int(rounds * len(queries) / elapsed),
+        "accuracy": round(hits / len(cases), 3),
+        "query_count": len(cases),
+    }
+
+
+if __name__ == "__main__":
+    print(json.dumps(run(), indent=2))
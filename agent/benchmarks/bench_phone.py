@@ -0,0 +1,40 @@
+"""
+Throughput benchmark for src.phone.normalize_phone over the test corpus.
+
+Run from the agent/ directory:
+    python -m benchmarks.bench_phone
+"""
+
+import json
+import time
+from pathlib import Path
+
+from src.phone import normalize_phone
+
+CORPUS_PATH = Path(__file__).parent.parent / "tests" / "data" / "phone_corpus.json"
+
+
+def run(rounds: int = 500) -> dict:
+    corpus = json.loads(CORPUS_PATH.read_text())
+    texts = [c["text"] for c in corpus]
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for text in texts:
+            normalize_phone(text)
+    elapsed = time.perf_counter() - start
+
+    hits = 0
+    for case in corpus:
+        result = normalize_phone(case["text"])
+        hits += (result.digits if result.ok else None) == case["expected"]
+    return {
+        "us_per_call": round(elapsed / (rounds * len(texts)) * 1e6, 2),
+        "calls_per_second": int(rounds * len(texts) / elapsed),
+        "accuracy": round(hits / len(corpus), 3),
+        "corpus_size": len(corpus),
+    }
+
+
+if __name__ == "__main__":
+    print(json.dumps(run(), indent=2))
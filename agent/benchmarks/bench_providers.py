@@ -0,0 +1,513 @@
+"""
+Provider benchmark over our own prompts: replays a corpus of recorded chat
+contexts, with the tools each call offered, against registered LLM_MODELS
+entries (src/agent.py) or a local OpenAI-compatible stand-in server, and
+compares them.
+
+Per target:
+- ttft_ms / duration_ms      p50 / p95 over every request
+- tokens_per_second          completion tokens over the time after the first token
+- tool_choice_accuracy       same tool names called as the reference answer (no tools when it made none)
+- tool_args_accuracy         ...and identical arguments, over cases where the reference called tools
+- cost_usd                   from RATE_TABLE (and RATE_TABLE_PATH overrides)
+- throughput_rps             at the given --concurrency
+
+The corpus is one of:
+- LLM recorder files (logs/llm/<room>-<job id>.jsonl, see src/llm_recorder.py): full
+  message lists are rebuilt from the incremental entries, and the recorded
+  production response is the reference answer
+- a corpus file saved with --save-corpus (one case per line; edit the
+  "expected" answers by hand to curate it)
+- by default, the prompts our agents send during the scripted booking and
+  order conversations of bench_capacity, run through the offline harness
+
+Tools are offered by name, resolved against the current agents' tools, so
+the schemas are the ones production sends today. Registered providers need
+their API keys (.env.local); the stand-in needs nothing and measures the
+client side of the pipeline.
+
+Run from the agent/ directory:
+    python -m benchmarks.bench_providers local
+    python -m benchmarks.bench_providers groq:llama-70b-versatile mistral:mistral-large-latest cerebras:gpt-oss-120b \\
+        --corpus logs/llm/*.jsonl --concurrency 4 --repeats 2
+    python -m benchmarks.bench_providers --corpus logs/llm/*.jsonl --save-corpus prompts.jsonl
+    python -m benchmarks.bench_providers --serve 8089        # stand-in only, for a client on another host
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import random
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+from aiohttp import web
+from livekit.agents import llm
+from livekit.agents.types import APIConnectOptions
+from livekit.plugins import openai
+
+from benchmarks.bench_capacity import BOOKING_SCRIPT, ORDER_SCRIPT, RULES
+from src.agents.greeter import Greeter
+from src.agents.order_food import OrderFood
+from src.agents.reservation import Reservation
+from src.harness import LLMRequest, Reply, ScriptedLLM, SessionHarness
+from src.log_pipeline import log_context
+from src.usage import RateTable
+
+LOCAL = "local"
+_CHARS_PER_TOKEN = 4
+
+
+# ── Corpus ──────────────────────────────────────────────────────────────
+
+
+@dataclass
+class Case:
+    id:       str
+    agent:    str | None
+    messages: list[dict[str, Any]]                 # OpenAI chat format
+    tools:    list[str]                            # tool names offered
+    expected_text:  str = ""
+    expected_calls: list[dict[str, Any]] = field(default_factory=list)   # [{"name", "arguments": {...}}]
+
+
+def _arguments(raw: Any) -> Any:
+    if isinstance(raw, str):
+        try:
+            return json.loads(raw or "{}")
+        except ValueError:
+            return raw
+    return raw
+
+
+def cases_from_llm_recording(path: str) -> list[Case]:
+    """Rebuild each request's full message list from an LLM recorder file; its response is the reference."""
+    requests: dict[tuple, dict[str, Any]] = {}
+    responses: dict[tuple, dict[str, Any]] = {}
+    history: dict[tuple, list[dict[str, Any]]] = {}   # per session and model, as the recorder's prefixes are
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            # Keyed by session too, so a file holding several sessions never splices or mispairs them
+            session = (entry.get("room"), entry.get("job"))
+            if entry.get("type") == "request":
+                key = (*session, entry.get("model", ""))
+                messages = history.get(key, [])[: entry.get("message_offset", 0)] + entry.get("messages", [])
+                history[key] = messages
+                requests[(*session, entry["id"])] = {**entry, "messages": messages}
+            elif entry.get("type") == "response":
+                responses[(*session, entry["id"])] = entry
+
+    cases = []
+    for key, request in requests.items():
+        response = responses.get(key)
+        if response is None or "error" in response:
+            continue
+        cases.append(Case(
+            id=f"{request.get('room') or 'no_room'}:{request['id']}",
+            agent=request.get("agent"),
+            messages=request["messages"],
+            tools=request.get("tools", []),
+            expected_text=response.get("content") or "",
+            expected_calls=[{"name": c["name"], "arguments": _arguments(c.get("arguments"))} for c in response.get("tool_calls") or []],
+        ))
+    return cases
+
+
+def load_corpus(paths: list[str]) -> list[Case]:
+    """LLM recorder files or saved corpus files, told apart by their lines."""
+    cases = []
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            first = next((json.loads(line) for line in f if line.strip()), {})
+        if first.get("type") in ("request", "response"):
+            cases.extend(cases_from_llm_recording(path))
+        else:
+            with open(path, encoding="utf-8") as f:
+                cases.extend(Case(**json.loads(line)) for line in f if line.strip())
+    return cases
+
+
+def save_corpus(cases: list[Case], path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        for case in cases:
+            f.write(json.dumps(asdict(case), ensure_ascii=False) + "\n")
+
+
+class _CapturingLLM(ScriptedLLM):
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.captured: list[tuple[str | None, list[dict[str, Any]], list[str], Reply]] = []
+
+    def answer(self, request: LLMRequest) -> Reply:
+        reply = super().answer(request)
+        messages, _ = request.chat_ctx.to_provider_format("openai")
+        self.captured.append((log_context().get("agent"), messages, request.tools, reply))
+        return reply
+
+
+async def harness_corpus() -> list[Case]:
+    """The prompts our agents send in bench_capacity's scripted conversations, with the scripted answers."""
+    cases = []
+    for name, script in (("booking", BOOKING_SCRIPT), ("order", ORDER_SCRIPT)):
+        capturing = _CapturingLLM(RULES, default=Reply("Sure, I can help with that. Anything else?"))
+        async with SessionHarness(capturing) as h:
+            for text, ui_messages in script:
+                await h.say(text)
+                for msg_type, payload in ui_messages:
+                    h.room.send_ui(msg_type, payload)
+            await asyncio.sleep(h.debounce_seconds * 2)
+            await h.wait_for(lambda: h.session.agent_state == "listening")
+        for i, (agent, messages, tools, reply) in enumerate(capturing.captured):
+            cases.append(Case(
+                id=f"{name}:{i}",
+                agent=agent,
+                messages=messages,
+                tools=tools,
+                expected_text=reply.text,
+                expected_calls=[{"name": n, "arguments": args} for n, args in reply.tool_calls],
+            ))
+    return cases
+
+
+def to_chat_ctx(messages: list[dict[str, Any]]) -> llm.ChatContext:
+    ctx = llm.ChatContext.empty()
+    call_names: dict[str, str] = {}
+    for message in messages:
+        role, content = message.get("role"), message.get("content")
+        if isinstance(content, list):
+            content = "".join(part.get("text", "") for part in content if isinstance(part, dict))
+        if role in ("system", "developer", "user"):
+            ctx.add_message(role="system" if role == "developer" else role, content=content or "")
+        elif role == "assistant":
+            if content:
+                ctx.add_message(role="assistant", content=content)
+            for tool_call in message.get("tool_calls") or []:
+                function = tool_call.get("function", {})
+                arguments = function.get("arguments", "{}")
+                call_id = tool_call.get("id") or ""
+                call_names[call_id] = function.get("name", "")
+                ctx.items.append(llm.FunctionCall(
+                    call_id=call_id,
+                    name=function.get("name", ""),
+                    arguments=arguments if isinstance(arguments, str) else json.dumps(arguments),
+                ))
+        elif role == "tool":
+            call_id = message.get("tool_call_id") or ""
+            ctx.items.append(llm.FunctionCallOutput(
+                call_id=call_id,
+                name=message.get("name") or call_names.get(call_id, ""),
+                output=str(content or ""),
+                is_error=False,
+            ))
+    return ctx
+
+
+def agent_tools() -> dict[str, Any]:
+    """Every tool our agents can offer, by name (never called here, only described to the model)."""
+    tools: dict[str, Any] = {}
+    for agent in (Greeter(None), Reservation(None), OrderFood(None)):
+        for tool in agent.tools:
+            tools.setdefault(tool.info.name, tool)
+    return tools
+
+
+# ── Stand-in server ─────────────────────────────────────────────────────
+
+
+def _prompt_key(messages: list[dict[str, Any]]) -> str:
+    """The last few messages' role and text — what identifies a corpus prompt after client re-serialization."""
+    tail = [(m.get("role"), m.get("content") if isinstance(m.get("content"), str) else None) for m in messages[-3:]]
+    return hashlib.blake2b(json.dumps(tail).encode(), digest_size=12).hexdigest()
+
+
+class StandInServer:
+    """OpenAI-compatible streaming /v1/chat/completions that answers corpus prompts with their reference answer."""
+
+    def __init__(
+        self,
+        cases: list[Case],
+        ttft_ms: float = 200.0,
+        tokens_per_second: float = 150.0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        self.answers = {_prompt_key(c.messages): c for c in cases}
+        self.ttft_ms = ttft_ms
+        self.tokens_per_second = tokens_per_second
+        self.host = host
+        self.port = port
+        self._runner: web.AppRunner | None = None
+
+    async def start(self) -> str:
+        app = web.Application()
+        app.router.add_post("/v1/chat/completions", self._chat)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+        return f"http://{self.host}:{self.port}/v1"
+
+    async def aclose(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+    async def _chat(self, request: web.Request) -> web.StreamResponse:
+        body = await request.json()
+        messages = body.get("messages", [])
+        case = self.answers.get(_prompt_key(messages))
+        text = case.expected_text if case else "Okay."
+        calls = case.expected_calls if case else []
+        offered = {t.get("function", {}).get("name") for t in body.get("tools") or []}
+        calls = [c for c in calls if c["name"] in offered]
+
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+        chunk_id, created, model = f"chatcmpl-{random.getrandbits(48):x}", int(time.time()), body.get("model", "standin")
+
+        async def send(choices: list[dict[str, Any]], usage: dict[str, int] | None = None) -> None:
+            chunk = {"id": chunk_id, "object": "chat.completion.chunk", "created": created, "model": model, "choices": choices}
+            if usage is not None:
+                chunk["usage"] = usage
+            await response.write(f"data: {json.dumps(chunk)}\n\n".encode())
+
+        await asyncio.sleep(self.ttft_ms / 1000)
+        words = text.split(" ") if text else []
+        for i, word in enumerate(words):
+            if i:
+                await asyncio.sleep(1 / self.tokens_per_second)
+            await send([{"index": 0, "delta": {"role": "assistant", "content": word if i == 0 else f" {word}"}, "finish_reason": None}])
+        for i, call in enumerate(calls):
+            await send([{"index": 0, "delta": {"role": "assistant", "tool_calls": [{
+                "index": i,
+                "id": f"call_{random.getrandbits(32):x}",
+                "type": "function",
+                "function": {"name": call["name"], "arguments": json.dumps(call["arguments"])},
+            }]}, "finish_reason": None}])
+        await send([{"index": 0, "delta": {}, "finish_reason": "tool_calls" if calls else "stop"}])
+        prompt_tokens = sum(len(str(m.get("content") or "")) for m in messages) // _CHARS_PER_TOKEN
+        completion_tokens = max(len(words), 1)
+        await send([], {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens, "total_tokens": prompt_tokens + completion_tokens})
+        await response.write(b"data: [DONE]\n\n")
+        await response.write_eof()
+        return response
+
+
+# ── Benchmark ───────────────────────────────────────────────────────────
+
+
+def _percentile(values: list[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))]
+
+
+def _resolve(target: str, local_url: str | None) -> tuple[llm.LLM, RateTable]:
+    if target == LOCAL:
+        return openai.LLM(model="standin", base_url=local_url, api_key="standin"), RateTable({})
+    # Imported here: src.agent builds the production models (and needs their API keys) at import
+    from src.agent import LLM_MODELS, RATE_TABLE
+    from src.fn import get_provider
+    from src.variables import RATE_TABLE_PATH
+
+    provider, _, model_key = target.partition(":")
+    return get_provider(LLM_MODELS, provider, model_key), RateTable(RATE_TABLE, RATE_TABLE_PATH)
+
+
+async def _measure(instance: llm.LLM, case: Case, tools: dict[str, Any], timeout: float) -> dict[str, Any]:
+    offered = [tools[name] for name in case.tools if name in tools]
+    chat_ctx = to_chat_ctx(case.messages)
+    start = time.perf_counter()
+    first = None
+    calls: list[llm.FunctionToolCall] = []
+    usage = None
+    try:
+        async with instance.chat(chat_ctx=chat_ctx, tools=offered, conn_options=APIConnectOptions(max_retry=0, timeout=timeout)) as stream:
+            async for chunk in stream:
+                if chunk.delta is not None:
+                    if first is None and (chunk.delta.content or chunk.delta.tool_calls):
+                        first = time.perf_counter()
+                    calls.extend(chunk.delta.tool_calls or [])
+                if chunk.usage is not None:
+                    usage = chunk.usage
+    except Exception as e:   # a provider error is a result, not a crash
+        return {"id": case.id, "error": f"{type(e).__name__}: {e}"}
+    end = time.perf_counter()
+
+    got = sorted(c.name for c in calls)
+    want = sorted(c["name"] for c in case.expected_calls)
+    tool_choice = got == want
+    tool_args = None
+    if want:
+        tool_args = tool_choice and all(
+            any(c.name == e["name"] and _arguments(c.arguments) == e["arguments"] for c in calls)
+            for e in case.expected_calls
+        )
+    completion_tokens = usage.completion_tokens if usage else 0
+    return {
+        "id": case.id,
+        "agent": case.agent,
+        "ttft_ms": round(((first or end) - start) * 1000, 1),
+        "duration_ms": round((end - start) * 1000, 1),
+        "tokens_per_second": round(completion_tokens / (end - first), 1) if first and end > first and completion_tokens else None,
+        "prompt_tokens": usage.prompt_tokens if usage else 0,
+        "completion_tokens": completion_tokens,
+        "tool_calls": got,
+        "tool_choice_correct": tool_choice,
+        "tool_args_correct": tool_args,
+    }
+
+
+async def bench_target(
+    target: str,
+    cases: list[Case],
+    concurrency: int = 4,
+    repeats: int = 1,
+    timeout: float = 30.0,
+    local_url: str | None = None,
+) -> dict[str, Any]:
+    instance, rates = _resolve(target, local_url)
+    tools = agent_tools()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(case: Case) -> dict[str, Any]:
+        async with semaphore:
+            return await _measure(instance, case, tools, timeout)
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(one(case) for _ in range(repeats) for case in cases))
+    wall = time.perf_counter() - start
+    await instance.aclose()
+
+    ok = [r for r in results if "error" not in r]
+    errors = [r["error"] for r in results if "error" in r]
+    ttft = [r["ttft_ms"] for r in ok]
+    duration = [r["duration_ms"] for r in ok]
+    tps = [r["tokens_per_second"] for r in ok if r["tokens_per_second"] is not None]
+    with_args = [r["tool_args_correct"] for r in ok if r["tool_args_correct"] is not None]
+    prompt_tokens = sum(r["prompt_tokens"] for r in ok)
+    completion_tokens = sum(r["completion_tokens"] for r in ok)
+    cost = rates.llm_cost(instance.model, prompt_tokens, completion_tokens)
+    return {
+        "model": instance.model,
+        "requests": len(results),
+        "errors": len(errors),
+        "error_samples": errors[:3],
+        "ttft_ms": {"p50": _percentile(ttft, 0.5), "p95": _percentile(ttft, 0.95)},
+        "duration_ms": {"p50": _percentile(duration, 0.5), "p95": _percentile(duration, 0.95)},
+        "tokens_per_second": {"p50": _percentile(tps, 0.5)},
+        "tool_choice_accuracy": round(sum(r["tool_choice_correct"] for r in ok) / len(ok), 3) if ok else 0.0,
+        "tool_args_accuracy": round(sum(with_args) / len(with_args), 3) if with_args else None,
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "cost_usd": round(cost, 6),
+        "cost_per_1k_requests_usd": round(cost / len(ok) * 1000, 4) if ok else None,
+        "throughput_rps": round(len(results) / wall, 2),
+        "cases": results,
+    }
+
+
+def _ranking(targets: dict[str, dict[str, Any]]) -> dict[str, list[tuple[str, Any]]]:
+    """Targets ordered best-first per metric; targets without a value are left out."""
+    metrics = {
+        "ttft_p50_ms": (lambda r: r["ttft_ms"]["p50"], False),
+        "duration_p95_ms": (lambda r: r["duration_ms"]["p95"], False),
+        "tokens_per_second_p50": (lambda r: r["tokens_per_second"]["p50"], True),
+        "tool_choice_accuracy": (lambda r: r["tool_choice_accuracy"], True),
+        "tool_args_accuracy": (lambda r: r["tool_args_accuracy"], True),
+        "cost_per_1k_requests_usd": (lambda r: r["cost_per_1k_requests_usd"], False),
+    }
+    ranking = {}
+    for name, (value, descending) in metrics.items():
+        rows = [(target, value(r)) for target, r in targets.items() if r["requests"] > r["errors"] and value(r) is not None]
+        ranking[name] = sorted(rows, key=lambda row: row[1], reverse=descending)
+    return ranking
+
+
+async def _run(
+    targets: list[str],
+    cases: list[Case],
+    concurrency: int,
+    repeats: int,
+    timeout: float,
+    local_url: str | None,
+    standin_ttft_ms: float,
+    per_case: bool,
+) -> dict[str, Any]:
+    server = None
+    if LOCAL in targets and local_url is None:
+        server = StandInServer(cases, ttft_ms=standin_ttft_ms)
+        local_url = await server.start()
+    try:
+        results = {}
+        for target in targets:   # one at a time, so targets don't compete for the client's CPU
+            results[target] = await bench_target(target, cases, concurrency, repeats, timeout, local_url)
+    finally:
+        if server is not None:
+            await server.aclose()
+    report = {
+        "targets": results,
+        "ranking": _ranking(results),
+        "corpus": {"cases": len(cases), "with_tool_calls": sum(bool(c.expected_calls) for c in cases)},
+        "options": {"concurrency": concurrency, "repeats": repeats},
+    }
+    if not per_case:
+        for result in results.values():
+            del result["cases"]
+    return report
+
+
+def run(
+    targets: list[str],
+    corpus: list[str] | None = None,
+    concurrency: int = 4,
+    repeats: int = 1,
+    timeout: float = 30.0,
+    local_url: str | None = None,
+    standin_ttft_ms: float = 200.0,
+    per_case: bool = False,
+    cases: list[Case] | None = None,
+) -> dict[str, Any]:
+    if cases is None:
+        cases = load_corpus(corpus) if corpus else asyncio.run(harness_corpus())
+    return asyncio.run(_run(targets, cases, concurrency, repeats, timeout, local_url, standin_ttft_ms, per_case))
+
+
+async def _serve(cases: list[Case], port: int, ttft_ms: float) -> None:
+    server = StandInServer(cases, ttft_ms=ttft_ms, host="0.0.0.0", port=port)
+    print(f"stand-in listening on {await server.start()}", flush=True)
+    await asyncio.Event().wait()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark LLM providers on recorded prompts")
+    parser.add_argument("targets", nargs="*", help='"local" or <provider>:<model key in LLM_MODELS>, e.g. groq:llama-70b-versatile')
+    parser.add_argument("--corpus", nargs="+", help="LLM recorder files (logs/llm/*.jsonl) or saved corpus files")
+    parser.add_argument("--save-corpus", help="write the loaded corpus here (one case per line)")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--repeats", type=int, default=1)
+    parser.add_argument("--timeout", type=float, default=30.0, help="per-request timeout in seconds")
+    parser.add_argument("--local-url", help="an already running stand-in (or other OpenAI-compatible server) for target 'local'")
+    parser.add_argument("--standin-ttft-ms", type=float, default=200.0)
+    parser.add_argument("--per-case", action="store_true", help="include every request's result")
+    parser.add_argument("--serve", type=int, metavar="PORT", help="only run the stand-in server")
+    args = parser.parse_args()
+
+    corpus_cases = load_corpus(args.corpus) if args.corpus else asyncio.run(harness_corpus())
+    if args.save_corpus:
+        save_corpus(corpus_cases, args.save_corpus)
+        print(json.dumps({"saved": args.save_corpus, "cases": len(corpus_cases)}))
+    if args.serve:
+        asyncio.run(_serve(corpus_cases, args.serve, args.standin_ttft_ms))
+    elif args.targets:
+        print(json.dumps(run(
+            args.targets, args.corpus, args.concurrency, args.repeats, args.timeout,
+            args.local_url, args.standin_ttft_ms, args.per_case, corpus_cases,
+        ), indent=2))
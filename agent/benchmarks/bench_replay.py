@@ -0,0 +1,70 @@
+"""
+Replays a recorded production session (logs/recordings/<room>-<job id>.jsonl.gz, see
+src/session_recorder.py) through the current code, offline, and compares
+per-turn latency:
+
+- recorded          user message → agent speaking, as it happened in production
+- replay            the same turn on this checkout, with the recorded LLM
+                    outputs (and, with --recorded-latency, their recorded TTFT)
+- baseline          a replay saved earlier with --out, e.g. on the previous
+                    release, to compare two code versions on the same session
+
+Replays run in text mode: no STT / TTS / audio, so "speaking" is the first
+reply text, and the difference to the recording is provider plus audio time.
+
+Run from the agent/ directory:
+    python -m benchmarks.bench_replay logs/recordings/room-abc-AJ_x1y2.jsonl.gz --speed 0
+    python -m benchmarks.bench_replay logs/recordings/room-abc-AJ_x1y2.jsonl.gz --recorded-latency --out /tmp/v1.jsonl
+    python -m benchmarks.bench_replay logs/recordings/room-abc-AJ_x1y2.jsonl.gz --recorded-latency --baseline /tmp/v1.jsonl
+"""
+
+import argparse
+import asyncio
+import json
+import math
+
+from src.session_recorder import load_recording, turn_latencies
+from src.session_replay import replay
+
+
+def _percentile(values: list[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))]
+
+
+def _summary(turns: list[dict]) -> dict:
+    values = [t["speaking_ms"] for t in turns if t["speaking_ms"] is not None]
+    return {"turns": len(values), **{f"p{round(q * 100)}": _percentile(values, q) for q in (0.5, 0.95)}}
+
+
+def run(path: str, speed: float = 0.0, recorded_latency: bool = False, out: str | None = None, baseline: str | None = None) -> dict:
+    recording = load_recording(path)
+    replayed = asyncio.run(replay(recording, speed=speed, recorded_latency=recorded_latency))
+    if out:
+        replayed.write(out)
+
+    columns = {"recorded": turn_latencies(recording.events), "replay": turn_latencies(replayed.events)}
+    if baseline:
+        columns["baseline"] = turn_latencies(load_recording(baseline).events)
+    rows = [
+        {"text": turn["text"], **{name: (turns[i]["speaking_ms"] if i < len(turns) else None) for name, turns in columns.items()}}
+        for i, turn in enumerate(columns["recorded"])
+    ]
+    return {
+        "turns": rows,
+        "summary": {name: _summary(turns) for name, turns in columns.items()},
+        "options": {"speed": speed, "recorded_latency": recorded_latency},
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay a recorded session and compare turn latency")
+    parser.add_argument("recording", help="logs/recordings/<room>-<job id>.jsonl.gz")
+    parser.add_argument("--speed", type=float, default=0.0, help="1 = recorded pacing, 0 = back to back")
+    parser.add_argument("--recorded-latency", action="store_true", help="delay each LLM call by its recorded TTFT")
+    parser.add_argument("--out", help="save the replay's own recording here")
+    parser.add_argument("--baseline", help="an earlier replay (--out) to compare against")
+    args = parser.parse_args()
+    print(json.dumps(run(args.recording, args.speed, args.recorded_latency, args.out, args.baseline), indent=2))
@@ -32,10 +32,45 @@ from livekit.plugins.turn_detector.multilingual import MultilingualModel
 from src.agents.order_food import OrderFood
 from src.dataclass import UserData, RunContext_T
 from src.logger_config import agent_flow
+from src.log_pipeline import bind_log_context
 from src.tasks import CollectReservationInfo
 from src.fn import summarize_agent_handoff, send_to_ui, get_provider
 from src.agents.greeter import Greeter
 from src.agents.reservation import Reservation
+from src.availability import TableAvailability
+from src.table_search import TableSearch
+from src.menu import MenuCatalog
+from src.knowledge import KnowledgeBase
+from src.intent import IntentClassifier
+from src.cascade import CascadeLLM, LARGE, SMALL
+from src.jsonl_stream import GzipJsonlWriter
+from src.llm_recorder import LLMRecorder, install_llm_recorder
+from src.loop_monitor import LoopMonitor
+from src.profiler import Profiler
+from src.session_recorder import SessionRecorder
+from src.tracing import LatencyHistograms, TurnTracer
+from src.usage import RateTable, UsageLedger
+from src.variables import (
+    AVAILABILITY_DB_PATH,
+    LATENCY_EXPORT_SECONDS,
+    LATENCY_METRICS_PATH,
+    LLM_CASCADE_ENABLED,
+    LLM_CASCADE_SMALL,
+    LLM_RECORDER_DIR,
+    LLM_RECORDER_ENABLED,
+    LOOP_LAG_SAMPLE_SECONDS,
+    LOOP_METRICS_PATH,
+    LOOP_MONITOR_ENABLED,
+    LOOP_SLOW_CALLBACK_MS,
+    PROFILE_ON_START_SECONDS,
+    PROFILER_DIR,
+    PROFILER_ENABLED,
+    PROFILER_INTERVAL_MS,
+    RATE_TABLE_PATH,
+    SESSION_RECORDING_DIR,
+    SESSION_RECORDING_ENABLED,
+    SESSION_REPORT_DIR,
+)
 
 
 # HTTP level debug
@@ -73,7 +108,7 @@ LLM_MODELS = [
 ]
 
 TEMPERATURE = os.getenv("LLM_TEMPERATURE", "0.0")
-PARALLEL_TOOL_CALLS = os.getenv("LLM_PARALLEL_TOOL_CALLS", "false").lower() in ["true", "1", "yes"]
+PARALLEL_TOOL_CALLS = os.getenv("LLM_PARALLEL_TOOL_CALLS", "true").lower() in ["true", "1", "yes"]
 TOOL_CHOICE = os.getenv("LLM_TOOL_CHOICE", "auto")
 
 LLM_MODELS = {
@@ -121,6 +156,53 @@ LLM_MODELS = {
 
 
 
+# USD rates per provider — check the providers' pricing pages when adding models.
+# llm: per 1M tokens (input, output) · tts: per 1M characters · stt: per audio minute.
+# Entries in a JSON file at RATE_TABLE_PATH (same shape) override these (see src/usage.py).
+RATE_TABLE: dict[str, dict[str, dict]] = {
+    "llm": {
+        "groq": {
+            "llama-3.1-8b-instant":    (0.05, 0.08),
+            "llama-3.3-70b-versatile": (0.59, 0.79),
+            # Compound systems bill their underlying models — approximated by the main one
+            "groq/compound":           (0.59, 0.79),
+            "groq/compound-mini":      (0.59, 0.79),
+        },
+        "mistral": {
+            "mistral-large-latest":    (2.00, 6.00),
+        },
+        "cerebras": {
+            "qwen-3-32b":              (0.40, 0.80),
+            "gpt-oss-120b":            (0.35, 0.75),
+            "zai-glm-4.7":             (2.25, 2.75),
+        },
+        "modal.com": {
+            "zai-org/GLM-5-FP8":       (0.00, 0.00),  # self-hosted, billed per GPU-second
+        },
+    },
+    "tts": {
+        "deepgram": {
+            "aura-2-thalia-en":    30.0,
+            "aura-2-andromeda-en": 30.0,
+            "aura-2-helena-en":    30.0,
+            "aura-2-odysseus-en":  30.0,
+            "aura-asteria-en":     15.0,
+        },
+    },
+    "stt": {
+        "deepgram": {
+            "nova-3": 0.0077,
+            "nova-2": 0.0058,
+        },
+    },
+}
+
+# USD per 1M tokens (input, output) per model, for the cascade's per-tier cost logging
+LLM_PRICES_PER_MILLION: dict[str, tuple[float, float]] = {
+    model: rates for provider in RATE_TABLE["llm"].values() for model, rates in provider.items()
+}
+
+
 # IS_STT_ENABLED and IS_TTS_ENABLED FROM .env
 IS_TTS_ENABLED = os.getenv("IS_TTS_ENABLED", "true").lower() in ["true", "1", "yes"]
 IS_STT_ENABLED = os.getenv("IS_STT_ENABLED", "true").lower() in ["true", "1", "yes"]
@@ -132,6 +214,34 @@ models = {
     "stt": lambda: deepgram.STT() if IS_STT_ENABLED else None,  # Using STT instead of STTv2
     "vad": silero.VAD.load(),
 }
+if LLM_CASCADE_ENABLED:
+    try:
+        models["small_llm"] = get_provider(LLM_MODELS, *LLM_CASCADE_SMALL.split(":", 1))
+    except Exception as e:   # unknown model or missing API key — run on models["llm"] alone
+        agent_flow.warning("🪜 Cascade disabled, small model %s unavailable: %s", LLM_CASCADE_SMALL, e)
+
+# Request / response bodies of every LLM call → logs/llm/<room>-<job id>.jsonl. The hooks sit on the shared
+# clients; each request finds its session through the log context bound in my_agent.
+if LLM_RECORDER_ENABLED:
+    llm_recorder = LLMRecorder(LLM_RECORDER_DIR)
+    for name in ("llm", "small_llm"):
+        if name in models:
+            install_llm_recorder(models[name], llm_recorder)
+
+
+def build_session_llm():
+    """The session LLM — a per-session cascade over the shared models, so its stats are per session."""
+    if "small_llm" not in models:
+        return models["llm"]
+    small, large = models["small_llm"], models["llm"]
+    return CascadeLLM(
+        small=small,
+        large=large,
+        prices={
+            SMALL: LLM_PRICES_PER_MILLION.get(small.model, (0.0, 0.0)),
+            LARGE: LLM_PRICES_PER_MILLION.get(large.model, (0.0, 0.0)),
+        },
+    )
 
 
 
@@ -139,6 +249,20 @@ server = AgentServer()
 
 def prewarm(proc: JobProcess):
     proc.userdata["vad"] = silero.VAD.load()
+    proc.userdata["availability"] = TableAvailability(AVAILABILITY_DB_PATH)
+    proc.userdata["table_search"] = TableSearch(proc.userdata["availability"])
+    proc.userdata["menu"] = MenuCatalog()
+    proc.userdata["knowledge"] = KnowledgeBase()
+    proc.userdata["knowledge"].warm()
+    proc.userdata["intent_classifier"] = IntentClassifier()
+    proc.userdata["latency"] = LatencyHistograms()
+    proc.userdata["rates"] = RateTable(RATE_TABLE, RATE_TABLE_PATH)
+    proc.userdata["loop_monitor"] = LoopMonitor(LOOP_SLOW_CALLBACK_MS, LOOP_LAG_SAMPLE_SECONDS)
+    proc.userdata["profiler"] = Profiler(
+        PROFILER_DIR,
+        PROFILER_INTERVAL_MS,
+        loop_monitor=proc.userdata["loop_monitor"] if LOOP_MONITOR_ENABLED else None,  # room / agent tags
+    )
 
 
 server.setup_fnc = prewarm
@@ -151,21 +275,49 @@ async def my_agent(ctx: JobContext):
     ctx.log_context_fields = {
         "room": ctx.room.name,
     }
+    bind_log_context(room=ctx.room.name, job=ctx.job.id)  # room / agent / turn ids on every agent_flow record
+    loop_monitor: LoopMonitor = ctx.proc.userdata["loop_monitor"]
+    if LOOP_MONITOR_ENABLED:
+        loop_monitor.start()  # once per process; stalls are attributed through the log context above
+    if PROFILER_ENABLED:
+        profiler: Profiler = ctx.proc.userdata["profiler"]
+        await profiler.install()  # idle until SIGUSR2 / the control socket asks for a capture
+        if PROFILE_ON_START_SECONDS > 0:
+            profile_task = asyncio.create_task(profiler.capture(PROFILE_ON_START_SECONDS))
+
+            async def _stop_profile() -> None:
+                profile_task.cancel()   # the capture thread still writes its files
+
+            ctx.add_shutdown_callback(_stop_profile)
     
     userdata = UserData()
     userdata.job_ctx = ctx  # Store context for sending messages
+    userdata.availability = ctx.proc.userdata["availability"]
+    userdata.table_search = ctx.proc.userdata["table_search"]
+    userdata.menu = ctx.proc.userdata["menu"]
+    userdata.knowledge = ctx.proc.userdata["knowledge"]
+    userdata.intent_classifier = ctx.proc.userdata["intent_classifier"]
     userdata.agents.update({
         "greeter": Greeter(models["tts"]("thalia")),
         "reservation": Reservation(models["tts"]("odysseus")),
         "order_food": OrderFood(models["tts"]("odysseus")),  # Reusing Reservation agent for orders
     })
     userdata.usage_collector = metrics.UsageCollector()
+    userdata.usage = UsageLedger(ctx.proc.userdata["rates"])
+
+    session_llm = build_session_llm()
+    if isinstance(session_llm, CascadeLLM):
+        async def _log_cascade_summary() -> None:
+            agent_flow.info("🪜 Cascade summary: %s", session_llm.stats.summary())
+            await session_llm.aclose()
+
+        ctx.add_shutdown_callback(_log_cascade_summary)
 
     # Set up a voice AI pipeline using OpenAI, Cartesia, AssemblyAI, and the LiveKit turn detector
     session = AgentSession[UserData](
         userdata=userdata,
         stt=models["stt"](),
-        llm=models["llm"],
+        llm=session_llm,
         tts=models["tts"]("thalia"),
         turn_detection=MultilingualModel(),
         vad=ctx.proc.userdata["vad"],
@@ -175,6 +327,76 @@ async def my_agent(ctx: JobContext):
     @session.on("metrics_collected")
     def _on_metrics_collected(ev: MetricsCollectedEvent):
         userdata.usage_collector.collect(ev.metrics)
+        userdata.speech_ledger.on_metrics_collected(ev)
+        userdata.usage.on_metrics_collected(ev)
+
+    # Per-reply delivered vs discarded accounting (interrupts, agent switches, barge-in)
+    session.on("speech_created", userdata.speech_ledger.on_speech_created)
+
+    async def _log_wasted_work() -> None:
+        agent_flow.info("📉 Delivered vs discarded work per agent: %s", userdata.speech_ledger.summary())
+
+    ctx.add_shutdown_callback(_log_wasted_work)
+
+    # Per-turn latency span trees + process-wide p50/p95/p99, exported for Prometheus
+    latency: LatencyHistograms = ctx.proc.userdata["latency"]
+    tracer = TurnTracer(latency, room=ctx.room.name, agent_name=lambda: type(session.current_agent).__name__)
+    session.on("metrics_collected", tracer.on_metrics_collected)
+    session.on("speech_created", tracer.on_speech_created)
+    session.on("function_tools_executed", tracer.on_function_tools_executed)
+
+    async def _export_latency() -> None:
+        while True:
+            await asyncio.sleep(LATENCY_EXPORT_SECONDS)
+            await asyncio.to_thread(latency.write_prometheus, LATENCY_METRICS_PATH)
+            if LOOP_MONITOR_ENABLED:
+                await asyncio.to_thread(loop_monitor.write_prometheus, LOOP_METRICS_PATH)
+
+    export_task = asyncio.create_task(_export_latency())
+
+    async def _close_tracer() -> None:
+        export_task.cancel()
+        tracer.close()
+        await asyncio.to_thread(latency.write_prometheus, LATENCY_METRICS_PATH)
+        agent_flow.info("⏱️ Latency percentiles: %s", latency.snapshot())
+
+    ctx.add_shutdown_callback(_close_tracer)
+
+    # Timeline and transcript, streamed to a gzip JSONL file as the session runs (src/session_recorder.py)
+    # Room names can be reused — the job id keeps each session in its own file
+    recording_path = os.path.join(SESSION_RECORDING_DIR, f"{ctx.room.name}-{ctx.job.id}.jsonl.gz")
+    if SESSION_RECORDING_ENABLED:
+        recorder = SessionRecorder(ctx.room.name, start_agent="greeter", stream=GzipJsonlWriter(recording_path))
+        recorder.attach(session, ctx.room)
+        ctx.add_shutdown_callback(recorder.aclose)   # only the footer is left to write
+
+    async def _write_session_report() -> None:
+        session_report = ctx.make_session_report(session)
+        report = {
+            # The full history and event list are already in the recording — skip dumping them again at shutdown
+            "session": {
+                "job_id": session_report.job_id,
+                "room": session_report.room,
+                "started_at": session_report.started_at,
+                "items": len(session_report.chat_history.items),
+                "recording": recording_path,
+            } if SESSION_RECORDING_ENABLED else session_report.to_dict(),
+            "usage": userdata.usage.report(),
+            "wasted_work": userdata.speech_ledger.summary(),
+            "event_loop": loop_monitor.session_summary(ctx.room.name),
+        }
+        agent_flow.info("🐢 Event loop stalls: %s", report["event_loop"])
+        agent_flow.info("💰 Session usage: %s per agent: %s", report["usage"]["total"], report["usage"]["per_agent"])
+
+        def write() -> None:
+            os.makedirs(SESSION_REPORT_DIR, exist_ok=True)
+            # Room names can be reused — one report per job, like the session recording
+            with open(os.path.join(SESSION_REPORT_DIR, f"{ctx.room.name}-{ctx.job.id}.json"), "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2, default=str)
+
+        await asyncio.to_thread(write)
+
+    ctx.add_shutdown_callback(_write_session_report)
 
     await session.start(
         agent=userdata.agents["greeter"],
@@ -3,6 +3,7 @@
 from livekit.agents import (
     Agent,
     function_tool,
+    llm,
 )
 from livekit import rtc
 
@@ -10,8 +11,38 @@ import asyncio
 import json
 
 from src.logger_config import agent_flow  # Centralized logging
-from src.dataclass import UserData, RunContext_T
+from src.dataclass import BOOKING_FORM_ID, UserData, RunContext_T
 from src.fn import summarize_agent_handoff
+from src.log_pipeline import update_log_context
+from src.speech_ledger import AGENT_SWITCH, UI_UPDATE, active_speech_id
+from src.ui_scheduler import (
+    DEFER,
+    INTERRUPT,
+    NEXT_TURN_GRACE_SECONDS,
+    InterruptCost,
+    UIUpdate,
+    UIUpdateStats,
+    decide,
+)
+from src.usage import Usage
+
+# Estimated schema tokens per (agent class, active tool names). Only the count is kept — the
+# provider plugins serialize the tools themselves. Tool schemas never change at runtime, so this
+# is shared by every session in the process.
+_TOOL_SCHEMA_TOKENS: dict[tuple[str, frozenset[str]], int] = {}
+_CHARS_PER_TOKEN = 4  # rough estimate, good enough to compare tool sets
+
+
+def _tool_name(tool) -> str | None:
+    if llm.is_function_tool(tool) or llm.is_raw_function_tool(tool):
+        return tool.info.name
+    return None  # provider tools are never pruned
+
+
+def _tool_schema(tool) -> dict:
+    if llm.is_raw_function_tool(tool):
+        return tool.info.raw_schema
+    return llm.utils.build_legacy_openai_schema(tool)
 
 
 class BaseAgent(Agent):
@@ -28,6 +59,79 @@ class BaseAgent(Agent):
         "home":    "greeter",
     }
 
+    # How long rapid UI messages are batched before the LLM sees them
+    UI_DEBOUNCE_SECONDS: float = 1.0
+
+    def _active_tool_names(self, userdata: UserData) -> set[str] | None:
+        """Override in subclasses to expose only the tools still relevant for this turn.
+        None keeps every tool."""
+        return None
+
+    def llm_node(self, chat_ctx: llm.ChatContext, tools, model_settings):
+        """Prune the tool set for this turn, then run the default LLM node."""
+        stream = Agent.default.llm_node(self, chat_ctx, self._prune_tools(tools), model_settings)
+        return self._track_llm_text(stream)
+
+    def tts_node(self, text, model_settings):
+        """Default TTS node, counting the characters synthesized for the current reply."""
+        return Agent.default.tts_node(self, self._track_tts_text(text), model_settings)
+
+    def _speech_record(self):
+        speech_id = active_speech_id()
+        userdata: UserData | None = getattr(self, "_userdata", None)
+        if speech_id is None or userdata is None:
+            return None
+        return userdata.speech_ledger.track(speech_id, self.__class__.__name__)
+
+    async def _track_llm_text(self, stream):
+        record = self._speech_record()
+        try:
+            async for chunk in stream:
+                if record is not None:
+                    content = chunk if isinstance(chunk, str) else (chunk.delta.content if chunk.delta else None)
+                    if content:
+                        record.llm_text += content
+                yield chunk
+        finally:
+            await stream.aclose()
+
+    async def _track_tts_text(self, text):
+        record = self._speech_record()
+        async for chunk in text:
+            if record is not None:
+                record.tts_chars += len(chunk)
+            yield chunk
+
+    def _prune_tools(self, tools: list) -> list:
+        userdata: UserData | None = getattr(self, "_userdata", None)
+        active = self._active_tool_names(userdata) if userdata is not None else None
+        if active is None:
+            return tools
+
+        kept = [t for t in tools if _tool_name(t) is None or _tool_name(t) in active]
+        full_tokens = self._tool_schema_tokens(tools)
+        kept_tokens = self._tool_schema_tokens(kept)
+        saved = full_tokens - kept_tokens
+        self._tool_tokens_saved = getattr(self, "_tool_tokens_saved", 0) + saved
+        agent_flow.info(
+            "🧰 %s: %d/%d tools active, ~%d prompt tokens saved this call",
+            self.__class__.__name__, len(kept), len(tools), saved,
+            extra={"category": "tool_prune"},
+        )
+        return kept
+
+    def _tool_schema_tokens(self, tools: list) -> int:
+        """Estimated prompt tokens of the tools' JSON schemas, cached per tool-set signature."""
+        signature = frozenset(name for name in map(_tool_name, tools) if name is not None)
+        key = (self.__class__.__name__, signature)
+        tokens = _TOOL_SCHEMA_TOKENS.get(key)
+        if tokens is None:
+            serialized = json.dumps(
+                [_tool_schema(t) for t in sorted(tools, key=lambda t: _tool_name(t) or "") if _tool_name(t)]
+            )
+            tokens = _TOOL_SCHEMA_TOKENS[key] = len(serialized) // _CHARS_PER_TOKEN
+        return tokens
+
     async def on_enter(self) -> None:
         agent_name = self.__class__.__name__
         agent_flow.info(f"🚀 ENTERING AGENT: {agent_name}")
@@ -35,12 +139,19 @@ class BaseAgent(Agent):
         # Store references used by the sync callback so self.session is never
         # accessed after this agent has exited (avoids "no activity context" error)
         self._userdata: UserData = self.session.userdata
+        self._userdata.speech_ledger.current_agent = agent_name
+        update_log_context(agent=agent_name)
+        # Usage from here on — handoff summary included — is booked to this activation
+        self._activation = self._userdata.usage.begin_activation(agent_name) if self._userdata.usage else None
         self._room = self.session.userdata.job_ctx.room
         self._room.on("data_received", self._on_data_received)
 
         # Silence watchdog: if agent goes silent for too long, say a fallback
         self._silence_watchdog_task: asyncio.Task | None = None
         self.session.on("agent_state_changed", self._on_agent_state_changed)
+
+        # Parallel tool calls queue their FORM_PREFILLs — send them as soon as the batch is done
+        self.session.on("function_tools_executed", self._on_function_tools_executed)
         
         userdata: UserData = self.session.userdata
         chat_ctx = self.chat_ctx.copy()
@@ -88,15 +199,31 @@ class BaseAgent(Agent):
         msg = json.loads(packet.data.decode())
         msg_type = msg.get("type")
         payload = msg.get("payload", {})
-        agent_flow.info(f"📥 UI→Agent: type={msg_type} payload={payload}")
+        agent_flow.info("📥 UI→Agent: type=%s payload=%s", msg_type, payload, extra={"category": "ui_io"})
 
         if msg_type in ("FORM_UPDATE", "FORM_SUBMITTED"):
             form_id = payload.get("formId")
             values = payload.get("values", {})
             if form_id and values:
+                # A changed saved value makes anything the agent is saying about it wrong
+                # (cart lists grow with every click — only scalar fields count as corrections)
+                corrected = any(
+                    self._userdata.get_field(form_id, key) not in (None, value)
+                    for key, value in values.items()
+                    if not isinstance(value, (list, dict))
+                )
+                stale_hold = self._userdata.take_stale_table_hold(values) if form_id == BOOKING_FORM_ID else []
                 self._userdata.apply_form_update(form_id, values)
-                agent_flow.info(f"✅ Form updated: {form_id} → {values}")
-                self._queue_llm_update(f"User updated form '{form_id}' with values: {values}")
+                agent_flow.info("✅ Form updated: %s → %s", form_id, values, extra={"category": "ui_io"})
+                if stale_hold:
+                    self._release_hold_task = asyncio.get_running_loop().create_task(
+                        self._release_table_hold(stale_hold)
+                    )
+                self._queue_llm_update(
+                    f"User updated form '{form_id}' with values: {values}",
+                    fields=frozenset(values),
+                    urgent=msg_type == "FORM_SUBMITTED" or corrected,
+                )
 
         elif msg_type == "SESSION_SYNC":
             # Fired once when agent first joins — full UI state snapshot
@@ -153,11 +280,18 @@ class BaseAgent(Agent):
                 else:
                     self._queue_llm_update(f"User navigated to page: {page}")
 
-    def _queue_llm_update(self, update_text: str):
+    async def _release_table_hold(self, hold_ids: list[int]) -> None:
+        """Release table holds taken for a slot the booking no longer has."""
+        userdata: UserData = self.session.userdata
+        if hold_ids and userdata.availability is not None:
+            agent_flow.info("🪑 Releasing stale table hold: ids=%s", hold_ids)
+            await asyncio.to_thread(userdata.availability.release_group, hold_ids, userdata.booking_owner)
+
+    def _queue_llm_update(self, update_text: str, fields: frozenset[str] = frozenset(), urgent: bool = False):
         """Collect UI updates and debounce LLM reply so rapid messages are batched."""
         if not hasattr(self, "_pending_updates"):
-            self._pending_updates: list[str] = []
-        self._pending_updates.append(update_text)
+            self._pending_updates: list[UIUpdate] = []
+        self._pending_updates.append(UIUpdate(update_text, fields, urgent))
 
         # Cancel any existing debounce task and restart the timer
         if hasattr(self, "_debounce_task") and self._debounce_task and not self._debounce_task.done():
@@ -169,35 +303,101 @@ class BaseAgent(Agent):
         except RuntimeError:
             agent_flow.warning("⚠️ No running event loop for debounce task")
 
-    async def _debounced_reply(self, delay: float = 1.0):
-        """Wait for rapid UI messages to settle, then inject all updates into context and reply."""
-        await asyncio.sleep(delay)
+    async def _debounced_reply(self, delay: float | None = None):
+        """Wait for rapid UI messages to settle, inject all updates into context, then reply now,
+        after the current reply (deferred), or by interrupting it — see src/ui_scheduler.py."""
+        await asyncio.sleep(self.UI_DEBOUNCE_SECONDS if delay is None else delay)
 
         if not getattr(self, "_pending_updates", None):
             return
 
         updates = self._pending_updates.copy()
         self._pending_updates.clear()
+        self._cancel_deferred_reply()  # this batch's reply covers the earlier ones too
 
-        update_summary = "\n".join(f"- {u}" for u in updates)
+        update_summary = "\n".join(f"- {u.text}" for u in updates)
         chat_ctx = self.chat_ctx.copy()
-        chat_ctx.add_message(
+        message = chat_ctx.add_message(
             role="user",
             content=f"[UI Updates]\n{update_summary}",
         )
         await self.update_chat_ctx(chat_ctx)
 
+        stats = self._ui_update_stats()
         try:
-            # Interrupt any currently running speech/generation before starting fresh
-            # if self.session.current_speech is not None:
-            #     agent_flow.info("⛔ Interrupting current speech for UI update...")
-            await self.session.interrupt(force=True)
+            speech = self.session.current_speech
+            record = self._userdata.speech_ledger.get(speech.id if speech else None)
+            decision = decide(updates, self.session.agent_state, record.llm_text if record else "")
+
+            if decision.action == DEFER:
+                stats.deferred += 1
+                agent_flow.info(f"⏳ Deferring {len(updates)} UI update(s) to the next turn ({decision.reason})")
+                self._deferred_reply_task = asyncio.get_running_loop().create_task(
+                    self._reply_after_speech(message.id, speech)
+                )
+                return
 
-            agent_flow.info(f"🤖 Triggering LLM reply after {len(updates)} UI update(s): {updates}")
+            if decision.action == INTERRUPT:
+                cost = InterruptCost(
+                    decision.reason,
+                    speech.id if speech else None,
+                    tts_chars=record.tts_chars if record else 0,
+                    llm_tokens=record.llm_tokens if record else 0,
+                )
+                stats.interrupts.append(cost)
+                agent_flow.info(
+                    f"⛔ Interrupting for UI update ({cost.reason}): "
+                    f"~{cost.tts_chars} TTS chars, ~{cost.llm_tokens} LLM tokens discarded"
+                )
+                self._userdata.speech_ledger.claim_interrupt(UI_UPDATE)
+                await self.session.interrupt(force=True)
+
+            stats.replied += 1
+            agent_flow.info(f"🤖 Triggering LLM reply after {len(updates)} UI update(s): {[u.text for u in updates]}")
             await self.session.generate_reply()
         except RuntimeError as e:
             agent_flow.warning(f"⚠️ Skipping generate_reply — agent no longer active: {e}")
 
+    async def _reply_after_speech(self, message_id: str, speech) -> None:
+        """Answer a deferred UI update once the current reply has played,
+        unless the user takes the turn first (their turn then carries the update)."""
+        try:
+            if speech is not None:
+                await speech.wait_for_playout()
+            await asyncio.sleep(NEXT_TURN_GRACE_SECONDS)
+
+            if self.session.agent_state != "listening" or self.session.user_state == "speaking":
+                return
+            items = self.chat_ctx.items
+            index = next((i for i, item in enumerate(items) if item.id == message_id), None)
+            if index is None or any(
+                item.type == "message" and item.role == "user" for item in items[index + 1:]
+            ):
+                return
+
+            self._ui_update_stats().replied += 1
+            agent_flow.info("🤖 Replying to deferred UI update(s)")
+            await self.session.generate_reply()
+        except RuntimeError as e:
+            agent_flow.warning(f"⚠️ Skipping deferred reply — agent no longer active: {e}")
+
+    def _cancel_deferred_reply(self) -> None:
+        task = getattr(self, "_deferred_reply_task", None)
+        if task and not task.done():
+            task.cancel()
+        self._deferred_reply_task = None
+
+    def _ui_update_stats(self) -> UIUpdateStats:
+        if not hasattr(self, "_ui_stats"):
+            self._ui_stats = UIUpdateStats()
+        return self._ui_stats
+
+    def _on_function_tools_executed(self, ev) -> None:
+        try:
+            asyncio.get_running_loop().create_task(self._userdata.prefills.flush())
+        except RuntimeError:
+            pass
+
     def _on_agent_state_changed(self, ev) -> None:
         """Watch for thinking→silence timeout and speaking (cancel watchdog)."""
         new_state = ev.new_state
@@ -243,6 +443,7 @@ class BaseAgent(Agent):
             # Cancel pending debounce so it doesn't fire on the outgoing agent
             if hasattr(self, "_debounce_task") and self._debounce_task and not self._debounce_task.done():
                 self._debounce_task.cancel()
+            self._cancel_deferred_reply()
 
             # Cancel silence watchdog so it doesn't fire on the outgoing agent
             self._cancel_silence_watchdog()
@@ -252,6 +453,7 @@ class BaseAgent(Agent):
                 userdata.update_meta({"page_switch_trigger": page})
 
             # Force-interrupt any ongoing speech/generation
+            userdata.speech_ledger.claim_interrupt(AGENT_SWITCH)
             await self.session.interrupt(force=True)
 
             # Yield to let the interrupt fully propagate through the TTS/audio pipeline
@@ -283,28 +485,14 @@ class BaseAgent(Agent):
         await asyncio.to_thread(write_file)
         
     def _token_usage(self) -> dict:
-        """Get current token usage summary from the session."""
+        """Token usage and cost of this agent activation (not the whole session)."""
         userdata: UserData = self.session.userdata
-        
-        if not hasattr(userdata, 'usage_collector') or userdata.usage_collector is None:
-            agent_flow.warning("⚠️ Usage collector not initialized")
-            return {
-                "llm_prompt_tokens": 0,
-                "llm_completion_tokens": 0,
-                "total_tokens": 0,
-                "tts_characters": 0,
-                "stt_duration": 0.0
-            }
-            
-        summary = userdata.usage_collector.get_summary()
-        
-        return {
-            "llm_prompt_tokens": summary.llm_prompt_tokens,
-            "llm_completion_tokens": summary.llm_completion_tokens,
-            "total_tokens": summary.llm_prompt_tokens + summary.llm_completion_tokens,
-            "tts_characters": summary.tts_characters_count,
-            "stt_duration": summary.stt_audio_duration
-        }
+
+        if userdata.usage is None:
+            agent_flow.warning("⚠️ Usage ledger not initialized")
+            return Usage().to_dict()
+
+        return userdata.usage.activation_usage(getattr(self, "_activation", None))
     
     async def on_exit(self) -> None:
         """Called when leaving this agent"""
@@ -313,6 +501,7 @@ class BaseAgent(Agent):
         # Cancel any pending debounce task
         if hasattr(self, "_debounce_task") and self._debounce_task and not self._debounce_task.done():
             self._debounce_task.cancel()
+        self._cancel_deferred_reply()
 
         # Cancel silence watchdog
         self._cancel_silence_watchdog()
@@ -325,7 +514,18 @@ class BaseAgent(Agent):
         # Unsubscribe silence watchdog state listener
         try:
             self.session.off("agent_state_changed", self._on_agent_state_changed)
+            self.session.off("function_tools_executed", self._on_function_tools_executed)
         except Exception:
             pass
 
+        # Don't let the next agent's first turn race this agent's last form updates
+        if hasattr(self, "_userdata"):
+            await self._userdata.prefills.flush()
+
         agent_flow.info(f"{agent_name} - 💠 Token Usage Summary: {self._token_usage()}")
+        if getattr(self, "_tool_tokens_saved", 0):
+            agent_flow.info(f"{agent_name} - 🧰 Tool pruning saved ~{self._tool_tokens_saved} prompt tokens")
+        if hasattr(self, "_ui_stats"):
+            agent_flow.info(f"{agent_name} - 🗓️ UI update scheduling: {self._ui_stats.summary()}")
+        if hasattr(self, "_userdata"):
+            agent_flow.info(f"{agent_name} - 📉 Delivered vs discarded work: {self._userdata.speech_ledger.summary(agent_name)}")
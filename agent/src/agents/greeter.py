@@ -1,17 +1,32 @@
 # agents/greeter.py
 
+import json
+import time
+
 from src.agents.base import BaseAgent
-from src.variables import COMMON_RULES, GREETER_INSTRUCTIONS
-from src.dataclass import  RunContext_T
+from src.variables import (
+    COMMON_RULES,
+    GREETER_INSTRUCTIONS,
+    INTENT_FAST_PATH_ENABLED,
+    INTENT_FAST_PATH_MIN_CONFIDENCE,
+)
+from src.dataclass import  RunContext_T, UserData
 from typing import Annotated
 from pydantic import Field
 from src.fn import send_to_ui
 from src.logger_config import agent_flow
 from livekit.agents import (
     Agent,
+    StopResponse,
     function_tool,
+    llm,
 )
 
+# Agent key → page the user is navigated to on handoff
+_AGENT_PAGES = {
+    "reservation": "booking",
+    "order_food":  "order",
+}
 
 
 class Greeter(BaseAgent):    
@@ -24,6 +39,39 @@ class Greeter(BaseAgent):
             tts=tts,
         )
 
+    async def on_user_turn_completed(self, turn_ctx: llm.ChatContext, new_message: llm.ChatMessage) -> None:
+        """Intent fast path: route a clear reservation / order request without the routing LLM turn."""
+        userdata: UserData = self.session.userdata
+        classifier = userdata.intent_classifier
+        if not INTENT_FAST_PATH_ENABLED or classifier is None:
+            return
+
+        text = new_message.text_content or ""
+        start = time.perf_counter()
+        result = classifier.classify(text)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        if not result.routes(INTENT_FAST_PATH_MIN_CONFIDENCE):
+            agent_flow.info(f"🧭 Intent fast path skipped: {result.intent} ({result.confidence}) — LLM decides")
+            return
+
+        agent_flow.info(f"⚡ Intent fast path: '{text}' → {result.intent} ({result.confidence}, {elapsed_ms:.2f} ms)")
+        # StopResponse drops this turn — keep the user's words so the next agent's handoff summary has them
+        chat_ctx = self.chat_ctx.copy()
+        chat_ctx.items.append(new_message)
+        await self.update_chat_ctx(chat_ctx)
+
+        await self._navigate_for(result.intent)
+        userdata.prev_agent = self
+        self.session.update_agent(userdata.agents[result.intent])
+        raise StopResponse()
+
+    async def _navigate_for(self, agent_name: str) -> None:
+        userdata: UserData = self.session.userdata
+        page = _AGENT_PAGES[agent_name]
+        if userdata.job_ctx:
+            await send_to_ui(userdata.job_ctx, "NAVIGATE_PAGE", {"page": page})
+            agent_flow.info(f"🔄 Navigating user to {page} page")
+
     @function_tool()
     async def to_reservation(
         self,
@@ -31,14 +79,7 @@ class Greeter(BaseAgent):
         request: Annotated[str, Field(description="User request confirmation")] = "reservation",
     ) -> tuple[Agent, str]:
         """Called when user wants to make a reservation."""
-        userdata = context.userdata
-        if userdata.job_ctx:
-            await send_to_ui(
-                userdata.job_ctx,
-                "NAVIGATE_PAGE",
-                {"page": "booking"}
-            )
-            agent_flow.info("🔄 Navigating user to booking page")
+        await self._navigate_for("reservation")
         return await self._transfer_to_agent("reservation", context)
 
     @function_tool()
@@ -48,13 +89,22 @@ class Greeter(BaseAgent):
         request: Annotated[str, Field(description="User request confirmation")] = "order",
     ) -> tuple[Agent, str]:
         """Called when user wants to order food."""
-        userdata = context.userdata
-        if userdata.job_ctx:
-            await send_to_ui(
-                userdata.job_ctx,
-                "NAVIGATE_PAGE",
-                {"page": "order"}
-            )
-            agent_flow.info("🔄 Navigating user to order page")
+        await self._navigate_for("order_food")
         return await self._transfer_to_agent("order_food", context)
-  
\ No newline at end of file
+  
+    @function_tool()
+    async def lookup_info(
+        self,
+        context: RunContext_T,
+        question: Annotated[str, Field(description="The user's question, e.g. 'is there parking'")],
+    ) -> str:
+        """Look up restaurant information (hours, location, parking, cuisine, payment, dietary options)."""
+        knowledge = context.userdata.knowledge
+        if knowledge is None:
+            return "Error: Restaurant information is not available right now."
+
+        matches = knowledge.search(question, k=2)
+        agent_flow.info(f"📚 lookup_info '{question}' → {[m.passage.id for m in matches]}")
+        if not matches:
+            return json.dumps({"status": "no_match", "message": "No information found. Offer to connect the user to the restaurant."})
+        return json.dumps({"status": "ok", "passages": [m.passage.text for m in matches]})
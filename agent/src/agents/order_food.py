@@ -1,11 +1,15 @@
+from dataclasses import asdict
 from datetime import datetime as dt
 from typing import Annotated
 from pydantic import Field
+import json
 import re
 
 from src.agents.base import BaseAgent
-from src.dataclass import UserData, RunContext_T, BOOKING_FORM_ID, ORDER_FORM_ID
+from src.dataclass import UserData, RunContext_T, BOOKING_FORM_ID, ORDER_FORM_ID, OrderItem
 from src.fn import send_to_ui
+from src.menu import MenuMatch
+from src.session_state import serialized
 from src.variables import COMMON_RULES, ORDER_FOOD_INSTRUCTIONS, MAX_RESERVATION_GUESTS, VALID_RESTAURANTS_TIME_RANGE
 from src.logger_config import agent_flow
 
@@ -15,6 +19,18 @@ from livekit.agents import (
 )
 from livekit.agents import llm
 
+# Top two matches closer than this → ask the user which one they meant
+_AMBIGUITY_MARGIN = 0.1
+# A weaker best match ("coke" → Chocolate Lava Cake) is read back to the user before the cart changes
+_ACCEPT_SCORE = 0.7
+_MAX_QUANTITY = 20
+
+
+def _match_json(match: MenuMatch) -> dict:
+    item = match.item
+    return {"id": item.id, "name": item.name, "price": item.price, "category": item.category, "score": match.score}
+
+
 class OrderFood(BaseAgent):
     _context_form_id = ORDER_FORM_ID  # used by BaseAgent.on_enter initial log
 
@@ -26,4 +42,103 @@ class OrderFood(BaseAgent):
         super().__init__(
             instructions=f"{COMMON_RULES} {ORDER_FOOD_INSTRUCTIONS} \n {self.TASK_SPECIFIC_CONTEXT}",
             tts=tts,
-        )
\ No newline at end of file
+        )
+
+    @function_tool
+    async def search_menu(
+        self,
+        query: Annotated[str, Field(description="Dish or category as the user said it, e.g. 'pepperoni pizza' or 'desserts'")],
+        category: Annotated[str | None, Field(description="Only search this menu category")] = None,
+    ) -> str:
+        """Look up menu items by name or category. Returns the best matches with prices."""
+        menu = self.session.userdata.menu
+        if menu is None:
+            return "Error: The menu is not available right now. Ask the user to pick from the menu on the screen."
+
+        matches = menu.search(query, k=5, category=category)
+        agent_flow.info(f"🔎 search_menu '{query}' → {[m.item.name for m in matches]}")
+        if not matches:
+            return json.dumps({"status": "no_match", "categories": menu.categories})
+        return json.dumps({"status": "ok", "matches": [_match_json(m) for m in matches]})
+
+    @function_tool
+    @serialized
+    async def add_to_cart(
+        self,
+        item: Annotated[str, Field(description="Dish name as the user said it, or the menu item id")],
+        quantity: Annotated[int, Field(description="How many to add")] = 1,
+    ) -> str:
+        """Add a menu item to the user's cart. If the dish is unclear, returns options to ask the user about."""
+        userdata: UserData = self.session.userdata
+        menu = userdata.menu
+        if menu is None:
+            return "Error: The menu is not available right now. Ask the user to add it from the menu on the screen."
+        if not 0 < quantity <= _MAX_QUANTITY:
+            return f"Error: Quantity must be between 1 and {_MAX_QUANTITY}."
+
+        matches = self._resolve(item)
+        if isinstance(matches, str):
+            return matches
+        menu_item = matches[0].item
+        userdata.order.add_item(OrderItem(**asdict(menu_item), quantity=quantity))
+        agent_flow.info(f"🛒 Added {quantity} x {menu_item.name}")
+        self._sync_cart()
+        return json.dumps({"status": "added", "name": menu_item.name, "quantity": quantity, **self._cart_totals()})
+
+    @function_tool
+    @serialized
+    async def remove_from_cart(
+        self,
+        item: Annotated[str, Field(description="Dish name as the user said it, or the menu item id")],
+        quantity: Annotated[int | None, Field(description="How many to remove; omit to remove the dish completely")] = None,
+    ) -> str:
+        """Remove a dish (or some of it) from the user's cart."""
+        userdata: UserData = self.session.userdata
+        if userdata.menu is None:
+            return "Error: The menu is not available right now. Ask the user to remove it from the cart on the screen."
+        in_cart = {i.id for i in userdata.order.items}
+        if not in_cart:
+            return "Error: The cart is empty."
+        if quantity is not None and quantity <= 0:
+            return "Error: Quantity to remove must be at least 1."
+
+        matches = self._resolve(item, item_ids=in_cart)
+        if isinstance(matches, str):
+            return matches
+        menu_item = matches[0].item
+        userdata.order.remove_item(menu_item.id, quantity)
+        agent_flow.info(f"🛒 Removed {quantity or 'all'} x {menu_item.name}")
+        self._sync_cart()
+        return json.dumps({"status": "removed", "name": menu_item.name, **self._cart_totals()})
+
+    def _resolve(self, item: str, item_ids: set[int] | None = None) -> list[MenuMatch] | str:
+        """Matches for `item` with a clear winner first, or an error/clarification string for the LLM."""
+        menu = self.session.userdata.menu
+        item = str(item).strip()
+        if re.fullmatch(r"\d+", item):
+            menu_item = menu.get(int(item))
+            if menu_item is None or (item_ids is not None and menu_item.id not in item_ids):
+                return f"Error: No item with id {item}."
+            return [MenuMatch(menu_item, 1.0)]
+
+        matches = menu.search(item, k=3, item_ids=item_ids)
+        if not matches:
+            where = "in the cart" if item_ids is not None else "on the menu"
+            return json.dumps({"status": "no_match", "message": f"'{item}' is not {where}."})
+        if len(matches) > 1 and matches[0].score - matches[1].score < _AMBIGUITY_MARGIN:
+            return json.dumps({"status": "ambiguous", "options": [_match_json(m) for m in matches]})
+        if matches[0].score < _ACCEPT_SCORE and matches[0].item.name.lower() != item.lower():
+            return json.dumps({
+                "status": "confirm",
+                "options": [_match_json(m) for m in matches],
+                "message": f"Not sure '{item}' is one of these. Ask the user, then call again with the item id.",
+            })
+        return matches
+
+    def _cart_totals(self) -> dict:
+        order = self.session.userdata.order
+        return {"total_items": order.total_items, "total_price": order.total_price}
+
+    def _sync_cart(self) -> None:
+        userdata: UserData = self.session.userdata
+        userdata.queue_form_prefill(ORDER_FORM_ID, userdata.order.to_dict())
@@ -1,15 +1,21 @@
 # agents/ reservation.py
 
-from datetime import datetime as dt
 from typing import Annotated
 from pydantic import Field
-import re
+import asyncio
+import json
+import time
 
 from src.agents.base import BaseAgent
 from src.dataclass import UserData, RunContext_T, BOOKING_FORM_ID, ORDER_FORM_ID
 from src.fn import send_to_ui
 from src.variables import COMMON_RULES, COLLECTION_TASK_INSTRUCTIONS, MAX_RESERVATION_GUESTS, VALID_RESTAURANTS_TIME_RANGE
 from src.logger_config import agent_flow
+from src.availability import BookingNotFoundError, SlotUnavailableError
+from src.phone import normalize_phone
+from src.validators import validate_booking_fields
+from src.datetime_resolver import resolve_date, resolve_time, restaurant_now
+from src.session_state import serialized
 
 from livekit.agents import (
     function_tool,
@@ -24,8 +30,28 @@ class Reservation(BaseAgent):
     _STATE_MARKER = "[STATE_SNAPSHOT]"
     _WINDOW_SIZE  = 6  # last N non-system items kept per LLM call
 
+    _REQUIRED_FIELDS = (
+        "customer_name",
+        "customer_phone",
+        "no_of_guests",
+        "reservation_date",
+        "reservation_time",
+        "special_requests",
+        "table_id",
+        "table_seats",
+    )
+
+    # Legacy single-field tools, pruned once their field is collected
+    _FIELD_SAVE_TOOLS = {
+        "customer_name":    "save_customer_name",
+        "customer_phone":   "save_customer_phone",
+        "no_of_guests":     "save_guests",
+        "reservation_date": "save_reservation_date",
+        "reservation_time": "save_reservation_time",
+        "special_requests": "save_special_requests",
+    }
+
     TASK_SPECIFIC_CONTEXT: str = (
-        f"Current datetime: {dt.now().strftime('%Y-%m-%d %H:%M')}\n "
         f"No of guests must be between 1 and {MAX_RESERVATION_GUESTS}.\n "
         f"Restaurant operating hours are from {VALID_RESTAURANTS_TIME_RANGE['opening_time']} to {VALID_RESTAURANTS_TIME_RANGE['closing_time']}.\n "
     )
@@ -40,7 +66,7 @@ class Reservation(BaseAgent):
         """Before every LLM call:
         1. Drop any stale [STATE_SNAPSHOT] system messages
         2. Keep only the last _WINDOW_SIZE conversation items
-        3. Inject a fresh booking-form state snapshot
+        3. Inject a fresh booking-form state snapshot (with the current restaurant time)
         """
         userdata: UserData = getattr(self, "_userdata", None)
 
@@ -59,138 +85,146 @@ class Reservation(BaseAgent):
 
         if userdata is not None:
             data_summary = userdata.summarize_form(BOOKING_FORM_ID)
+            now = restaurant_now()
             snapshot_msg = llm.ChatMessage(
                 role="system",
-                content=[f"{self._STATE_MARKER}\n{data_summary}"],
+                content=[f"{self._STATE_MARKER}\nCurrent datetime: {now:%A %Y-%m-%d %H:%M}\n{data_summary}"],
             )
             new_items = instruction_items + [snapshot_msg] + windowed
         else:
             new_items = instruction_items + windowed
 
         new_ctx = llm.ChatContext(items=new_items)
-        return Agent.default.llm_node(self, new_ctx, tools, model_settings)
+        return super().llm_node(new_ctx, tools, model_settings)
+
+    def _active_tool_names(self, userdata: UserData) -> set[str]:
+        """Only offer tools that can still do something for the current booking state."""
+        booking = userdata.booking
+        missing = {f for f in self._REQUIRED_FIELDS if getattr(booking, f) in (None, "")}
+        details_missing = missing - {"table_id", "table_seats"}
+
+        active = {"save_booking_fields"}
+        active |= {tool for field_name, tool in self._FIELD_SAVE_TOOLS.items() if field_name in details_missing}
+        if not missing & {"no_of_guests", "reservation_date", "reservation_time"}:
+            active |= {"find_table", "check_availability", "hold_table", "save_table"}
+        if not details_missing:
+            active.add("check_data_collection_complete")
+        if not missing:
+            active.add("confirm_reservation")
+        return active
         
-    @function_tool()
-    async def get_todays_date_n_time(
-        self, 
-        context: RunContext_T,
-        # ADDED DUMMY ARGUMENT
-        request: Annotated[str, Field(description="Request for today's date and time")] = "today",
+    @function_tool
+    @serialized
+    async def save_booking_fields(
+        self,
+        customer_name: Annotated[str | None, Field(description="User's full name")] = None,
+        customer_phone: Annotated[str | None, Field(description="User's phone number, digits or exactly as spoken")] = None,
+        no_of_guests: Annotated[int | None, Field(description="Number of guests")] = None,
+        reservation_date: Annotated[str | None, Field(description="Reservation date as YYYY-MM-DD or the user's words, e.g. 'next friday'")] = None,
+        reservation_time: Annotated[str | None, Field(description="Reservation time as HH:MM or the user's words, e.g. 'half past seven'")] = None,
+        special_requests: Annotated[str | None, Field(description="Any special requests")] = None,
+        table_id: Annotated[int | None, Field(description="Table number selected by the user")] = None,
     ) -> str:
-        """Get today's date and time for reference."""
-        return dt.now().strftime("%Y-%m-%d_%H:%M:%S")
-    
+        """Save and validate any booking details in Database in one call.
+        Pass every detail the user just gave; omit the rest."""
+        values = {
+            "customer_name":    customer_name,
+            "customer_phone":   customer_phone,
+            "no_of_guests":     no_of_guests,
+            "reservation_date": reservation_date,
+            "reservation_time": reservation_time,
+            "special_requests": special_requests,
+        }
+        result = await self._save_fields({k: v for k, v in values.items() if v is not None})
+
+        # Table last — the hold needs the guests/date/time saved above
+        if table_id is not None:
+            table_result = await self._hold_tables([table_id])
+            if table_result.startswith("Error"):
+                result["errors"]["table_id"] = table_result.removeprefix("Error: ")
+            else:
+                result["saved"].append("table_id")
+        result["status"] = "ok" if not result["errors"] else ("partial" if result["saved"] else "error")
+        return json.dumps(result)
+
+    @serialized
+    async def _save_fields(self, values: dict) -> dict:
+        """Validate all `values`, store the valid ones and queue one merged FORM_PREFILL for the UI."""
+        agent_flow.info(f"📌 Collecting booking fields: {values}")
+        userdata: UserData = self.session.userdata
+        clean, errors = validate_booking_fields(values, saved=userdata.booking.to_dict())
+        for field_name, error in errors.items():
+            agent_flow.warning(f"❌ Invalid {field_name}: {values[field_name]} — {error}")
+
+        # A hold taken for the old date, time or party size would get confirmed for the wrong slot
+        await self._release_table_hold(userdata.take_stale_table_hold(clean))
+        for field_name, value in clean.items():
+            userdata[field_name] = value
+        if clean:
+            userdata.queue_form_prefill(BOOKING_FORM_ID, clean)
+        result = {"saved": list(clean), "errors": errors}
+        if "customer_phone" in clean:
+            # A number pieced together from a rough transcript is kept, but the user confirms it
+            phone = normalize_phone(str(values["customer_phone"]))
+            result["customer_phone"] = phone.to_dict()
+            if phone.needs_confirmation:
+                result["confirm"] = f"Read the number {phone.digits} back to the user digit by digit and ask them to confirm it."
+        return result
+
+    async def _save_field(self, field_name: str, value) -> str:
+        """Single-field save used by the legacy save_* tools — keeps their plain return format."""
+        result = await self._save_fields({field_name: value})
+        if result["errors"]:
+            return f"Error: {result['errors'][field_name]}"
+        return json.dumps({"status": "ok", **{k: v for k, v in result.items() if k not in ("saved", "errors")}})
+
     @function_tool
     async def save_customer_name(
         self,
         name: Annotated[str, Field(description="User's full name")],
     ) -> str:
         """Save and validate user's name in Database."""
-        agent_flow.info(f"📌 Collecting name: {name}")
-        self.session.userdata["customer_name"] = name
-        await send_to_ui(self.session.userdata.job_ctx, "FORM_PREFILL", {
-            "formId": BOOKING_FORM_ID, "values": {"customer_name": name}
-        })
-        return '{"status": "ok"}'
-       
+        return await self._save_field("customer_name", name)
+
     @function_tool
     async def save_customer_phone(
         self,
-        phone: Annotated[str, Field(description="User's phone number")],
+        phone: Annotated[str, Field(description="User's phone number, digits or exactly as spoken")],
     ) -> str:
         """Save and validate user's phone number in Database."""
-        agent_flow.info(f"📌 Collecting phone: {phone}")
-        
-        clean_phone = re.sub(r'\D', '', phone)  # Remove non-digit characters
-        
-        if len(clean_phone) != 10:
-            agent_flow.warning(f"❌ Invalid phone format: {clean_phone}")
-            # LLM ko return message bhejo taaki wo user ko bataye
-            return "Error: Invalid phone number. It must be exactly 10 digits. Please ask the user to repeat."
-        
-        self.session.userdata["customer_phone"] = phone
-        await send_to_ui(self.session.userdata.job_ctx, "FORM_PREFILL", {
-            "formId": BOOKING_FORM_ID, "values": {"customer_phone": phone}
-        })
-        # return self._check_data_collection_complete
-        return '{"status": "ok"}'
-    
+        return await self._save_field("customer_phone", phone)
+
     @function_tool
     async def save_guests(
         self,
         no_of_guests: Annotated[int, Field(description="Number of guests")],
     ) -> str:
         """Save and validate number of guests in Database."""
-        agent_flow.info(f"📌 Collecting number of guests: {no_of_guests}")
-        
-        if no_of_guests <= 0 or no_of_guests > MAX_RESERVATION_GUESTS:
-            agent_flow.warning(f"❌ Invalid number of guests: {no_of_guests}")
-            return f"Error: Invalid number of guests. Please provide a number between 1 and {MAX_RESERVATION_GUESTS}."
-        
-        self.session.userdata["no_of_guests"] = no_of_guests
-        await send_to_ui(self.session.userdata.job_ctx, "FORM_PREFILL", {
-            "formId": BOOKING_FORM_ID, "values": {"no_of_guests": no_of_guests}
-        })
-        # return self._check_data_collection_complete("Number of guests")
-        return '{"status": "ok"}'
-    
+        return await self._save_field("no_of_guests", no_of_guests)
+
     @function_tool
     async def save_reservation_date(
         self,
-        reservation_date: Annotated[str, Field(description="Reservation date (YYYY-MM-DD)")],
+        reservation_date: Annotated[str, Field(description="Reservation date as YYYY-MM-DD or the user's words, e.g. 'tomorrow'")],
     ) -> str:
         """Save and validate reservation date in Database."""
-        agent_flow.info(f"📌 Collecting reservation date: {reservation_date}")
-
-        try:
-            year, month, day = map(int, reservation_date.split("-"))
-            if not (1 <= month <= 12 and 1 <= day <= 31):
-                return "Error: Invalid date. Please ask the user to provide a valid date."
-        except ValueError:
-            return "Error: Invalid date format. Please ask the user to provide date in YYYY-MM-DD format."
-
-        self.session.userdata["reservation_date"] = reservation_date
-        await send_to_ui(self.session.userdata.job_ctx, "FORM_PREFILL", {
-            "formId": BOOKING_FORM_ID, "values": {"reservation_date": reservation_date}
-        })
-        return '{"status": "ok"}'
+        return await self._save_field("reservation_date", reservation_date)
 
     @function_tool
     async def save_reservation_time(
         self,
-        reservation_time: Annotated[str, Field(description="Reservation time (HH:MM)")],
+        reservation_time: Annotated[str, Field(description="Reservation time as HH:MM or the user's words, e.g. '8 pm'")],
     ) -> str:
         """Save and validate reservation time in Database."""
-        agent_flow.info(f"📌 Collecting reservation time: {reservation_time}")
-
-        try:
-            hour, minute = map(int, reservation_time.split(":"))
-        except ValueError:
-            return "Error: Invalid time format. Please ask the user to provide time in HH:MM format."
-
-        if not (0 <= hour <= 23 and 0 <= minute <= 59):
-            return "Error: Invalid time. Please ask the user to provide a valid time."
+        return await self._save_field("reservation_time", reservation_time)
 
-        self.session.userdata["reservation_time"] = reservation_time
-        await send_to_ui(self.session.userdata.job_ctx, "FORM_PREFILL", {
-            "formId": BOOKING_FORM_ID, "values": {"reservation_time": reservation_time}
-        })
-        return '{"status": "ok"}'
-    
     @function_tool
     async def save_special_requests(
         self,
         special_requests: Annotated[str, Field(description="Any special requests")],
     ) -> str:
         """Save user's special requests in Database."""
-        agent_flow.info(f"📌 Collecting special requests: {special_requests}")
-        
-        self.session.userdata["special_requests"] = special_requests
-        await send_to_ui(self.session.userdata.job_ctx, "FORM_PREFILL", {
-            "formId": BOOKING_FORM_ID, "values": {"special_requests": special_requests}
-        })
-        # return self._check_data_collection_complete("Special requests")
-        return '{"status": "ok"}'
+        return await self._save_field("special_requests", special_requests)
 
     @function_tool
     async def save_table(
@@ -200,33 +234,242 @@ class Reservation(BaseAgent):
     ) -> str:
         """Save the selected table and its seat count in Database."""
         agent_flow.info(f"📌 Collecting table: id={table_id}, seats={table_seats}")
+        # Seat count comes from the floor plan, not the LLM — the table is held like hold_table
+        return await self._hold_tables([table_id])
+
+    @function_tool
+    async def check_availability(
+        self,
+        reservation_date: Annotated[str | None, Field(description="Reservation date (YYYY-MM-DD or the user's words), defaults to the saved date")] = None,
+        reservation_time: Annotated[str | None, Field(description="Reservation time (HH:MM or the user's words), defaults to the saved time")] = None,
+    ) -> str:
+        """Check which tables are free for the reservation date and time."""
+        userdata: UserData = self.session.userdata
+        availability = userdata.availability
+        if availability is None:
+            return "Error: Table availability is not available right now. Ask the user to pick a table from the UI."
+
+        reservation_date, reservation_time, error = self._resolve_slot(reservation_date, reservation_time)
+        if error:
+            return f"Error: {error}"
+        if not reservation_date or not reservation_time:
+            return "Error: Save the reservation date and time before checking availability."
+
+        try:
+            start, end = availability.slot_bounds(reservation_date, reservation_time)
+        except ValueError:
+            return "Error: Invalid date or time format. Use YYYY-MM-DD and HH:MM."
 
-        self.session.userdata["table_id"] = table_id
-        self.session.userdata["table_seats"] = table_seats
-        await send_to_ui(self.session.userdata.job_ctx, "FORM_PREFILL", {
-            "formId": BOOKING_FORM_ID, "values": {"table_id": table_id, "table_seats": table_seats}
+        free = availability.free_tables(start, end, min_seats=userdata["no_of_guests"] or 0)
+        agent_flow.info(f"🪑 Availability {reservation_date} {reservation_time}: {len(free)} table(s) free")
+        if not free:
+            return '{"status": "unavailable", "free_tables": []}'
+        return json.dumps({
+            "status": "ok",
+            "free_tables": [{"table_id": t, "seats": availability.tables[t]} for t in free],
         })
-        return '{"status": "ok"}'
-        
+
+    @function_tool
+    async def hold_table(
+        self,
+        table_id: Annotated[int, Field(description="Table number to hold for the saved date and time")],
+    ) -> str:
+        """Hold a free table for the saved date and time until the reservation is confirmed."""
+        agent_flow.info(f"📌 Holding table: id={table_id}")
+        return await self._hold_tables([table_id])
+
+    @function_tool
+    @serialized
+    async def find_table(
+        self,
+        no_of_guests: Annotated[int | None, Field(description="Number of guests, defaults to the saved number")] = None,
+        reservation_date: Annotated[str | None, Field(description="Reservation date (YYYY-MM-DD or the user's words), defaults to the saved date")] = None,
+        reservation_time: Annotated[str | None, Field(description="Reservation time (HH:MM or the user's words), defaults to the saved time")] = None,
+    ) -> str:
+        """Find and hold the best table for the party (joining adjacent tables for large parties).
+        If nothing fits at that time, returns the nearest free times instead."""
+        userdata: UserData = self.session.userdata
+        search = userdata.table_search
+        if search is None:
+            return "Error: Table search is not available right now. Ask the user to pick a table from the UI."
+
+        guests = no_of_guests or userdata["no_of_guests"]
+        reservation_date, reservation_time, error = self._resolve_slot(reservation_date, reservation_time)
+        if error:
+            return f"Error: {error}"
+        if not guests or not reservation_date or not reservation_time:
+            return "Error: Save the number of guests, reservation date and time before finding a table."
+        if not 0 < guests <= MAX_RESERVATION_GUESTS:
+            return f"Error: Number of guests must be between 1 and {MAX_RESERVATION_GUESTS}."
+
+        try:
+            group = search.best_fit(reservation_date, reservation_time, guests)
+            alternatives = [] if group else search.nearest_slots(reservation_date, reservation_time, guests, k=3)
+        except ValueError:
+            return "Error: Invalid date or time format. Use YYYY-MM-DD and HH:MM."
+        agent_flow.info(f"🔎 find_table guests={guests} {reservation_date} {reservation_time} → {group}")
+
+        if group is None:
+            return json.dumps({
+                "status": "unavailable",
+                "alternatives": [
+                    {"reservation_time": alt.reservation_time, "table_ids": list(alt.group.table_ids), "seats": alt.group.seats}
+                    for alt in alternatives
+                ],
+            })
+
+        # Only hold for the saved booking — a what-if query just reports the fit
+        if (guests, reservation_date, reservation_time) != (
+            userdata["no_of_guests"], userdata["reservation_date"], userdata["reservation_time"]
+        ):
+            return json.dumps({"status": "available", "table_ids": list(group.table_ids), "seats": group.seats})
+        return await self._hold_tables(list(group.table_ids))
+
+    @function_tool
+    @serialized
+    async def confirm_reservation(
+        self,
+        dummy_attr: Annotated[str, Field(description="Dummy attribute to trigger confirmation")] = None,
+    ) -> str:
+        """Confirm the reservation once all details are saved and the user agreed."""
+        userdata: UserData = self.session.userdata
+        availability = userdata.availability
+        if availability is None:
+            return "Error: Table availability is not available right now."
+
+        missing = [f for f in self._REQUIRED_FIELDS if not userdata.get_field(BOOKING_FORM_ID, f)]
+        if missing:
+            return f"Error: Cannot confirm yet. Remaining information to save: {', '.join(missing)}."
+
+        # The hold must still be for the booking on the form, or it gets confirmed for the wrong slot
+        hold_ids = userdata.get_meta("table_hold_ids")
+        if hold_ids and not self._hold_matches_booking(hold_ids):
+            agent_flow.warning(f"⚠️ Table hold {hold_ids} no longer matches the booking, holding again")
+            userdata.update_meta({"table_hold_ids": None})
+            await self._release_table_hold(hold_ids)
+
+        # Table picked directly in the UI arrives without a hold — take one now
+        if not userdata.get_meta("table_hold_ids"):
+            result = await self._hold_tables([userdata["table_id"]])
+            if result.startswith("Error"):
+                return result
+
+        try:
+            bookings = await asyncio.to_thread(
+                availability.confirm_group, userdata.get_meta("table_hold_ids"), userdata.booking_owner
+            )
+        except BookingNotFoundError as e:
+            agent_flow.warning(f"❌ Confirm failed: {e}")
+            userdata.update_meta({"table_hold_ids": None})
+            return f"Error: {e}. Call find_table or hold_table again for the user's table."
+
+        reservation_ids = [b.id for b in bookings]
+        userdata.update_meta({"table_hold_ids": None, "reservation_ids": reservation_ids})
+        agent_flow.info(f"✅ Reservation confirmed: ids={reservation_ids} tables={[b.table_id for b in bookings]}")
+        return json.dumps({
+            "status": "confirmed",
+            "reservation_id": reservation_ids[0],
+            "table_ids": [b.table_id for b in bookings],
+        })
+
+    def _resolve_slot(self, reservation_date: str | None, reservation_time: str | None) -> tuple:
+        """Spoken date/time → canonical values, falling back to the saved ones → (date, time, error)."""
+        userdata: UserData = self.session.userdata
+        error = None
+        if reservation_date:
+            reservation_date, error = resolve_date(reservation_date)
+        if reservation_time and not error:
+            reservation_time, error = resolve_time(reservation_time, reservation_date or userdata["reservation_date"])
+        return (
+            reservation_date or userdata["reservation_date"],
+            reservation_time or userdata["reservation_time"],
+            error,
+        )
+
+    def _hold_matches_booking(self, hold_ids: list[int]) -> bool:
+        """Whether the held bookings cover the form's table, date, time and party size."""
+        userdata: UserData = self.session.userdata
+        availability = userdata.availability
+        bookings = [availability.get_booking(i) for i in hold_ids]
+        if any(b is None for b in bookings):
+            return False
+        try:
+            start, _ = availability.slot_bounds(userdata["reservation_date"], userdata["reservation_time"])
+        except ValueError:
+            return False
+        return (
+            userdata["table_id"] in {b.table_id for b in bookings}
+            and all(b.start == start for b in bookings)
+            and sum(availability.tables.get(b.table_id, 0) for b in bookings) >= (userdata["no_of_guests"] or 0)
+        )
+
+    @serialized
+    async def _hold_tables(self, table_ids: list[int]) -> str:
+        """Hold the tables for the saved slot, release this session's previous hold, pre-fill the UI."""
+        userdata: UserData = self.session.userdata
+        availability = userdata.availability
+        if availability is None:
+            return "Error: Table availability is not available right now."
+
+        table_ids = sorted(table_ids)
+        unknown = [t for t in table_ids if t not in availability.tables]
+        if unknown:
+            return f"Error: Table {unknown[0]} does not exist. Call check_availability for free tables."
+        if len(table_ids) > 1 and (userdata.table_search is None or userdata.table_search.group_for(table_ids) is None):
+            return "Error: Only tables standing next to each other can be joined. Call find_table instead."
+        seats = sum(availability.tables[t] for t in table_ids)
+        guests = userdata["no_of_guests"]
+        if guests and seats < guests:
+            return f"Error: Table {table_ids[0]} has only {seats} seats for {guests} guests. Call find_table for a bigger one."
+        if not userdata["reservation_date"] or not userdata["reservation_time"]:
+            return "Error: Save the reservation date and time before choosing a table."
+
+        try:
+            start, end = availability.slot_bounds(userdata["reservation_date"], userdata["reservation_time"])
+        except ValueError:
+            return "Error: Saved reservation date or time is invalid. Ask the user again."
+
+        owner = userdata.booking_owner
+        previous = [
+            b for b in (availability.get_booking(i) for i in userdata.get_meta("table_hold_ids") or [])
+            if b is not None
+        ]
+        now = time.time()
+        if previous and sorted(b.table_id for b in previous) == table_ids \
+                and all(b.start == start and b.is_active(now) for b in previous):
+            bookings = previous
+        else:
+            # Our own hold on the same tables would block the new slot, so drop those first
+            for booking in [b for b in previous if b.table_id in table_ids]:
+                await asyncio.to_thread(availability.release, booking.id, owner)
+            previous = [b for b in previous if b.table_id not in table_ids]
+            try:
+                bookings = await asyncio.to_thread(availability.hold_group, table_ids, start, end, owner)
+            except SlotUnavailableError as e:
+                agent_flow.warning(f"❌ Hold failed: {e}")
+                return f"Error: {e}. Call find_table to offer the user another table or time."
+            for booking in previous:
+                await asyncio.to_thread(availability.release, booking.id, owner)
+
+        userdata.update_meta({"table_hold_ids": [b.id for b in bookings]})
+        userdata["table_id"] = table_ids[0]
+        userdata["table_seats"] = seats
+        userdata.queue_form_prefill(BOOKING_FORM_ID, {"table_id": table_ids[0], "table_seats": seats})
+        return json.dumps({
+            "status": "held",
+            "table_ids": table_ids,
+            "seats": seats,
+            "expires_in_seconds": int(availability.hold_ttl),
+        })
+
     @function_tool
     async def check_data_collection_complete(
         self,
         dummy_attr: Annotated[str, Field(description="Dummy attribute to trigger completion check")]=None,
     ) -> str:
         """Check if all required data saved in Database"""
-        required_fields = [
-            "customer_name",
-            "customer_phone",
-            "no_of_guests",
-            "reservation_date",
-            "reservation_time",
-            "special_requests",
-            "table_id",
-            "table_seats",
-        ]
-        
         not_collected_fields = [
-            field for field in required_fields
+            field for field in self._REQUIRED_FIELDS
             if not self.session.userdata.get_field(BOOKING_FORM_ID, field)
         ]
         if not_collected_fields:
@@ -0,0 +1,383 @@
+"""
+Table availability engine for reservations.
+
+Every table keeps a sorted, non-overlapping list of booked intervals, so a slot
+query is a bisect (O(log n)) instead of a scan over all reservations.
+Bookings are persisted in a local SQLite file shared by all worker processes.
+Each write bumps a per-table version with compare-and-set (optimistic locking),
+so two workers racing for the same table can never both win.
+
+Usage:
+    availability = TableAvailability(AVAILABILITY_DB_PATH)
+    start, end = availability.slot_bounds("2026-10-20", "20:00")
+    free = availability.free_tables(start, end)
+    booking = availability.hold(table_id, start, end, owner=room_name)
+    availability.confirm(booking.id, owner=room_name)
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from bisect import bisect_right
+from dataclasses import dataclass
+from datetime import date
+from typing import Callable
+
+from src.variables import (
+    RESERVATION_SLOT_MINUTES,
+    RESTAURANT_TABLES,
+    TABLE_HOLD_TTL_SECONDS,
+)
+
+HELD = "held"
+CONFIRMED = "confirmed"
+
+_MINUTES_PER_DAY = 24 * 60
+_REFRESH_INTERVAL = 1.0  # seconds between checks for writes made by other workers
+_MAX_WRITE_ATTEMPTS = 3
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS table_versions (
+    table_id INTEGER PRIMARY KEY,
+    version  INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS bookings (
+    id         INTEGER PRIMARY KEY AUTOINCREMENT,
+    table_id   INTEGER NOT NULL,
+    start_min  INTEGER NOT NULL,
+    end_min    INTEGER NOT NULL,
+    status     TEXT    NOT NULL,
+    owner      TEXT    NOT NULL,
+    expires_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_bookings_table_start ON bookings (table_id, start_min);
+"""
+
+
+class SlotUnavailableError(Exception):
+    """Raised when a table is already taken for the requested slot."""
+
+
+class BookingNotFoundError(Exception):
+    """Raised when a hold does not exist, expired, or belongs to another session."""
+
+
+@dataclass(frozen=True)
+class Booking:
+    id:         int
+    table_id:   int
+    start:      int            # absolute minute, see slot_bounds()
+    end:        int
+    status:     str            # HELD | CONFIRMED
+    owner:      str            # room name of the session that made it
+    expires_at: float | None = None
+
+    def is_active(self, now: float) -> bool:
+        return self.status == CONFIRMED or (self.expires_at or 0) > now
+
+
+def to_minute(reservation_date: str, reservation_time: str) -> int:
+    """'YYYY-MM-DD' + 'HH:MM' → absolute minute (days since 0001-01-01 * 1440 + minute of day)."""
+    hour, minute = map(int, reservation_time.split(":"))
+    return date.fromisoformat(reservation_date).toordinal() * _MINUTES_PER_DAY + hour * 60 + minute
+
+
+def from_minute(value: int) -> tuple[str, str]:
+    """Inverse of to_minute → ('YYYY-MM-DD', 'HH:MM')."""
+    day, minute = divmod(value, _MINUTES_PER_DAY)
+    return date.fromordinal(day).isoformat(), f"{minute // 60:02d}:{minute % 60:02d}"
+
+
+class TableIntervalIndex:
+    """Sorted, non-overlapping booking intervals of one table."""
+
+    def __init__(self) -> None:
+        self._starts: list[int] = []
+        self._bookings: list[Booking] = []
+
+    def __len__(self) -> int:
+        return len(self._bookings)
+
+    def overlapping(self, start: int, end: int, now: float) -> list[Booking]:
+        """Active bookings that intersect [start, end)."""
+        # Intervals never overlap each other, so only the one starting at or
+        # before `start` can reach into the range from the left.
+        i = max(bisect_right(self._starts, start) - 1, 0)
+        hits: list[Booking] = []
+        while i < len(self._starts) and self._starts[i] < end:
+            booking = self._bookings[i]
+            if booking.end > start and booking.is_active(now):
+                hits.append(booking)
+            i += 1
+        return hits
+
+    def is_free(self, start: int, end: int, now: float) -> bool:
+        return not self.overlapping(start, end, now)
+
+    def add(self, booking: Booking) -> None:
+        i = bisect_right(self._starts, booking.start)
+        self._starts.insert(i, booking.start)
+        self._bookings.insert(i, booking)
+
+    def replace_all(self, bookings: list[Booking]) -> None:
+        ordered = sorted(bookings, key=lambda b: b.start)
+        self._starts = [b.start for b in ordered]
+        self._bookings = ordered
+
+    def bookings(self) -> list[Booking]:
+        return list(self._bookings)
+
+
+class TableAvailability:
+    """In-memory interval index per table, backed by a shared SQLite store."""
+
+    def __init__(
+        self,
+        db_path: str,
+        tables: list[dict] | None = None,
+        slot_minutes: int = RESERVATION_SLOT_MINUTES,
+        hold_ttl: float = TABLE_HOLD_TTL_SECONDS,
+    ) -> None:
+        self.tables: dict[int, int] = {
+            t["id"]: t["seats"] for t in (tables if tables is not None else RESTAURANT_TABLES)
+        }
+        self.slot_minutes = slot_minutes
+        self.hold_ttl = hold_ttl
+
+        directory = os.path.dirname(db_path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+
+        # Autocommit mode — transactions are opened explicitly around writes.
+        self._conn = sqlite3.connect(db_path, timeout=5.0, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO table_versions (table_id, version) VALUES (?, 0)",
+            [(table_id,) for table_id in self.tables],
+        )
+
+        self._lock = threading.RLock()
+        self._index: dict[int, TableIntervalIndex] = {t: TableIntervalIndex() for t in self.tables}
+        self._versions: dict[int, int] = {}
+        self._last_refresh = 0.0
+        self._listeners: list[Callable[[int], None]] = []
+        self.refresh(force=True)
+
+    def add_listener(self, callback: Callable[[int], None]) -> None:
+        """Call `callback(table_id)` whenever a table's bookings are reloaded.
+
+        Callbacks run while the engine lock is held — they must not call back into the engine.
+        """
+        self._listeners.append(callback)
+
+    # ── Slots ────────────────────────────────────────────────────────
+
+    def slot_bounds(self, reservation_date: str, reservation_time: str) -> tuple[int, int]:
+        start = to_minute(reservation_date, reservation_time)
+        return start, start + self.slot_minutes
+
+    # ── Reads (in-memory) ────────────────────────────────────────────
+
+    def is_free(self, table_id: int, start: int, end: int) -> bool:
+        self._maybe_refresh()
+        with self._lock:
+            index = self._index.get(table_id)
+            return index is not None and index.is_free(start, end, time.time())
+
+    def overlapping(self, table_id: int, start: int, end: int) -> list[Booking]:
+        """Active bookings of `table_id` that intersect [start, end)."""
+        self._maybe_refresh()
+        with self._lock:
+            return self._index[table_id].overlapping(start, end, time.time())
+
+    def free_tables(self, start: int, end: int, min_seats: int = 0) -> list[int]:
+        """Ids of tables free for [start, end) with at least `min_seats` seats."""
+        self._maybe_refresh()
+        now = time.time()
+        with self._lock:
+            return [
+                table_id
+                for table_id, index in self._index.items()
+                if self.tables[table_id] >= min_seats and index.is_free(start, end, now)
+            ]
+
+    def get_booking(self, booking_id: int) -> Booking | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, table_id, start_min, end_min, status, owner, expires_at FROM bookings WHERE id = ?",
+                (booking_id,),
+            ).fetchone()
+        return Booking(*row) if row else None
+
+    # ── Writes (SQLite, optimistic locking) ──────────────────────────
+
+    def hold(self, table_id: int, start: int, end: int, owner: str) -> Booking:
+        """Place a temporary hold that expires after `hold_ttl` seconds unless confirmed."""
+        return self.hold_group([table_id], start, end, owner)[0]
+
+    def hold_group(self, table_ids: list[int], start: int, end: int, owner: str) -> list[Booking]:
+        """Hold several tables (joined for a large party) all-or-nothing."""
+        if len(set(table_ids)) != len(table_ids):
+            raise SlotUnavailableError("The same table was given twice")
+        for table_id in table_ids:
+            if table_id not in self.tables:
+                raise SlotUnavailableError(f"Table {table_id} does not exist")
+
+        with self._lock:
+            for _ in range(_MAX_WRITE_ATTEMPTS):
+                now = time.time()
+                versions = self._read_versions(table_ids)
+                for table_id in table_ids:
+                    if self._db_overlapping(table_id, start, end, now):
+                        self._reload_table(table_id)
+                        raise SlotUnavailableError(f"Table {table_id} is already booked for that time")
+
+                expires_at = now + self.hold_ttl
+                row_ids = self._write(versions, now, [
+                    (
+                        "INSERT INTO bookings (table_id, start_min, end_min, status, owner, expires_at) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        (table_id, start, end, HELD, owner, expires_at),
+                    )
+                    for table_id in table_ids
+                ])
+                if row_ids is not None:
+                    return [
+                        Booking(row_id, table_id, start, end, HELD, owner, expires_at)
+                        for row_id, table_id in zip(row_ids, table_ids)
+                    ]
+
+        raise SlotUnavailableError("Those tables are being booked by someone else, please retry")
+
+    def confirm(self, booking_id: int, owner: str) -> Booking:
+        """Turn an unexpired hold owned by `owner` into a confirmed reservation."""
+        return self.confirm_group([booking_id], owner)[0]
+
+    def confirm_group(self, booking_ids: list[int], owner: str) -> list[Booking]:
+        """Confirm several holds (one per joined table) all-or-nothing."""
+        with self._lock:
+            for _ in range(_MAX_WRITE_ATTEMPTS):
+                now = time.time()
+                bookings: list[Booking] = []
+                for booking_id in booking_ids:
+                    booking = self.get_booking(booking_id)
+                    if booking is None or booking.owner != owner:
+                        raise BookingNotFoundError(f"No hold {booking_id} for this session")
+                    if not booking.is_active(now):
+                        raise BookingNotFoundError(f"Hold {booking_id} has expired")
+                    bookings.append(booking)
+
+                versions = self._read_versions([b.table_id for b in bookings])
+                written = self._write(versions, now, [
+                    ("UPDATE bookings SET status = ?, expires_at = NULL WHERE id = ?", (CONFIRMED, b.id))
+                    for b in bookings
+                ])
+                if written is not None:
+                    return [Booking(b.id, b.table_id, b.start, b.end, CONFIRMED, owner) for b in bookings]
+
+        raise BookingNotFoundError("Could not confirm the hold, please retry")
+
+    def release(self, booking_id: int, owner: str) -> None:
+        """Drop a hold (e.g. the user picked another table or time). Confirmed bookings stay."""
+        with self._lock:
+            booking = self.get_booking(booking_id)
+            if booking is None or booking.owner != owner or booking.status != HELD:
+                return
+            for _ in range(_MAX_WRITE_ATTEMPTS):
+                versions = self._read_versions([booking.table_id])
+                written = self._write(versions, time.time(), [
+                    ("DELETE FROM bookings WHERE id = ? AND status = ?", (booking_id, HELD)),
+                ])
+                if written is not None:
+                    return
+
+    def release_group(self, booking_ids: list[int], owner: str) -> None:
+        """Drop several holds, e.g. a joined-table hold whose slot the user changed."""
+        for booking_id in booking_ids:
+            self.release(booking_id, owner)
+
+    def _write(self, versions: dict[int, int], now: float, statements: list[tuple[str, tuple]]) -> list[int] | None:
+        """Run `statements` in one transaction, only if every table is still at the given version.
+
+        Returns the row id of each statement on success, None if another writer
+        got there first (the caller re-reads and retries).
+        """
+        with self._lock:
+            cur = self._conn.cursor()
+            cur.execute("BEGIN")
+            try:
+                for table_id, version in versions.items():
+                    cur.execute(
+                        "UPDATE table_versions SET version = version + 1 WHERE table_id = ? AND version = ?",
+                        (table_id, version),
+                    )
+                    if cur.rowcount != 1:
+                        cur.execute("ROLLBACK")
+                        self._reload_table(table_id)
+                        return None
+                    # Expired holds are dead weight — purge them so the index stays non-overlapping
+                    cur.execute(
+                        "DELETE FROM bookings WHERE table_id = ? AND status = ? AND expires_at <= ?",
+                        (table_id, HELD, now),
+                    )
+                row_ids: list[int] = []
+                for sql, params in statements:
+                    cur.execute(sql, params)
+                    row_ids.append(cur.lastrowid)
+                cur.execute("COMMIT")
+            except Exception:
+                cur.execute("ROLLBACK")
+                raise
+            for table_id in versions:
+                self._reload_table(table_id)
+            return row_ids
+
+    def _read_versions(self, table_ids: list[int]) -> dict[int, int]:
+        return {table_id: self._read_version(table_id) for table_id in table_ids}
+
+    def _read_version(self, table_id: int) -> int:
+        row = self._conn.execute(
+            "SELECT version FROM table_versions WHERE table_id = ?", (table_id,)
+        ).fetchone()
+        return row[0] if row else 0
+
+    def _db_overlapping(self, table_id: int, start: int, end: int, now: float) -> bool:
+        row = self._conn.execute(
+            "SELECT 1 FROM bookings WHERE table_id = ? AND start_min < ? AND end_min > ? "
+            "AND (status = ? OR expires_at > ?) LIMIT 1",
+            (table_id, end, start, CONFIRMED, now),
+        ).fetchone()
+        return row is not None
+
+    # ── Sync with other workers ──────────────────────────────────────
+
+    def _maybe_refresh(self) -> None:
+        if time.monotonic() - self._last_refresh >= _REFRESH_INTERVAL:
+            self.refresh()
+
+    def refresh(self, force: bool = False) -> None:
+        """Reload tables whose version changed since we last looked (writes by other workers)."""
+        with self._lock:
+            rows = self._conn.execute("SELECT table_id, version FROM table_versions").fetchall()
+            for table_id, version in rows:
+                if table_id in self._index and (force or self._versions.get(table_id) != version):
+                    self._reload_table(table_id)
+            self._last_refresh = time.monotonic()
+
+    def _reload_table(self, table_id: int) -> None:
+        with self._lock:
+            version = self._read_version(table_id)
+            rows = self._conn.execute(
+                "SELECT id, table_id, start_min, end_min, status, owner, expires_at "
+                "FROM bookings WHERE table_id = ? AND (status = ? OR expires_at > ?)",
+                (table_id, CONFIRMED, time.time()),
+            ).fetchall()
+            self._index[table_id].replace_all([Booking(*row) for row in rows])
+            self._versions[table_id] = version
+            for callback in self._listeners:
+                callback(table_id)
+
+    def close(self) -> None:
+        self._conn.close()
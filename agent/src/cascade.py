@@ -0,0 +1,369 @@
+"""
+Model cascade — send easy turns to a small fast LLM, the rest to the large one.
+
+Most turns are trivial ("yes", "8 pm", a tool result to read back) and do not
+need a 70B model's latency. CascadeLLM wraps two LLMs behind the normal
+llm.LLM interface (same pattern as livekit's llm.FallbackAdapter) and picks a
+tier per call with TurnRouter:
+- large when the last tool call failed validation, the user turn is long,
+  or the agent is in a complex stage (table / confirmation tools offered)
+- small for short user turns, UI updates and reading back successful tool results
+
+A small-tier answer is escalated to the large model, before anything reaches
+the user, when the small model errors, returns nothing, calls a tool with
+arguments that do not validate, or opens with low confidence ("I'm not sure",
+"I don't know"). Its first sentence is held back until it checks out, which
+costs next to nothing as TTS starts on a whole sentence anyway. Per-tier
+latency, tokens, cost and the escalation rate are kept in CascadeStats and
+logged per call.
+
+Usage:
+    cascade = CascadeLLM(small=groq.LLM(model="llama-3.1-8b-instant"), large=models["llm"])
+    session = AgentSession(llm=cascade, ...)
+    cascade.stats.summary()
+"""
+
+import asyncio
+import dataclasses
+import re
+import time
+from collections.abc import AsyncIterable
+from dataclasses import dataclass, field
+from typing import Any, ClassVar
+
+from livekit.agents import llm
+from livekit.agents.llm import ChatChunk, ChatContext, LLMStream
+from livekit.agents.types import (
+    DEFAULT_API_CONNECT_OPTIONS,
+    NOT_GIVEN,
+    APIConnectOptions,
+    NotGivenOr,
+)
+
+from src.logger_config import agent_flow
+
+SMALL = "small"
+LARGE = "large"
+
+SMALL_MAX_WORDS = 12
+
+# Offering any of these tools means the booking is in its table / confirmation stage
+COMPLEX_STAGE_TOOLS = frozenset({"find_table", "check_availability", "hold_table", "confirm_reservation"})
+
+_ERROR_MARKERS = ('"status": "error"', '"status": "partial"', '"status": "ambiguous"', '"status": "confirm"')
+
+# A small-model reply opening like this is a guess — the large model answers instead
+LOW_CONFIDENCE_MARKERS = (
+    "i'm not sure", "i am not sure", "not sure if", "i don't know", "i do not know",
+    "i'm not certain", "i am not certain", "i can't tell", "i cannot tell", "i think maybe",
+)
+_SENTENCE_END = re.compile(r"[.!?](\s|$)")
+_PROBE_MAX_CHARS = 120
+
+
+def is_low_confidence(text: str) -> bool:
+    text = text.lower().replace("\u2019", "'")
+    return any(marker in text for marker in LOW_CONFIDENCE_MARKERS)
+
+
+@dataclass(frozen=True)
+class TierDecision:
+    tier:   str   # SMALL | LARGE
+    reason: str
+
+
+@dataclass
+class TierStats:
+    calls:             int = 0
+    latency_ms:        list[float] = field(default_factory=list)   # request → last chunk
+    ttft_ms:           list[float] = field(default_factory=list)   # request → first chunk
+    prompt_tokens:     int = 0
+    completion_tokens: int = 0
+    cost:              float = 0.0
+
+
+@dataclass
+class CascadeStats:
+    tiers:       dict[str, TierStats] = field(default_factory=lambda: {SMALL: TierStats(), LARGE: TierStats()})
+    escalations: dict[str, int] = field(default_factory=dict)       # reason → count
+    small_first: int = 0                                             # calls routed to the small tier
+
+    def summary(self) -> dict[str, Any]:
+        def avg(values: list[float]) -> float:
+            return round(sum(values) / len(values), 1) if values else 0.0
+
+        escalated = sum(self.escalations.values())
+        return {
+            "tiers": {
+                name: {
+                    "calls": t.calls,
+                    "avg_latency_ms": avg(t.latency_ms),
+                    "avg_ttft_ms": avg(t.ttft_ms),
+                    "prompt_tokens": t.prompt_tokens,
+                    "completion_tokens": t.completion_tokens,
+                    "cost": round(t.cost, 6),
+                }
+                for name, t in self.tiers.items()
+            },
+            "escalations": dict(self.escalations),
+            "escalation_rate": round(escalated / self.small_first, 3) if self.small_first else 0.0,
+        }
+
+
+def _tool_name(tool: Any) -> str | None:
+    if llm.is_function_tool(tool) or llm.is_raw_function_tool(tool):
+        return tool.info.name
+    return None
+
+
+class TurnRouter:
+    """Decides which tier answers a call from the chat context and the offered tools."""
+
+    def __init__(self, small_max_words: int = SMALL_MAX_WORDS, complex_tools: frozenset[str] = COMPLEX_STAGE_TOOLS) -> None:
+        self.small_max_words = small_max_words
+        self.complex_tools = complex_tools
+
+    def route(self, chat_ctx: ChatContext, tools: list | None = None) -> TierDecision:
+        items = [item for item in chat_ctx.items if item.type != "agent_handoff"]
+        if not items:
+            return TierDecision(LARGE, "empty_context")
+
+        # Trailing tool outputs → this call reads back their results
+        outputs = []
+        for item in reversed(items):
+            if item.type != "function_call_output":
+                break
+            outputs.append(item)
+        if any(o.is_error or o.output.startswith("Error") or any(m in o.output for m in _ERROR_MARKERS) for o in outputs):
+            return TierDecision(LARGE, "tool_error")
+
+        tool_names = {name for name in map(_tool_name, tools or []) if name}
+        if tool_names & self.complex_tools:
+            return TierDecision(LARGE, "complex_stage")
+        if outputs:
+            return TierDecision(SMALL, "tool_result")
+
+        last = items[-1]
+        if last.type != "message" or last.role != "user":
+            return TierDecision(LARGE, "no_user_turn")
+        text = last.text_content or ""
+        if text.startswith("[UI Updates]"):
+            return TierDecision(SMALL, "ui_update")
+        if len(text.split()) > self.small_max_words:
+            return TierDecision(LARGE, "long_turn")
+        return TierDecision(SMALL, "short_turn")
+
+
+class CascadeLLM(llm.LLM):
+    """Two-tier LLM: TurnRouter picks small or large per call, with escalation on bad small answers."""
+
+    def __init__(
+        self,
+        small: llm.LLM,
+        large: llm.LLM,
+        router: TurnRouter | None = None,
+        prices: dict[str, tuple[float, float]] | None = None,
+    ) -> None:
+        """
+        Args:
+            small: fast model for easy turns.
+            large: model for everything else and for escalations.
+            router: tier policy, defaults to TurnRouter().
+            prices: tier → (input, output) cost per million tokens, for cost logging.
+        """
+        super().__init__()
+        self.small = small
+        self.large = large
+        self.router = router or TurnRouter()
+        self.prices = prices or {}
+        self.stats = CascadeStats()
+        for instance in (small, large):
+            instance.on("metrics_collected", self._on_metrics_collected)
+
+    @property
+    def model(self) -> str:
+        return f"cascade({self.small.model} → {self.large.model})"
+
+    @property
+    def provider(self) -> str:
+        return "cascade"
+
+    def chat(
+        self,
+        *,
+        chat_ctx: ChatContext,
+        tools: list | None = None,
+        conn_options: APIConnectOptions = DEFAULT_API_CONNECT_OPTIONS,
+        parallel_tool_calls: NotGivenOr[bool] = NOT_GIVEN,
+        tool_choice: NotGivenOr[llm.ToolChoice] = NOT_GIVEN,
+        extra_kwargs: NotGivenOr[dict[str, Any]] = NOT_GIVEN,
+    ) -> LLMStream:
+        return CascadeLLMStream(
+            self,
+            chat_ctx=chat_ctx,
+            tools=tools or [],
+            conn_options=conn_options,
+            parallel_tool_calls=parallel_tool_calls,
+            tool_choice=tool_choice,
+            extra_kwargs=extra_kwargs,
+        )
+
+    async def aclose(self) -> None:
+        for instance in (self.small, self.large):
+            instance.off("metrics_collected", self._on_metrics_collected)
+
+    def _on_metrics_collected(self, *args: Any, **kwargs: Any) -> None:
+        self.emit("metrics_collected", *args, **kwargs)
+
+    def _record(self, tier: str, start: float, first_chunk: float | None, usage: llm.CompletionUsage | None) -> None:
+        stats = self.stats.tiers[tier]
+        stats.calls += 1
+        end = time.perf_counter()
+        stats.latency_ms.append((end - start) * 1000)
+        if first_chunk is not None:
+            stats.ttft_ms.append((first_chunk - start) * 1000)
+        cost = 0.0
+        if usage is not None:
+            stats.prompt_tokens += usage.prompt_tokens
+            stats.completion_tokens += usage.completion_tokens
+            input_price, output_price = self.prices.get(tier, (0.0, 0.0))
+            cost = (usage.prompt_tokens * input_price + usage.completion_tokens * output_price) / 1_000_000
+            stats.cost += cost
+        if usage:
+            agent_flow.info(
+                "🪜 LLM tier=%s %.0f ms, %d+%d tokens, $%.6f",
+                tier, (end - start) * 1000, usage.prompt_tokens, usage.completion_tokens, cost,
+                extra={"category": "cascade"},
+            )
+        else:
+            agent_flow.info("🪜 LLM tier=%s %.0f ms", tier, (end - start) * 1000, extra={"category": "cascade"})
+
+
+class _EscalationError(Exception):
+    def __init__(self, reason: str) -> None:
+        super().__init__(reason)
+        self.reason = reason
+
+
+class CascadeLLMStream(LLMStream):
+    _llm_request_span_name: ClassVar[str] = "llm_cascade"
+
+    def __init__(
+        self,
+        cascade: CascadeLLM,
+        *,
+        chat_ctx: ChatContext,
+        tools: list,
+        conn_options: APIConnectOptions,
+        parallel_tool_calls: NotGivenOr[bool] = NOT_GIVEN,
+        tool_choice: NotGivenOr[llm.ToolChoice] = NOT_GIVEN,
+        extra_kwargs: NotGivenOr[dict[str, Any]] = NOT_GIVEN,
+    ) -> None:
+        super().__init__(cascade, chat_ctx=chat_ctx, tools=tools, conn_options=conn_options)
+        self._cascade = cascade
+        self._parallel_tool_calls = parallel_tool_calls
+        self._tool_choice = tool_choice
+        self._extra_kwargs = extra_kwargs
+
+    async def _run(self) -> None:
+        decision = self._cascade.router.route(self._chat_ctx, self._tools)
+        agent_flow.info("🪜 Cascade → %s (%s)", decision.tier, decision.reason, extra={"category": "cascade"})
+        if decision.tier == SMALL:
+            self._cascade.stats.small_first += 1
+            try:
+                await self._generate(self._cascade.small, SMALL, validate=True)
+                return
+            except _EscalationError as e:
+                reason = e.reason
+            self._cascade.stats.escalations[reason] = self._cascade.stats.escalations.get(reason, 0) + 1
+            agent_flow.warning("🪜 Escalating to large model: %s", reason)
+        await self._generate(self._cascade.large, LARGE, validate=False)
+
+    async def _generate(self, model: llm.LLM, tier: str, validate: bool) -> None:
+        """Stream `model`'s answer. With `validate`, tool calls are held back until they check out,
+        and any failure before the first forwarded chunk raises _EscalationError."""
+        tools_by_name = {_tool_name(t): t for t in self._tools if _tool_name(t)}
+        start = time.perf_counter()
+        self._first_chunk: float | None = None
+        self._usage: llm.CompletionUsage | None = None
+        held: list[ChatChunk] = []
+
+        try:
+            await self._stream(model, validate, tools_by_name, held)
+        finally:
+            self._cascade._record(tier, start, self._first_chunk, self._usage)
+
+    async def _stream(self, model: llm.LLM, validate: bool, tools_by_name: dict, held: list[ChatChunk]) -> None:
+        sent_text = False
+        # Small tier: text is held back until its first sentence reads as confident
+        probe: list[ChatChunk] | None = [] if validate else None
+        probe_text = ""
+        try:
+            async with model.chat(
+                chat_ctx=self._chat_ctx,
+                tools=self._tools,
+                # No retries on the small tier — escalating is faster than retrying
+                conn_options=dataclasses.replace(self._conn_options, max_retry=0) if validate else self._conn_options,
+                parallel_tool_calls=self._parallel_tool_calls,
+                tool_choice=self._tool_choice,
+                extra_kwargs=self._extra_kwargs,
+            ) as stream:
+                async for chunk in stream:
+                    if self._first_chunk is None:
+                        self._first_chunk = time.perf_counter()
+                    self._usage = chunk.usage or self._usage
+                    if validate and chunk.delta and chunk.delta.tool_calls:
+                        held.append(chunk)
+                        continue
+                    if probe is not None:
+                        probe.append(chunk)
+                        probe_text += chunk.delta.content if chunk.delta and chunk.delta.content else ""
+                        if not (_SENTENCE_END.search(probe_text) or len(probe_text) >= _PROBE_MAX_CHARS):
+                            continue
+                        sent_text = self._release_probe(probe, probe_text)
+                        probe = None
+                        continue
+                    if chunk.delta and chunk.delta.content:
+                        sent_text = True
+                    self._event_ch.send_nowait(chunk)
+        except (asyncio.CancelledError, _EscalationError):
+            raise
+        except Exception as e:
+            if validate and not sent_text:
+                raise _EscalationError(f"{type(e).__name__}") from e
+            raise
+
+        if validate:
+            if probe is not None:
+                sent_text = self._release_probe(probe, probe_text)
+            calls = [call for chunk in held for call in chunk.delta.tool_calls]
+            if not sent_text and not calls:
+                raise _EscalationError("empty_response")
+            for call in calls:
+                error = self._invalid_call(call, tools_by_name)
+                if error and not sent_text:
+                    raise _EscalationError(error)
+            for chunk in held:
+                self._event_ch.send_nowait(chunk)
+
+    def _release_probe(self, probe: list[ChatChunk], text: str) -> bool:
+        """Forward the held first sentence unless it hedges; returns whether any text was sent."""
+        if is_low_confidence(text):
+            raise _EscalationError("low_confidence")
+        for chunk in probe:
+            self._event_ch.send_nowait(chunk)
+        return bool(text)
+
+    @staticmethod
+    def _invalid_call(call: llm.FunctionToolCall, tools_by_name: dict) -> str | None:
+        tool = tools_by_name.get(call.name)
+        if tool is None:
+            return "unknown_tool"
+        try:
+            llm.utils.prepare_function_arguments(fnc=tool, json_arguments=call.arguments or "{}")
+        except Exception:
+            return "invalid_tool_arguments"
+        return None
+
+    async def _metrics_monitor_task(self, event_aiter: AsyncIterable[ChatChunk]) -> None:
+        return  # the wrapped LLMs report their own metrics
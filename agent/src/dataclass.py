@@ -2,10 +2,16 @@ from dataclasses import dataclass, field, asdict
 from typing import Any, Optional
 from livekit.agents import Agent, metrics
 
+from src.session_state import PrefillBatcher, StateLock
+from src.speech_ledger import SpeechLedger
+
 # Form IDs — must match frontend constants.ts
 BOOKING_FORM_ID = "booking-form"
 ORDER_FORM_ID   = "order-form"
 
+# Booking fields a table hold is taken for — changing any of them makes the hold stale
+HOLD_SLOT_FIELDS = ("reservation_date", "reservation_time", "no_of_guests", "table_id")
+
 from livekit.agents import RunContext
 
 # ══════════════════════════════════════════════════════════════════════
@@ -66,8 +72,13 @@ class OrderFormData:
             self.items.append(item)
         self._recalculate()
 
-    def remove_item(self, item_id: int) -> None:
-        self.items = [i for i in self.items if i.id != item_id]
+    def remove_item(self, item_id: int, quantity: Optional[int] = None) -> None:
+        """Remove `quantity` units of the item, or the whole line when quantity is None."""
+        existing = next((i for i in self.items if i.id == item_id), None)
+        if existing and quantity is not None and existing.quantity > quantity:
+            existing.quantity -= quantity
+        else:
+            self.items = [i for i in self.items if i.id != item_id]
         self._recalculate()
 
     def update(self, data: dict[str, Any]) -> None:
@@ -101,9 +112,22 @@ class UserData:
 
     # Infrastructure
     usage_collector: Optional[metrics.UsageCollector] = None
+    usage: Optional[Any] = None          # UsageLedger — cost per agent activation and per turn
     agents: dict[str, Agent] = field(default_factory=dict)
     prev_agent: Optional[Agent] = None
     job_ctx: Optional[Any] = None
+    availability: Optional[Any] = None  # TableAvailability, shared per process (see prewarm)
+    table_search: Optional[Any] = None  # TableSearch over the same availability
+    menu: Optional[Any] = None          # MenuCatalog, shared per process
+    knowledge: Optional[Any] = None     # KnowledgeBase for FAQ lookups, shared per process
+    intent_classifier: Optional[Any] = None  # IntentClassifier for the Greeter fast path
+
+    # Concurrency — parallel tool calls serialize on state_lock and share one prefill batch
+    state_lock: StateLock = field(default_factory=StateLock, repr=False)
+    prefills: PrefillBatcher = field(default_factory=PrefillBatcher, repr=False)
+
+    # LLM text / TTS characters produced per reply — what an interrupt throws away
+    speech_ledger: SpeechLedger = field(default_factory=SpeechLedger, repr=False)
 
     # ── Form helpers ─────────────────────────────────────────────────
 
@@ -127,6 +151,10 @@ class UserData:
         form = self._form_by_id(form_id)
         return getattr(form, key, default) if form else default
 
+    def queue_form_prefill(self, form_id: str, values: dict[str, Any]) -> None:
+        """Queue a FORM_PREFILL for the UI; values for the same form are merged into one message."""
+        self.prefills.queue(self.job_ctx, form_id, values)
+
     # ── Meta helpers ─────────────────────────────────────────────────
 
     def get_meta(self, key: str, default: Any = None) -> Any:
@@ -135,6 +163,21 @@ class UserData:
     def update_meta(self, data: dict[str, Any]) -> None:
         self.meta.update(data)
 
+    # ── Table hold helpers ───────────────────────────────────────────
+
+    @property
+    def booking_owner(self) -> str:
+        """Owner of this session's holds and bookings in TableAvailability (the room name)."""
+        return self.job_ctx.room.name if self.job_ctx is not None else "local"
+
+    def take_stale_table_hold(self, values: dict[str, Any]) -> list[int]:
+        """Forget the table hold if `values` change the slot it was taken for; returns its ids to release."""
+        hold_ids = self.get_meta("table_hold_ids") or []
+        if hold_ids and any(key in values and values[key] != self[key] for key in HOLD_SLOT_FIELDS):
+            self.update_meta({"table_hold_ids": None})
+            return hold_ids
+        return []
+
     # ── Backward compat: tasks.py uses self.userdata["customer_name"] ─
     # Routes directly to BookingFormData fields.
 
@@ -0,0 +1,319 @@
+"""
+Deterministic resolver for spoken reservation dates and times.
+
+Turns what the user said ("next Friday", "tomorrow", "21st of October",
+"half past seven", "8 pm") into canonical 'YYYY-MM-DD' / 'HH:MM' values in
+the restaurant's timezone, validated against the real calendar and the
+restaurant's operating hours — so the LLM never has to look up today's date
+or do calendar arithmetic itself.
+
+Usage:
+    from src.datetime_resolver import resolve_date, resolve_time
+    resolve_date("next friday")      # → ("2026-10-30", None)
+    resolve_time("half past seven")  # → ("19:30", None)
+
+Both return (value, error); `error` is None when the value is valid.
+
+Weekday rules: "friday" / "this friday" / "coming friday" is the nearest
+Friday from today (today included); "next friday" is the Friday of next week.
+Numeric dates like 20/10 are read day first. A weekday said with a date
+("monday the 26th") must agree with it.
+
+Times: only a number that is clearly a time is read ("at 8", "8 pm", "8:30",
+or a lone "8"), so "for 4 people at 8" is 20:00. The last bookable start is
+closing time minus RESERVATION_SLOT_MINUTES, and with a reservation date a
+time already past that day is rejected.
+"""
+
+import re
+from datetime import date, datetime, timedelta
+from typing import Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from src.variables import (
+    RESERVATION_SLOT_MINUTES,
+    RESTAURANT_TIMEZONE,
+    VALID_RESTAURANTS_TIME_RANGE,
+)
+
+Resolved = tuple[Optional[str], Optional[str]]
+
+_WEEKDAYS = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+_MONTHS = {
+    "january": 1, "jan": 1, "february": 2, "feb": 2, "march": 3, "mar": 3,
+    "april": 4, "apr": 4, "may": 5, "june": 6, "jun": 6, "july": 7, "jul": 7,
+    "august": 8, "aug": 8, "september": 9, "sep": 9, "sept": 9,
+    "october": 10, "oct": 10, "november": 11, "nov": 11, "december": 12, "dec": 12,
+}
+_UNITS = {
+    "zero": 0, "oh": 0, "o": 0, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5,
+    "six": 6, "seven": 7, "eight": 8, "nine": 9, "ten": 10, "eleven": 11, "twelve": 12,
+    "thirteen": 13, "fourteen": 14, "fifteen": 15, "sixteen": 16, "seventeen": 17,
+    "eighteen": 18, "nineteen": 19,
+    "first": 1, "second": 2, "third": 3, "fourth": 4, "fifth": 5, "sixth": 6,
+    "seventh": 7, "eighth": 8, "ninth": 9, "tenth": 10, "eleventh": 11, "twelfth": 12,
+    "thirteenth": 13, "fourteenth": 14, "fifteenth": 15, "sixteenth": 16,
+    "seventeenth": 17, "eighteenth": 18, "nineteenth": 19,
+}
+_TENS = {
+    "twenty": 20, "thirty": 30, "forty": 40, "fifty": 50,
+    "twentieth": 20, "thirtieth": 30,
+}
+_PM_HINTS = ("pm", "evening", "night", "tonight", "afternoon", "dinner")
+_AM_HINTS = ("am", "morning")
+# Words that can surround a bare hour ("around 8 in the evening") without making it something else
+_TIME_FILLERS = {
+    "around", "about", "by", "in", "the", "and", "a", "ish", "lunch", "please",
+    "half", "oclock", *_PM_HINTS, *_AM_HINTS,
+}
+
+_MONTH_RE = "|".join(sorted(_MONTHS, key=len, reverse=True))
+_WEEKDAY_RE = "|".join(_WEEKDAYS)
+
+
+def restaurant_now() -> datetime:
+    """Current wall-clock time in the restaurant's timezone (naive)."""
+    try:
+        return datetime.now(ZoneInfo(RESTAURANT_TIMEZONE)).replace(tzinfo=None)
+    except ZoneInfoNotFoundError:
+        return datetime.now()
+
+
+def _clock(value: str) -> int:
+    hour, minute = map(int, value.split(":"))
+    return hour * 60 + minute
+
+
+def _booking_window() -> tuple[int, int]:
+    """First and last start minute of a reservation — the last slot must end by closing time."""
+    opening = _clock(VALID_RESTAURANTS_TIME_RANGE["opening_time"])
+    closing = _clock(VALID_RESTAURANTS_TIME_RANGE["closing_time"])
+    return opening, closing - RESERVATION_SLOT_MINUTES
+
+
+def _normalize(text: str) -> str:
+    """Lowercase, strip punctuation and turn number words into digits ("twenty first" → "21")."""
+    text = str(text).lower()
+    text = re.sub(r"\b([ap])\.?\s?m\b\.?", r"\1m", text)          # p.m. / p m → pm
+    text = re.sub(r"(\d)(st|nd|rd|th)\b", r"\1", text)             # 21st → 21
+    text = re.sub(r"[,\-]", " ", text)
+    text = text.replace("o'clock", "oclock").replace("o clock", "oclock")
+
+    words = text.split()
+    out: list[str] = []
+    i = 0
+    while i < len(words):
+        word = words[i]
+        if word in _TENS:
+            value = _TENS[word]
+            nxt = words[i + 1] if i + 1 < len(words) else ""
+            if nxt in _UNITS and 0 < _UNITS[nxt] < 10:
+                value += _UNITS[nxt]
+                i += 1
+            out.append(str(value))
+        elif word in _UNITS and word not in ("o", "oh"):
+            out.append(str(_UNITS[word]))
+        elif word in ("o", "oh") and out and out[-1].isdigit() and i + 1 < len(words) and words[i + 1] in _UNITS:
+            # "seven o five" → "7 05"
+            out.append(f"0{_UNITS[words[i + 1]]}")
+            i += 1
+        else:
+            out.append(word)
+        i += 1
+    return " ".join(out)
+
+
+# ══════════════════════════════════════════════════════════════════════
+# Dates
+# ══════════════════════════════════════════════════════════════════════
+
+def _future_date(year: int, month: int, day: int, today: date, year_given: bool) -> date:
+    """Build the date, rolling over to next year when no year was said and it already passed."""
+    value = date(year, month, day)  # raises ValueError for e.g. 31 February
+    if not year_given and value < today:
+        value = date(year + 1, month, day)
+    return value
+
+
+def _parse_date(text: str, today: date) -> date | None:
+    if re.search(r"\bday after tomorrow\b", text):
+        return today + timedelta(days=2)
+    if re.search(r"\b(today|tonight|this evening)\b", text):
+        return today
+    if re.search(r"\btomorrow\b", text):
+        return today + timedelta(days=1)
+
+    match = re.search(r"\bin (\d+|a) (day|days|week|weeks)\b", text)
+    if match:
+        count = 1 if match.group(1) == "a" else int(match.group(1))
+        return today + timedelta(days=count * (7 if match.group(2).startswith("week") else 1))
+
+    match = re.search(r"\b(\d{4}) (\d{1,2}) (\d{1,2})\b", text)
+    if match:
+        return date(int(match.group(1)), int(match.group(2)), int(match.group(3)))
+
+    match = re.search(r"\b(\d{1,2})/(\d{1,2})(?:/(\d{2,4}))?\b", text)
+    if match:
+        day, month, year = int(match.group(1)), int(match.group(2)), match.group(3)
+        if year is not None:
+            full_year = int(year) + (2000 if len(year) == 2 else 0)
+            return date(full_year, month, day)
+        return _future_date(today.year, month, day, today, year_given=False)
+
+    match = re.search(rf"\b(?:the )?(\d{{1,2}}) (?:of )?({_MONTH_RE})\b(?: (\d{{4}}))?", text) or \
+        re.search(rf"\b({_MONTH_RE}) (?:the )?(\d{{1,2}})\b(?: (\d{{4}}))?", text)
+    if match:
+        first, second, year = match.groups()
+        day, month_word = (int(first), second) if first.isdigit() else (int(second), first)
+        month = _MONTHS[month_word]
+        if year:
+            return date(int(year), month, day)
+        return _future_date(today.year, month, day, today, year_given=False)
+
+    # An explicit day of month wins over a weekday said with it ("monday the 26th")
+    match = re.search(r"\bthe (\d{1,2})\b", text)
+    if match:
+        day = int(match.group(1))
+        month, year = today.month, today.year
+        if day < today.day:
+            month, year = (1, year + 1) if month == 12 else (month + 1, year)
+        return date(year, month, day)
+
+    match = re.search(rf"\b(?:(next|this|coming) )?({_WEEKDAY_RE})\b", text)
+    if match:
+        modifier, weekday = match.groups()
+        target = _WEEKDAYS.index(weekday)
+        if modifier == "next":
+            next_monday = today + timedelta(days=7 - today.weekday())
+            return next_monday + timedelta(days=target)
+        return today + timedelta(days=(target - today.weekday()) % 7)
+
+    return None
+
+
+def resolve_date(text: str, now: datetime | None = None) -> Resolved:
+    """Spoken or written date → ('YYYY-MM-DD', None) or (None, error)."""
+    now = now or restaurant_now()
+    today = now.date()
+    normalized = _normalize(text)
+    normalized = re.sub(r"\b(\d{4})(?:/| )(\d{1,2})(?:/| )(\d{1,2})\b", r"\1 \2 \3", normalized)
+
+    try:
+        value = _parse_date(normalized, today)
+    except ValueError:
+        return None, f"'{text}' is not a real calendar date. Please ask the user for a valid date."
+    if value is None:
+        return None, f"Could not understand the date '{text}'. Please ask the user for the date again."
+    if value < today:
+        return None, f"{value.isoformat()} is in the past. Please ask the user for a future date."
+    weekday = re.search(rf"\b({_WEEKDAY_RE})\b", normalized)
+    if weekday and _WEEKDAYS[value.weekday()] != weekday.group(1):
+        return None, (
+            f"{value.isoformat()} is a {_WEEKDAYS[value.weekday()].title()}, not a {weekday.group(1).title()}. "
+            "Please ask the user which date they mean."
+        )
+    return value.isoformat(), None
+
+
+# ══════════════════════════════════════════════════════════════════════
+# Times
+# ══════════════════════════════════════════════════════════════════════
+
+def _pick_meridiem(hour: int, minute: int, meridiem: str | None, prefer_pm: bool) -> tuple[int, int]:
+    if meridiem == "am":
+        return (0 if hour == 12 else hour), minute
+    if meridiem == "pm":
+        return (hour if hour == 12 else hour + 12), minute
+    if hour > 12 or hour == 0:
+        return hour, minute
+
+    # No am/pm said: choose the reading that can still be booked
+    first, last = _booking_window()
+    morning = (0 if hour == 12 else hour, minute)
+    evening = (hour if hour == 12 else hour + 12, minute)
+    candidates = [evening, morning] if prefer_pm else [morning, evening]
+    for h, m in candidates:
+        if first <= h * 60 + m <= last:
+            return h, m
+    return candidates[0]
+
+
+def _parse_time(text: str) -> tuple[int, int] | None:
+    if re.search(r"\b(noon|midday)\b", text):
+        return 12, 0
+    if re.search(r"\bmidnight\b", text):
+        return 0, 0
+
+    meridiem_match = re.search(r"\b(am|pm)\b", text)
+    meridiem = meridiem_match.group(1) if meridiem_match else None
+    prefer_pm = meridiem is None and not any(re.search(rf"\b{h}\b", text) for h in _AM_HINTS)
+    if meridiem is None and any(re.search(rf"\b{h}\b", text) for h in _PM_HINTS):
+        prefer_pm = True
+
+    match = re.search(r"\b(half|quarter|\d{1,2})(?: minutes?)? (past|after|to|before) (\d{1,2})\b", text)
+    if match:
+        amount = {"half": 30, "quarter": 15}.get(match.group(1)) or int(match.group(1))
+        hour = int(match.group(3))
+        total = hour * 60 + (amount if match.group(2) in ("past", "after") else -amount)
+        hour, minute = divmod(total % (24 * 60), 60)
+        if match.group(2) in ("to", "before") and hour == 0:
+            hour = 12
+        return _pick_meridiem(hour, minute, meridiem, prefer_pm)
+
+    # Only a number that is clearly a time: "8:30", "at 8", "8 pm", "8 oclock", or a lone "8" / "8 30" —
+    # never the first number of "for 4 people at 8"
+    bare = " ".join(w for w in text.split() if w not in _TIME_FILLERS)
+    match = re.search(r"\b(\d{1,2})[:.](\d{2})\b", text) or \
+        re.search(r"\bat (\d{1,2})(?: (\d{2}))?\b", text) or \
+        re.search(r"\b(\d{1,2})(?: (\d{2}))? ?(?:oclock|am|pm)\b", text) or \
+        re.fullmatch(r"(\d{1,2})(?: (\d{2}))?", bare)
+    if match:
+        hour = int(match.group(1))
+        minute = int(match.group(2)) if match.group(2) else 0
+        if hour > 23 or minute > 59:
+            return None
+        if re.search(r"\bhalf\b", text) and minute == 0:
+            minute = 30  # "eight and a half"
+        return _pick_meridiem(hour, minute, meridiem, prefer_pm)
+
+    return None
+
+
+def check_not_past(reservation_date: str, reservation_time: str, now: datetime | None = None) -> Optional[str]:
+    """Error for a 'YYYY-MM-DD' / 'HH:MM' slot that has already started, else None."""
+    now = now or restaurant_now()
+    if datetime.fromisoformat(f"{reservation_date}T{reservation_time}") > now:
+        return None
+    return f"{reservation_time} on {reservation_date} has already passed. Please ask the user for a later time."
+
+
+def resolve_time(text: str, reservation_date: str | None = None, now: datetime | None = None) -> Resolved:
+    """Spoken or written time → ('HH:MM', None) or (None, error).
+    With `reservation_date`, a time that has already passed that day is an error too."""
+    normalized = _normalize(text)
+    normalized = re.sub(r"(\d)(am|pm)\b", r"\1 \2", normalized)
+    # Drop any date part ("21 october at 8") so its numbers are not read as the hour
+    normalized = re.sub(
+        rf"\b\d{{4}} \d{{1,2}} \d{{1,2}}\b|\b\d{{1,2}}/\d{{1,2}}(?:/\d{{2,4}})?\b|"
+        rf"\b\d{{1,2}} (?:of )?(?:{_MONTH_RE})\b|\b(?:{_MONTH_RE}) \d{{1,2}}\b",
+        " ",
+        normalized,
+    )
+    value = _parse_time(normalized)
+    if value is None:
+        return None, f"Could not understand the time '{text}'. Please ask the user for the time again."
+
+    hour, minute = value
+    first, last = _booking_window()
+    if not first <= hour * 60 + minute <= last:
+        return None, (
+            f"{hour:02d}:{minute:02d} cannot be booked: tables are seated from {first // 60:02d}:{first % 60:02d} "
+            f"to {last // 60:02d}:{last % 60:02d} (closing at {VALID_RESTAURANTS_TIME_RANGE['closing_time']}). "
+            "Please ask the user for another time."
+        )
+    value = f"{hour:02d}:{minute:02d}"
+    if reservation_date:
+        error = check_not_past(reservation_date, value, now)
+        if error:
+            return None, error
+    return value, None
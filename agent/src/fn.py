@@ -6,6 +6,9 @@ import random
 import json
 
 from src.logger_config import agent_flow
+from src.session_recorder import recorder_for
+from src.tracing import tracer_for
+from src.usage import usage_scope
 
 async def summarize_agent_handoff(
     previous_agent_chat_ctx: ChatContext,
@@ -25,7 +28,8 @@ async def summarize_agent_handoff(
         older_ctx = full_prev_ctx.copy()
         older_ctx.items = items[:-6]  # ✅ items
 
-        summarized = await older_ctx._summarize(llm_v=llm_v)
+        with usage_scope("handoff_summary"):
+            summarized = await older_ctx._summarize(llm_v=llm_v)
 
         existing_ids = {item.id for item in chat_ctx.items}
         for item in summarized.items:  # ✅ items
@@ -64,14 +68,21 @@ async def send_to_ui(ctx: JobContext, type: str, payload: dict):
     try:
         # Encode and send via data channel
         data = json.dumps(message).encode("utf-8")
+        start = time.perf_counter()
         await ctx.room.local_participant.publish_data(
             payload=data,
             topic="agent-to-ui",
             destination_identities=[]  # Empty list for broadcast
         )
-        agent_flow.info(f"📤 Sent to UI: {type} - {payload}")
+        tracer = tracer_for(ctx.room.name)
+        if tracer is not None:
+            tracer.record_publish(type, (time.perf_counter() - start) * 1000)
+        recorder = recorder_for(ctx.room.name)
+        if recorder is not None:
+            recorder.record_ui_out(type, payload)
+        agent_flow.info("📤 Sent to UI: %s - %s", type, payload, extra={"category": "ui_io"})
     except Exception as e:
-        agent_flow.error(f"❌ Failed to send message to UI {type} {payload} and error: {e}")
+        agent_flow.error("❌ Failed to send message to UI %s %s and error: %s", type, payload, e)
         
 def get_provider(llm_models, provider_name, model_name: str):
     if provider_name in llm_models:
@@ -0,0 +1,408 @@
+"""
+Offline session harness: the real agents, session and data-channel bridge,
+with every network dependency replaced by a local stand-in.
+
+- ScriptedLLM   deterministic llm.LLM: the first matching rule answers each
+                call (text and/or tool calls); optional latency for TTFT and
+                streaming, and a record of every call
+- FakeTTS/STT   silence sized to the text / scripted transcripts
+- FakeRoom      captures publish_data (agent-to-ui) and injects ui-to-agent
+                packets through the same "data_received" event the agents use
+- SessionHarness
+                builds UserData and an AgentSession the way my_agent does
+                (speech ledger, usage ledger, log context) and starts Greeter
+
+Text turns go through AgentSession.run, so tools, handoffs, on_enter and
+llm_node run for real; nothing touches the network, so a full
+Greeter → Reservation flow runs in well under a second.
+
+Usage:
+    llm = ScriptedLLM([(user_said("table"), Reply(tool_calls=[("to_reservation", {})]))])
+    async with SessionHarness(llm) as h:
+        await h.say("I want to book a table")
+        h.room.send_ui("FORM_UPDATE", {"formId": "booking", "values": {"no_of_guests": 4}})
+        await h.wait_for(lambda: h.room.messages("FORM_PREFILL"))
+"""
+
+import asyncio
+import json
+import random
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+from typing import Any
+
+from livekit import rtc
+from livekit.agents import AgentSession, llm, stt, tts, utils
+from livekit.agents.llm import ChatChunk, ChoiceDelta, CompletionUsage, FunctionToolCall
+from livekit.agents.types import DEFAULT_API_CONNECT_OPTIONS, APIConnectOptions
+
+from src.agents.greeter import Greeter
+from src.agents.order_food import OrderFood
+from src.agents.reservation import Reservation
+from src.availability import TableAvailability
+from src.dataclass import UserData
+from src.log_pipeline import bind_log_context, log_context
+from src.menu import MenuCatalog
+from src.table_search import TableSearch
+from src.usage import RateTable, UsageLedger
+
+_CHARS_PER_TOKEN = 4
+_TTS_SAMPLE_RATE = 24000
+_TTS_MS_PER_CHAR = 60   # ~ speaking rate of the aura voices
+
+
+# ── Scripted LLM ────────────────────────────────────────────────────────
+
+
+@dataclass
+class Reply:
+    text:       str = ""
+    tool_calls: list[tuple[str, dict[str, Any]]] = field(default_factory=list)
+
+
+@dataclass
+class LLMRequest:
+    chat_ctx: llm.ChatContext
+    tools:    list[str]
+
+    @property
+    def last(self) -> Any:
+        return self.chat_ctx.items[-1] if self.chat_ctx.items else None
+
+    def last_text(self) -> str:
+        item = self.last
+        if item is None:
+            return ""
+        if item.type == "message":
+            return item.text_content or ""
+        return getattr(item, "output", "") or getattr(item, "name", "")
+
+
+Rule = Callable[[LLMRequest], bool]
+
+
+def user_said(*phrases: str) -> Rule:
+    """The call answers a user message containing any of `phrases`."""
+    def rule(request: LLMRequest) -> bool:
+        last = request.last
+        text = (last.text_content or "").lower() if last is not None and last.type == "message" and last.role == "user" else ""
+        return any(p.lower() in text for p in phrases)
+    return rule
+
+
+def ui_update(*phrases: str) -> Rule:
+    """The call answers a batched [UI Updates] message mentioning any of `phrases`."""
+    said = user_said(*phrases)
+    return lambda request: request.last_text().startswith("[UI Updates]") and said(request)
+
+
+def tool_returned(name: str) -> Rule:
+    def rule(request: LLMRequest) -> bool:
+        last = request.last
+        return last is not None and last.type == "function_call_output" and last.name == name
+    return rule
+
+
+def offered(tool: str) -> Rule:
+    return lambda request: tool in request.tools
+
+
+def all_of(*rules: Rule) -> Rule:
+    return lambda request: all(rule(request) for rule in rules)
+
+
+@dataclass
+class LLMCall:
+    at:    float   # perf_counter seconds
+    agent: str | None
+    tools: list[str]
+    last:  str
+    reply: Reply
+
+
+Latency = float | Callable[[], float]
+
+
+class ScriptedLLM(llm.LLM):
+    """Answers each call with the reply of the first matching rule, else `default`."""
+
+    def __init__(
+        self,
+        rules: list[tuple[Rule, Reply]] | None = None,
+        default: Reply | None = None,
+        ttft: Latency = 0.0,
+        tokens_per_second: float | None = None,
+    ) -> None:
+        super().__init__()
+        self.rules = list(rules or [])
+        self.default = default or Reply("Okay.")
+        self.ttft = ttft
+        self.tokens_per_second = tokens_per_second
+        self.calls: list[LLMCall] = []
+
+    @property
+    def model(self) -> str:
+        return "scripted"
+
+    @property
+    def provider(self) -> str:
+        return "harness"
+
+    def when(self, rule: Rule, reply: Reply) -> "ScriptedLLM":
+        self.rules.append((rule, reply))
+        return self
+
+    def answer(self, request: LLMRequest) -> Reply:
+        return next((reply for rule, reply in self.rules if rule(request)), self.default)
+
+    def chat(
+        self,
+        *,
+        chat_ctx: llm.ChatContext,
+        tools: list | None = None,
+        conn_options: APIConnectOptions = DEFAULT_API_CONNECT_OPTIONS,
+        **kwargs: Any,
+    ) -> llm.LLMStream:
+        tools = tools or []
+        request = LLMRequest(chat_ctx, [t.info.name for t in tools if hasattr(t, "info")])
+        reply = self.answer(request)
+        self.calls.append(LLMCall(time.perf_counter(), log_context().get("agent"), request.tools, request.last_text(), reply))
+        return _ScriptedStream(self, reply, chat_ctx=chat_ctx, tools=tools, conn_options=conn_options)
+
+
+class _ScriptedStream(llm.LLMStream):
+    def __init__(self, scripted: ScriptedLLM, reply: Reply, **kwargs: Any) -> None:
+        super().__init__(scripted, **kwargs)
+        self._reply = reply
+
+    async def _run(self) -> None:
+        scripted: ScriptedLLM = self._llm
+        request_id = utils.shortuuid("scripted_")
+        ttft = scripted.ttft() if callable(scripted.ttft) else scripted.ttft
+        if ttft > 0:
+            await asyncio.sleep(ttft)
+
+        words = self._reply.text.split(" ") if self._reply.text else []
+        for i, word in enumerate(words):
+            if i and scripted.tokens_per_second:
+                await asyncio.sleep(1 / scripted.tokens_per_second)
+            content = word if i == 0 else f" {word}"
+            self._event_ch.send_nowait(ChatChunk(id=request_id, delta=ChoiceDelta(role="assistant", content=content)))
+
+        if self._reply.tool_calls:
+            calls = [
+                FunctionToolCall(name=name, arguments=json.dumps(args), call_id=utils.shortuuid("call_"))
+                for name, args in self._reply.tool_calls
+            ]
+            self._event_ch.send_nowait(ChatChunk(id=request_id, delta=ChoiceDelta(role="assistant", tool_calls=calls)))
+
+        prompt_tokens = sum(len(item.text_content or "") for item in self._chat_ctx.items if item.type == "message") // _CHARS_PER_TOKEN
+        completion_tokens = max(len(words), 1)
+        self._event_ch.send_nowait(ChatChunk(
+            id=request_id,
+            usage=CompletionUsage(
+                completion_tokens=completion_tokens,
+                prompt_tokens=prompt_tokens,
+                total_tokens=prompt_tokens + completion_tokens,
+            ),
+        ))
+
+
+# ── Fake STT / TTS ──────────────────────────────────────────────────────
+
+
+class FakeTTS(tts.TTS):
+    """Synthesizes silence, ~60 ms per character, after an optional first-byte delay."""
+
+    def __init__(self, ttfb: Latency = 0.0) -> None:
+        super().__init__(capabilities=tts.TTSCapabilities(streaming=False), sample_rate=_TTS_SAMPLE_RATE, num_channels=1)
+        self.ttfb = ttfb
+        self.texts: list[str] = []
+
+    def synthesize(self, text: str, *, conn_options: APIConnectOptions = DEFAULT_API_CONNECT_OPTIONS) -> tts.ChunkedStream:
+        self.texts.append(text)
+        return _SilenceStream(tts=self, input_text=text, conn_options=conn_options)
+
+
+class _SilenceStream(tts.ChunkedStream):
+    async def _run(self, output_emitter: tts.AudioEmitter) -> None:
+        fake: FakeTTS = self._tts
+        ttfb = fake.ttfb() if callable(fake.ttfb) else fake.ttfb
+        if ttfb > 0:
+            await asyncio.sleep(ttfb)
+        output_emitter.initialize(
+            request_id=utils.shortuuid("tts_"),
+            sample_rate=fake.sample_rate,
+            num_channels=1,
+            mime_type="audio/pcm",
+        )
+        samples = _TTS_SAMPLE_RATE * _TTS_MS_PER_CHAR * len(self._input_text) // 1000
+        output_emitter.push(b"\x00\x00" * samples)
+        output_emitter.flush()
+
+
+class FakeSTT(stt.STT):
+    """Returns the scripted transcripts in order, one per recognize() call."""
+
+    def __init__(self, transcripts: list[str] | None = None) -> None:
+        super().__init__(capabilities=stt.STTCapabilities(streaming=False, interim_results=False))
+        self.transcripts = list(transcripts or [])
+
+    async def _recognize_impl(self, buffer: Any, *, language: Any = None, conn_options: APIConnectOptions) -> stt.SpeechEvent:
+        text = self.transcripts.pop(0) if self.transcripts else ""
+        return stt.SpeechEvent(
+            type=stt.SpeechEventType.FINAL_TRANSCRIPT,
+            alternatives=[stt.SpeechData(language="en", text=text)],
+        )
+
+
+# ── Fake room ───────────────────────────────────────────────────────────
+
+
+@dataclass
+class DataMessage:
+    at:      float   # perf_counter seconds
+    topic:   str
+    message: dict[str, Any]
+
+    @property
+    def type(self) -> str | None:
+        return self.message.get("type")
+
+
+class _FakeParticipant:
+    def __init__(self, room: "FakeRoom") -> None:
+        self._room = room
+        self.identity = "agent"
+
+    async def publish_data(self, payload: bytes | str, *, topic: str = "", destination_identities: list[str] | None = None, reliable: bool = True) -> None:
+        if self._room.publish_latency:
+            await asyncio.sleep(self._room.publish_latency)
+        data = payload.encode() if isinstance(payload, str) else payload
+        self._room.published.append(DataMessage(time.perf_counter(), topic, json.loads(data)))
+
+
+class FakeRoom(rtc.EventEmitter):
+    """Stands in for rtc.Room on the data channel: what the agent sent, and a way to play the UI."""
+
+    def __init__(self, name: str = "test-room", publish_latency: float = 0.0) -> None:
+        super().__init__()
+        self.name = name
+        self.publish_latency = publish_latency
+        self.local_participant = _FakeParticipant(self)
+        self.published: list[DataMessage] = []
+        self.received: list[DataMessage] = []
+
+    def messages(self, msg_type: str | None = None) -> list[dict[str, Any]]:
+        """agent-to-ui messages, optionally of one type."""
+        return [m.message for m in self.published if msg_type is None or m.type == msg_type]
+
+    def send_ui(self, msg_type: str, payload: dict[str, Any], topic: str = "ui-to-agent") -> None:
+        """Deliver a UI message to the agents exactly as the frontend's data packet would arrive."""
+        message = {
+            "id": f"msg_{int(time.time() * 1000)}_{random.randint(1000, 9999)}",
+            "timestamp": int(time.time() * 1000),
+            "type": msg_type,
+            "payload": payload,
+        }
+        self.received.append(DataMessage(time.perf_counter(), topic, message))
+        packet = rtc.DataPacket(data=json.dumps(message).encode(), kind=rtc.DataPacketKind.KIND_RELIABLE, participant=None, topic=topic)
+        self.emit("data_received", packet)
+
+
+# ── Session ─────────────────────────────────────────────────────────────
+
+
+class SessionHarness:
+    """One offline session: UserData, agents and AgentSession wired as in my_agent."""
+
+    def __init__(
+        self,
+        llm_: ScriptedLLM | None = None,
+        *,
+        room: FakeRoom | None = None,
+        start_agent: str = "greeter",
+        debounce_seconds: float = 0.05,
+        availability: TableAvailability | None = None,
+        menu: MenuCatalog | None = None,
+        intent_classifier: Any = None,
+        knowledge: Any = None,
+        tts_: FakeTTS | None = None,
+    ) -> None:
+        self.llm = llm_ or ScriptedLLM()
+        self.room = room or FakeRoom()
+        self.tts = tts_ or FakeTTS()
+        self.start_agent = start_agent
+        self.debounce_seconds = debounce_seconds
+        self.started_at = 0.0
+
+        self.userdata = UserData()
+        self.userdata.job_ctx = SimpleNamespace(room=self.room)
+        # Shared between sessions in production (prewarm) — pass one in to reproduce that
+        self.userdata.availability = availability or TableAvailability(":memory:")
+        self.userdata.table_search = TableSearch(self.userdata.availability)
+        self.userdata.menu = menu or MenuCatalog()
+        self.userdata.knowledge = knowledge
+        self.userdata.intent_classifier = intent_classifier
+        self.userdata.usage = UsageLedger(RateTable({}))
+        self.userdata.agents.update({
+            "greeter": Greeter(self.tts),
+            "reservation": Reservation(self.tts),
+            "order_food": OrderFood(self.tts),
+        })
+        for agent in self.userdata.agents.values():
+            agent.UI_DEBOUNCE_SECONDS = debounce_seconds
+
+        self.session = AgentSession[UserData](userdata=self.userdata, llm=self.llm)
+        self.items: list[tuple[float, Any]] = []
+        self.session.on("conversation_item_added", lambda ev: self.items.append((time.perf_counter(), ev.item)))
+        self.session.on("metrics_collected", self._on_metrics_collected)
+        self.session.on("speech_created", self.userdata.speech_ledger.on_speech_created)
+
+    def _on_metrics_collected(self, ev: Any) -> None:
+        self.userdata.speech_ledger.on_metrics_collected(ev)
+        self.userdata.usage.on_metrics_collected(ev)
+
+    async def __aenter__(self) -> "SessionHarness":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.aclose()
+
+    async def start(self) -> None:
+        bind_log_context(room=self.room.name)
+        self.started_at = time.perf_counter()
+        await self.session.start(agent=self.userdata.agents[self.start_agent])
+
+    async def aclose(self) -> None:
+        await self.session.aclose()
+        await self.llm.aclose()
+
+    @property
+    def agent_name(self) -> str:
+        return type(self.session.current_agent).__name__
+
+    async def say(self, text: str) -> Any:
+        """One user turn, typed instead of spoken; returns livekit's RunResult."""
+        return await self.session.run(user_input=text)
+
+    async def wait_for(self, condition: Callable[[], Any], timeout: float = 2.0, poll: float = 0.005) -> float:
+        """Wait until `condition()` is truthy; returns the seconds it took."""
+        start = time.perf_counter()
+        while not condition():
+            if time.perf_counter() - start > timeout:
+                raise TimeoutError(f"condition not met within {timeout:.1f} s")
+            await asyncio.sleep(poll)
+        return time.perf_counter() - start
+
+    def handoffs(self) -> list[tuple[float, str | None, str | None]]:
+        """(time, from, to) whenever the agent making LLM calls changed — i.e. the new agent's first call."""
+        changes, previous = [], None
+        for call in self.llm.calls:
+            if call.agent != previous and previous is not None:
+                changes.append((call.at, previous, call.agent))
+            previous = call.agent
+        return changes
@@ -0,0 +1,142 @@
+"""
+Local intent classifier for the Greeter's routing fast path.
+
+The Greeter only decides between reservation and food order. Asking the LLM
+costs a full LLM round trip plus a tool round trip at the start of every
+session, so the final STT transcript is classified locally first:
+- a multinomial Naive Bayes model over words and word pairs, trained at
+  start-up on the labelled utterances in knowledge/intents.json
+- keyword cues ("book", "table", "order", "pizza"...) that must agree with
+  the model, and question cues ("do you take reservations?") that mark the
+  turn as a question rather than a request
+
+Only confident requests are routed directly; everything else falls back to
+the LLM as before.
+
+Usage:
+    classifier = IntentClassifier()
+    result = classifier.classify("I'd like to book a table for four")
+    result.intent, result.confidence   # → ("reservation", 0.98)
+"""
+
+import json
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from src.variables import INTENTS_PATH
+
+ROUTABLE_INTENTS = ("reservation", "order_food")
+OTHER = "other"
+
+# Words that must appear for a prediction to count as fully backed by keywords
+_CUES: dict[str, set[str]] = {
+    "reservation": {
+        "book", "booking", "reserve", "reservation", "table", "seat", "seats", "dine",
+        "dinner", "lunch", "anniversary", "birthday", "tonight",
+    },
+    "order_food": {
+        "order", "food", "hungry", "takeaway", "delivered", "pickup", "pizza", "pizzas",
+        "pasta", "salad", "dessert", "steak", "salmon", "spaghetti", "tiramisu", "cake",
+    },
+}
+# Cues that overlap both intents ("dinner" in "order dinner") are weaker
+_SHARED_CUES = {"dinner", "lunch", "tonight"}
+
+_NEGATIONS = {"not", "don't", "dont", "no", "never", "without"}
+_REQUEST_MARKERS = re.compile(r"\b(i want|i'd like|i would like|i wanna|i need|can i|could i|can we|could you|can you book|book me|let me|get me|please)\b")
+_QUESTION_START = re.compile(r"^(do|does|are|is|what|what's|when|where|how|who|which|why)\b")
+
+_MISSING_CUE_FACTOR = 0.8
+_CONFLICTING_CUE_FACTOR = 0.5
+_QUESTION_FACTOR = 0.5
+
+
+@dataclass
+class IntentResult:
+    intent:     str                # "reservation" | "order_food" | "other"
+    confidence: float              # 0.0 - 1.0
+    scores:     dict[str, float] = field(default_factory=dict)   # model posterior per intent
+
+    def routes(self, min_confidence: float) -> bool:
+        return self.intent in ROUTABLE_INTENTS and self.confidence >= min_confidence
+
+
+def _words(text: str) -> list[str]:
+    return re.findall(r"[a-z']+|\d+", str(text).lower())
+
+
+def _features(words: list[str]) -> list[str]:
+    return words + [f"{a}_{b}" for a, b in zip(words, words[1:])]
+
+
+class IntentClassifier:
+    """Naive Bayes + keyword cues, trained once per process (see prewarm)."""
+
+    def __init__(self, path: str | None = None, examples: dict[str, list[str]] | None = None) -> None:
+        if examples is None:
+            examples = json.loads(Path(path or INTENTS_PATH).read_text(encoding="utf-8"))
+        self.labels: list[str] = list(examples)
+
+        counts: dict[str, Counter] = {label: Counter() for label in self.labels}
+        for label, utterances in examples.items():
+            for utterance in utterances:
+                counts[label].update(_features(_words(utterance)))
+        vocabulary = set().union(*counts.values())
+        total = sum(len(u) for u in examples.values())
+
+        # Laplace-smoothed log-likelihoods; unseen features fall back to _unseen[label]
+        self._priors = {label: math.log(len(examples[label]) / total) for label in self.labels}
+        self._log_probs: dict[str, dict[str, float]] = {}
+        self._unseen: dict[str, float] = {}
+        for label, counter in counts.items():
+            denominator = sum(counter.values()) + len(vocabulary)
+            self._log_probs[label] = {f: math.log((n + 1) / denominator) for f, n in counter.items()}
+            self._unseen[label] = math.log(1 / denominator)
+        self._vocabulary = vocabulary
+
+    def classify(self, text: str) -> IntentResult:
+        words = _words(text)
+        features = [f for f in _features(words) if f in self._vocabulary]
+        if not features:
+            return IntentResult(OTHER, 0.0)
+
+        log_scores = {
+            label: self._priors[label] + sum(self._log_probs[label].get(f, self._unseen[label]) for f in features)
+            for label in self.labels
+        }
+        top = max(log_scores.values())
+        exp_scores = {label: math.exp(s - top) for label, s in log_scores.items()}
+        norm = sum(exp_scores.values())
+        posterior = {label: s / norm for label, s in exp_scores.items()}
+
+        intent = max(posterior, key=posterior.get)
+        confidence = posterior[intent]
+        if intent in ROUTABLE_INTENTS:
+            confidence *= self._cue_factor(intent, words, text)
+        return IntentResult(intent, round(confidence, 3), {k: round(v, 3) for k, v in posterior.items()})
+
+    def _cue_factor(self, intent: str, words: list[str], text: str) -> float:
+        """Scale the model confidence by how well the keywords back it up."""
+        found: dict[str, set[str]] = {label: set() for label in _CUES}
+        for i, word in enumerate(words):
+            # "I don't want to book, I want to order" — a negated cue does not count
+            if _NEGATIONS & set(words[max(0, i - 3):i]):
+                continue
+            for label, cues in _CUES.items():
+                if word in cues:
+                    found[label].add(word)
+
+        factor = 1.0
+        if not found[intent] - _SHARED_CUES:
+            factor *= _MISSING_CUE_FACTOR
+        if any(found[label] - _SHARED_CUES for label in found if label != intent):
+            factor *= _CONFLICTING_CUE_FACTOR
+
+        # "Do you take reservations?" asks about booking, it does not ask to book
+        lowered = str(text).lower().strip()
+        if _QUESTION_START.match(lowered) and not _REQUEST_MARKERS.search(lowered):
+            factor *= _QUESTION_FACTOR
+        return factor
@@ -0,0 +1,137 @@
+"""
+Streaming gzip JSONL writer for per-session files that grow for the whole
+session (see src/session_recorder.py).
+
+- the event loop only enqueues: write() never blocks, and drops (counted)
+  when the bounded buffer is full, so a stalled disk costs lines, not latency
+  or memory
+- a writer thread writes <path> (one writer per file: an existing file is
+  replaced, never appended to) and sync-flushes the gzip stream every few
+  seconds, so a killed process leaves a readable file up to the last
+  flush (read_jsonl stops cleanly at the truncated tail)
+- aclose(footer) writes a final footer line (adding the line count and the
+  lines dropped here to the footer's own "dropped") and closes the file —
+  the only work left for the shutdown callback
+
+Usage:
+    writer = GzipJsonlWriter("logs/recordings/room-abc.jsonl.gz")
+    writer.write({"kind": "user", "text": "hi"})
+    await writer.aclose({"kind": "footer"})
+"""
+
+import asyncio
+import gzip
+import json
+import os
+import queue
+import threading
+import time
+import zlib
+from collections.abc import Iterator
+from typing import Any
+
+_QUEUE_SIZE = 2000
+_FLUSH_SECONDS = 2.0
+_CLOSE = object()
+
+
+def _dumps(obj: Any) -> bytes:
+    return (json.dumps(obj, separators=(",", ":"), ensure_ascii=False, default=str) + "\n").encode("utf-8")
+
+
+class GzipJsonlWriter:
+    def __init__(self, path: str, max_buffered: int = _QUEUE_SIZE, flush_seconds: float = _FLUSH_SECONDS) -> None:
+        self.path = path
+        self.flush_seconds = flush_seconds
+        self.written = 0
+        self.dropped = 0
+        self.error: str | None = None
+        self._queue: queue.Queue = queue.Queue(max_buffered)
+        self._thread: threading.Thread | None = None
+        self._closed = False
+
+    def write(self, obj: dict[str, Any]) -> None:
+        if self._closed:
+            return
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="jsonl-stream", daemon=True)
+            self._thread.start()
+        try:
+            self._queue.put_nowait(obj)
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self, footer: dict[str, Any] | None = None, timeout: float = 10.0) -> None:
+        """Write `footer` and close the file — blocking, call it through asyncio.to_thread."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._thread is None:
+            if footer is None:
+                return
+            self._thread = threading.Thread(target=self._run, name="jsonl-stream", daemon=True)
+            self._thread.start()
+        elif not self._thread.is_alive():
+            return   # the writer failed (see .error)
+        try:
+            self._queue.put((_CLOSE, footer), timeout=timeout)
+        except queue.Full:   # the disk is stalled — the file ends at its last flush, without a footer
+            self.dropped += 1
+            return
+        self._thread.join(timeout)
+
+    async def aclose(self, footer: dict[str, Any] | None = None) -> None:
+        await asyncio.to_thread(self.close, footer)
+
+    def _run(self) -> None:
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with gzip.open(self.path, "wb") as f:
+                last_flush, dirty = time.monotonic(), False
+                while True:
+                    try:
+                        item = self._queue.get(timeout=self.flush_seconds)
+                    except queue.Empty:
+                        item = None
+                    batch = [item] if item is not None else []
+                    while True:
+                        try:
+                            batch.append(self._queue.get_nowait())
+                        except queue.Empty:
+                            break
+                    for obj in batch:
+                        if isinstance(obj, tuple) and obj[0] is _CLOSE:
+                            footer = obj[1]
+                            if footer is not None:
+                                f.write(_dumps({**footer, "lines": self.written, "dropped": footer.get("dropped", 0) + self.dropped}))
+                            return
+                        try:
+                            line = _dumps(obj)
+                        except (TypeError, ValueError, RuntimeError):   # e.g. a payload mutated mid-dump
+                            self.dropped += 1
+                            continue
+                        f.write(line)
+                        self.written += 1
+                        dirty = True
+                    if dirty and time.monotonic() - last_flush >= self.flush_seconds:
+                        f.flush(zlib.Z_SYNC_FLUSH)
+                        last_flush, dirty = time.monotonic(), False
+        except Exception as e:   # a full or read-only disk must not take the session down
+            self.error = f"{type(e).__name__}: {e}"
+            self._closed = True
+
+
+def read_jsonl(path: str) -> Iterator[dict[str, Any]]:
+    """Lines of a .jsonl or .jsonl.gz file; a file cut short by a crash ends at its last complete line."""
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        try:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    return   # partial last line
+        except (EOFError, zlib.error):
+            return
@@ -0,0 +1,148 @@
+"""
+Local FAQ knowledge store with BM25 retrieval.
+
+General questions (hours, location, parking, cuisine...) are answered from
+passages in knowledge/restaurant.json instead of being pasted into every
+prompt. The index is built once per process (see prewarm) and the Greeter's
+lookup_info tool returns the top passages, so the knowledge base can grow
+without growing per-turn prompt tokens.
+
+Recent query → result pairs are kept in a small LRU cache keyed on the
+normalized query terms; prewarm fills it with every passage's sample
+questions so the common questions never hit the index.
+
+Usage:
+    kb = KnowledgeBase("knowledge/restaurant.json")
+    kb.warm()
+    kb.search("when do you close on sunday", k=2)[0].passage.title   # → "Opening hours"
+"""
+
+import json
+import math
+import re
+import threading
+from collections import Counter, OrderedDict, defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+
+from src.variables import KNOWLEDGE_PATH
+
+# Standard BM25 parameters
+_K1 = 1.5
+_B = 0.75
+_CACHE_SIZE = 256
+
+_STOPWORDS = {
+    "a", "an", "the", "is", "are", "do", "does", "you", "your", "i", "me", "my", "we", "to",
+    "of", "in", "on", "at", "for", "and", "or", "can", "what", "which", "how", "there", "it",
+    "be", "have", "has", "any", "please", "tell", "about", "there's", "what's", "like", "with",
+}
+
+
+@dataclass(frozen=True)
+class Passage:
+    id:        str
+    title:     str
+    text:      str
+    questions: tuple[str, ...] = ()
+
+
+@dataclass(frozen=True)
+class PassageMatch:
+    passage: Passage
+    score:   float
+
+
+@dataclass
+class CacheStats:
+    hits:   int = 0
+    misses: int = 0
+    size:   int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+def _fold(word: str) -> str:
+    # Plural folding keeps "allergies"/"allergy", "options"/"option" together
+    if len(word) > 4 and word.endswith("ies"):
+        return word[:-3] + "y"
+    if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+        return word[:-1]
+    return word
+
+
+def _terms(text: str) -> list[str]:
+    words = re.findall(r"[a-z0-9']+", str(text).lower())
+    return [_fold(w) for w in words if w not in _STOPWORDS]
+
+
+class KnowledgeBase:
+    """BM25 index over FAQ passages plus an LRU cache of recent queries."""
+
+    def __init__(self, path: str | None = None, passages: list[dict] | None = None) -> None:
+        if passages is None:
+            passages = json.loads(Path(path or KNOWLEDGE_PATH).read_text(encoding="utf-8"))
+        self.passages: list[Passage] = [
+            Passage(p["id"], p["title"], p["text"], tuple(p.get("questions", ()))) for p in passages
+        ]
+
+        # Title and sample questions are indexed with the text — they carry the words users ask with
+        self._postings: dict[str, list[tuple[int, int]]] = defaultdict(list)
+        self._lengths: list[int] = []
+        for doc_id, passage in enumerate(self.passages):
+            terms = _terms(" ".join((passage.title, passage.text, *passage.questions)))
+            self._lengths.append(len(terms))
+            for term, tf in Counter(terms).items():
+                self._postings[term].append((doc_id, tf))
+
+        n_docs = len(self.passages)
+        self._avg_length = sum(self._lengths) / n_docs if n_docs else 0.0
+        self._idf: dict[str, float] = {
+            term: math.log(1 + (n_docs - len(docs) + 0.5) / (len(docs) + 0.5))
+            for term, docs in self._postings.items()
+        }
+
+        self._cache: OrderedDict[tuple[str, ...], list[PassageMatch]] = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self.stats = CacheStats()
+
+    def warm(self) -> None:
+        """Pre-compute the answers to every passage's sample questions."""
+        for passage in self.passages:
+            for question in passage.questions:
+                self.search(question)
+
+    def search(self, query: str, k: int = 3) -> list[PassageMatch]:
+        """Top `k` passages for the query, best first. Empty when no query word is known."""
+        terms = _terms(query)
+        key = tuple(sorted(terms))
+        with self._cache_lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                self.stats.hits += 1
+                return cached[:k]
+            self.stats.misses += 1
+
+        matches = self._rank(terms)
+        with self._cache_lock:
+            self._cache[key] = matches
+            while len(self._cache) > _CACHE_SIZE:
+                self._cache.popitem(last=False)
+            self.stats.size = len(self._cache)
+        return matches[:k]
+
+    def _rank(self, terms: list[str]) -> list[PassageMatch]:
+        scores: dict[int, float] = defaultdict(float)
+        for term, query_tf in Counter(terms).items():
+            idf = self._idf.get(term)
+            if idf is None:
+                continue
+            for doc_id, tf in self._postings[term]:
+                norm = _K1 * (1 - _B + _B * self._lengths[doc_id] / self._avg_length)
+                scores[doc_id] += query_tf * idf * tf * (_K1 + 1) / (tf + norm)
+        ranked = sorted(scores.items(), key=lambda s: (-s[1], s[0]))
+        return [PassageMatch(self.passages[doc_id], round(score, 3)) for doc_id, score in ranked]
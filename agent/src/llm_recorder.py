@@ -0,0 +1,293 @@
+"""
+Incremental LLM request / response recorder.
+
+Replaces StatefulLLMLogger, which parsed openai's DEBUG log strings with a
+brace matcher and ast.literal_eval, kept every message forever and rewrote
+the whole JSON file on every record. The recorder instead hooks the LLM
+plugins' HTTP clients (httpx event hooks — both the OpenAI-compatible
+plugins and Mistral's SDK use httpx):
+
+- on the event loop the hooks only enqueue raw bytes: the request body,
+  and a tee of the (streamed) response body
+- a writer thread parses them and appends JSON lines to one file per
+  session, logs/llm/<room>-<job id>.jsonl (room names can be reused, and
+  record ids are unique across processes, so files never mix sessions)
+- requests resend the whole conversation, so only the messages after the
+  prefix already recorded for that model are written (message_offset says
+  where they start); a changed prefix (summarized handoff, new agent)
+  writes the full list again
+- memory is bounded: the queue drops and counts when full, response bodies
+  are capped, and only a small LRU of per-model prefixes is kept
+
+Usage:
+    recorder = LLMRecorder("logs/llm")
+    install_llm_recorder(models["llm"], recorder)   # also walks CascadeLLM tiers
+"""
+
+import hashlib
+import json
+import os
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any
+
+import httpx
+
+from src.log_pipeline import log_context
+from src.logger_config import agent_flow
+from src.speech_ledger import active_speech_id
+
+_QUEUE_SIZE = 1000
+_MAX_BODY_BYTES = 512 * 1024
+_MAX_PREFIXES = 64
+_RATE_LIMIT_PREFIX = "x-ratelimit-"
+_REQUEST_ID_HEADERS = ("x-request-id", "inference-id", "mistral-correlation-id")
+
+
+def _digest(messages: list[Any]) -> str:
+    h = hashlib.blake2b(digest_size=16)
+    for message in messages:
+        h.update(json.dumps(message, sort_keys=True, ensure_ascii=False).encode())
+    return h.hexdigest()
+
+
+def parse_response_body(body: bytes) -> dict[str, Any]:
+    """Assemble text, tool calls and usage from an SSE stream or a plain JSON completion."""
+    text = body.decode("utf-8", errors="replace")
+    if not text.lstrip().startswith("data:"):
+        try:
+            data = json.loads(text)
+        except ValueError:
+            return {"raw": text[:2000]}
+        message = (data.get("choices") or [{}])[0].get("message") or {}
+        return {"content": message.get("content"), "tool_calls": message.get("tool_calls"), "usage": data.get("usage")}
+
+    content: list[str] = []
+    tool_calls: dict[int, dict[str, Any]] = {}
+    usage = None
+    for line in text.splitlines():
+        if not line.startswith("data:"):
+            continue
+        payload = line[5:].strip()
+        if not payload or payload == "[DONE]":
+            continue
+        try:
+            chunk = json.loads(payload)
+        except ValueError:
+            continue
+        chunk = chunk.get("data", chunk)  # Mistral wraps chunks in {"data": ...}
+        usage = chunk.get("usage") or usage
+        for choice in chunk.get("choices") or []:
+            delta = choice.get("delta") or {}
+            if delta.get("content"):
+                content.append(delta["content"])
+            for call in delta.get("tool_calls") or []:
+                slot = tool_calls.setdefault(call.get("index", len(tool_calls)), {"name": "", "arguments": ""})
+                function = call.get("function") or {}
+                slot["name"] += function.get("name") or ""
+                arguments = function.get("arguments") or ""
+                slot["arguments"] += arguments if isinstance(arguments, str) else json.dumps(arguments)
+    return {"content": "".join(content) or None, "tool_calls": list(tool_calls.values()) or None, "usage": usage}
+
+
+def _session_name(meta: dict[str, Any]) -> str:
+    """'<room>-<job id>' — the file name and prefix key of one session."""
+    name = meta.get("room") or "no_room"
+    if meta.get("job"):
+        name = f"{name}-{meta['job']}"
+    return name.replace(os.sep, "_")
+
+
+class _TeeStream(httpx.AsyncByteStream):
+    """Forwards the response body to the client and keeps a capped copy for the recorder."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, on_close) -> None:
+        self._stream = stream
+        self._on_close = on_close
+        self._chunks: list[bytes] = []
+        self._size = 0
+        self._truncated = False
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            if self._size < _MAX_BODY_BYTES:
+                self._chunks.append(chunk)
+                self._size += len(chunk)
+            else:
+                self._truncated = True
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            self._on_close(b"".join(self._chunks), self._truncated)
+
+
+class LLMRecorder:
+    def __init__(self, directory: str = "logs/llm") -> None:
+        self.directory = directory
+        self.dropped = 0
+        self._queue: queue.Queue = queue.Queue(_QUEUE_SIZE)
+        self._thread: threading.Thread | None = None
+        self._thread_lock = threading.Lock()
+        # Writer-thread state
+        self._prefixes: OrderedDict[tuple[str, str], tuple[int, str]] = OrderedDict()
+
+    # ── Event-loop side: enqueue only ────────────────────────────────
+
+    def _put(self, item: tuple) -> None:
+        if self._thread is None:
+            # Started lazily, so a recorder built before the worker process forks still gets its thread
+            with self._thread_lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="llm-recorder", daemon=True)
+                    self._thread.start()
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            self.dropped += 1
+
+    async def on_request(self, request: httpx.Request) -> None:
+        if request.method != "POST":
+            return
+        # Unique across worker processes and restarts — files may be appended to by more than one
+        request_id = uuid.uuid4().hex[:16]
+        request.extensions["llm_recorder_id"] = request_id
+        context = log_context()
+        meta = {
+            "id": request_id,
+            "ts": time.time(),
+            "room": context.get("room"),
+            "job": context.get("job"),
+            "agent": context.get("agent"),
+            "turn": active_speech_id(),
+            "url": str(request.url.path),
+        }
+        request.extensions["llm_recorder_start"] = time.perf_counter()
+        self._put(("request", meta, bytes(request.content)))
+
+    async def on_response(self, response: httpx.Response) -> None:
+        request = response.request
+        request_id = request.extensions.get("llm_recorder_id")
+        if request_id is None:
+            return
+        start = request.extensions.get("llm_recorder_start", time.perf_counter())
+        context = log_context()
+        headers = response.headers
+        meta = {
+            "id": request_id,
+            "room": context.get("room"),
+            "job": context.get("job"),
+            "status": response.status_code,
+            "provider_request_id": next((headers[h] for h in _REQUEST_ID_HEADERS if h in headers), None),
+            "rate_limit": {k[len(_RATE_LIMIT_PREFIX):]: v for k, v in headers.items() if k.startswith(_RATE_LIMIT_PREFIX)},
+        }
+
+        def on_close(body: bytes, truncated: bool) -> None:
+            meta["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 1)
+            meta["truncated"] = truncated
+            self._put(("response", meta, body))
+
+        response.stream = _TeeStream(response.stream, on_close)
+
+    # ── Writer thread ────────────────────────────────────────────────
+
+    def flush(self, timeout: float = 5.0) -> None:
+        """Wait until everything queued so far is written (tests, shutdown)."""
+        if self._thread is not None:
+            done = threading.Event()
+            self._put(("flush", done, b""))
+            done.wait(timeout)
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            lines: dict[str, list[str]] = {}
+            waiters: list[threading.Event] = []
+            for kind, meta, body in batch:
+                if kind == "flush":
+                    waiters.append(meta)
+                    continue
+                try:
+                    entry = self._request_entry(meta, body) if kind == "request" else self._response_entry(meta, body)
+                except Exception as e:   # never let a bad body stop the writer
+                    entry = {"type": kind, "id": meta.get("id"), "error": f"{type(e).__name__}: {e}"}
+                path = os.path.join(self.directory, f"{_session_name(meta)}.jsonl")
+                lines.setdefault(path, []).append(json.dumps(entry, ensure_ascii=False, default=str))
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+                for path, entries in lines.items():
+                    with open(path, "a", encoding="utf-8") as f:
+                        f.write("\n".join(entries) + "\n")
+            except OSError as e:
+                agent_flow.warning("⚠️ LLM recorder write failed: %s", e)
+            for waiter in waiters:
+                waiter.set()
+
+    def _request_entry(self, meta: dict[str, Any], body: bytes) -> dict[str, Any]:
+        data = json.loads(body) if body else {}
+        messages = data.pop("messages", [])
+        tools = data.pop("tools", None) or []
+        model = str(data.get("model"))
+
+        key = (_session_name(meta), model)
+        offset, prefix_digest = self._prefixes.get(key, (0, ""))
+        if not (offset and len(messages) >= offset and _digest(messages[:offset]) == prefix_digest):
+            offset = 0
+        self._prefixes[key] = (len(messages), _digest(messages))
+        self._prefixes.move_to_end(key)
+        while len(self._prefixes) > _MAX_PREFIXES:
+            self._prefixes.popitem(last=False)
+
+        return {
+            "type": "request",
+            **meta,
+            "model": model,
+            "params": {k: v for k, v in data.items() if k != "model"},
+            "tools": [t.get("function", t).get("name") for t in tools if isinstance(t, dict)],
+            "message_count": len(messages),
+            "message_offset": offset,
+            "messages": messages[offset:],
+        }
+
+    def _response_entry(self, meta: dict[str, Any], body: bytes) -> dict[str, Any]:
+        return {"type": "response", **meta, **parse_response_body(body)}
+
+
+def _http_client(instance: Any) -> httpx.AsyncClient | None:
+    client = getattr(instance, "_client", None)
+    if client is None:
+        return None
+    if isinstance(getattr(client, "_client", None), httpx.AsyncClient):       # openai.AsyncClient
+        return client._client
+    sdk_config = getattr(client, "sdk_configuration", None)                   # mistralai.Mistral
+    if isinstance(getattr(sdk_config, "async_client", None), httpx.AsyncClient):
+        return sdk_config.async_client
+    return None
+
+
+def install_llm_recorder(instance: Any, recorder: LLMRecorder) -> int:
+    """Hook `recorder` into the LLM's HTTP client (every tier of a CascadeLLM). Returns clients hooked."""
+    tiers = [instance.small, instance.large] if hasattr(instance, "small") and hasattr(instance, "large") else [instance]
+    installed = 0
+    for tier in tiers:
+        client = _http_client(tier)
+        if client is None:
+            agent_flow.warning("⚠️ LLM recorder: no httpx client found on %s", type(tier).__name__)
+            continue
+        hooks = client.event_hooks
+        if recorder.on_request not in hooks["request"]:
+            hooks["request"].append(recorder.on_request)
+            hooks["response"].append(recorder.on_response)
+            client.event_hooks = hooks
+        installed += 1
+    return installed
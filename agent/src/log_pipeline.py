@@ -0,0 +1,186 @@
+"""
+Non-blocking, structured logging for agent_flow.
+
+agent_flow is called on the event loop from every tool, every UI message
+and every send_to_ui. With a plain FileHandler each call formats the
+message and writes to disk on the loop, so a slow disk becomes an audio
+stall. Here the loop only enqueues the record:
+
+    agent_flow.info(...) ─► SamplingFilter ─► ContextFilter ─► queue ─► writer thread
+                                                                         ├─ logs/agent_flow.log   (text)
+                                                                         └─ logs/agent_flow.jsonl (JSON)
+
+- lazy formatting: records are formatted on the writer thread, so pass
+  %-style args (agent_flow.info("sent %s", payload)) instead of f-strings
+  on hot paths, and don't mutate the args afterwards
+- every record carries room / agent / turn ids — room and agent from the
+  session's log context, turn from the active SpeechHandle
+- agent_flow stops propagating to the root logger: in a livekit job process
+  the root logger carries the IPC log-queue handler, which formats and
+  pickles every record on the calling thread — i.e. back on the loop
+- high-volume categories (extra={"category": "ui_io"}) can be sampled with
+  LOG_SAMPLE_RATES="ui_io=0.1,cascade=0.5"; warnings and errors are never
+  dropped
+
+Usage:
+    listener = start_queue_logging(agent_flow, [text_handler, json_handler], parse_sample_rates("ui_io=0.1"))
+    bind_log_context(room="room-1")          # once per session, in my_agent
+    update_log_context(agent="Reservation")  # in BaseAgent.on_enter
+"""
+
+import contextvars
+import json
+import logging
+import logging.handlers
+import queue
+import threading
+from datetime import datetime, timezone
+from typing import Any
+
+from src.speech_ledger import active_speech_id
+
+_LOG_CONTEXT = contextvars.ContextVar[dict[str, str] | None]("log_context", default=None)
+
+# If the writer thread falls this far behind (disk stall), new records are dropped and counted —
+# blocking the event loop is what this module exists to avoid
+_QUEUE_SIZE = 10_000
+
+
+def bind_log_context(**fields: str) -> dict[str, str]:
+    """Start a log context for the current task and every task it creates (one per session)."""
+    context = dict(fields)
+    _LOG_CONTEXT.set(context)
+    return context
+
+
+def update_log_context(**fields: str) -> None:
+    """Update the session's log context in place — visible to all of the session's tasks."""
+    context = _LOG_CONTEXT.get()
+    if context is not None:
+        context.update(fields)
+
+
+def log_context() -> dict[str, str]:
+    """The current session's log context (empty outside a session)."""
+    return _LOG_CONTEXT.get() or {}
+
+
+def log_context_in(context: contextvars.Context) -> dict[str, str]:
+    """The log context held by another task's context — readable from any thread."""
+    return context.get(_LOG_CONTEXT) or {}
+
+
+class ContextFilter(logging.Filter):
+    """Stamp room / agent / turn ids on the record in the calling task, before it crosses threads."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        context = log_context()
+        record.room = context.get("room")
+        record.agent = context.get("agent")
+        record.turn = active_speech_id()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """Keep 1 in every round(1 / rate) INFO/DEBUG records per category — deterministic, no RNG."""
+
+    def __init__(self, rates: dict[str, float]) -> None:
+        super().__init__()
+        self.every = {category: max(1, round(1 / rate)) for category, rate in rates.items() if rate > 0}
+        self.dropped_categories = {category for category, rate in rates.items() if rate <= 0}
+        self.seen: dict[str, int] = {}
+        self.dropped: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        category = getattr(record, "category", None)
+        if category is None or record.levelno >= logging.WARNING:
+            return True
+        if category in self.dropped_categories:
+            keep = False
+        else:
+            every = self.every.get(category)
+            if every is None:
+                return True
+            with self._lock:
+                n = self.seen[category] = self.seen.get(category, 0) + 1
+            keep = (n - 1) % every == 0
+        if not keep:
+            with self._lock:
+                self.dropped[category] = self.dropped.get(category, 0) + 1
+        return keep
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry: dict[str, Any] = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+            "room": getattr(record, "room", None),
+            "agent": getattr(record, "agent", None),
+            "turn": getattr(record, "turn", None),
+        }
+        category = getattr(record, "category", None)
+        if category:
+            entry["category"] = category
+        if record.exc_info or record.exc_text:
+            entry["exc"] = record.exc_text or self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class LazyQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that leaves formatting to the writer thread.
+
+    The stdlib version formats in prepare() — i.e. on the event loop — so it
+    only saves the disk write. Records stay in-process, so nothing needs pickling.
+    """
+
+    def __init__(self, log_queue: queue.Queue) -> None:
+        super().__init__(log_queue)
+        self.overflow = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if record.exc_info and not record.exc_text:
+            # Tracebacks reference frames that may be gone by the time the writer runs
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.overflow += 1
+
+
+def parse_sample_rates(spec: str | None) -> dict[str, float]:
+    """'ui_io=0.1,cascade=0.5' → {"ui_io": 0.1, "cascade": 0.5}"""
+    rates: dict[str, float] = {}
+    for part in (spec or "").split(","):
+        if "=" in part:
+            category, rate = part.split("=", 1)
+            rates[category.strip()] = float(rate)
+    return rates
+
+
+def start_queue_logging(
+    logger: logging.Logger,
+    handlers: list[logging.Handler],
+    sample_rates: dict[str, float] | None = None,
+) -> logging.handlers.QueueListener:
+    """Route `logger` through a queue to `handlers` on a background writer thread.
+
+    The logger stops propagating — otherwise every record is also handled
+    synchronously by the root logger's handlers and the queue saves nothing.
+    """
+    log_queue: queue.Queue = queue.Queue(_QUEUE_SIZE)
+    queue_handler = LazyQueueHandler(log_queue)
+    queue_handler.addFilter(SamplingFilter(sample_rates or {}))
+    queue_handler.addFilter(ContextFilter())
+    logger.addHandler(queue_handler)
+    logger.propagate = False
+
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    return listener
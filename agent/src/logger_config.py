@@ -3,9 +3,11 @@ Centralized logging configuration for the agent.
 Import karke use karo: from src.logger_config import agent_flow, openai_logger
 """
 
+import atexit
 import logging
 import os
-from src.JSONExtractHandler import StatefulLLMLogger
+
+from src.log_pipeline import JsonFormatter, parse_sample_rates, start_queue_logging
 
 # Make logs directory if not exists
 if not os.path.exists('logs'):
@@ -33,27 +35,35 @@ if not os.path.exists('logs'):
 # vip_handler.setLevel(logging.DEBUG) # DEBUG zaroori hai kyunki OpenAI raw data DEBUG level pe hota hai
 # vip_handler.setFormatter(vip_formatter)
 
-# Ye saare request aur response ko ek json file mein daal dega
-# openai_logger = logging.getLogger("openai._base_client")
-# openai_logger.setLevel(logging.DEBUG)
-# openai_logger.handlers.clear()  # Pehle saare handlers hatao
-# openai_logger.addHandler(StatefulLLMLogger("logs/live_request.json"))
-# openai_logger.propagate = False  # Root logger mein mat bhejna
+# Request aur response bodies ab log strings se nahi, client hook se record hote hain:
+# LLM_RECORDER_ENABLED=true → logs/llm/<room>-<job id>.jsonl (see src/llm_recorder.py)
 
 
 # temp_filehandler = logging.FileHandler('logs/vip_agent.log')
 # openai_logger.addHandler(temp_filehandler)
 
 # C. CUSTOM AGENT LOGGER (Jo hum code mein use karenge)
+# Event loop sirf queue mein daalta hai — formatting aur disk write background thread pe (see src/log_pipeline.py)
 agent_flow_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 agent_flow_handler = logging.FileHandler('logs/agent_flow.log')
 agent_flow_handler.setLevel(logging.INFO)
 agent_flow_handler.setFormatter(agent_flow_formatter)
 
+# Same records as JSON lines with room / agent / turn ids
+agent_flow_json_handler = logging.FileHandler('logs/agent_flow.jsonl')
+agent_flow_json_handler.setLevel(logging.INFO)
+agent_flow_json_handler.setFormatter(JsonFormatter())
+
 agent_flow = logging.getLogger("agent_flow")
 agent_flow.setLevel(logging.INFO)
-agent_flow.addHandler(agent_flow_handler)
-# agent_flow.propagate = False  # Root logger mein mat 
+agent_flow_listener = start_queue_logging(
+    agent_flow,
+    [agent_flow_handler, agent_flow_json_handler],
+    # e.g. LOG_SAMPLE_RATES="ui_io=0.1,tool_prune=0.2" — sirf INFO/DEBUG sample hote hain
+    sample_rates=parse_sample_rates(os.getenv("LOG_SAMPLE_RATES")),
+)
+atexit.register(agent_flow_listener.stop)  # flush the queue on exit
+# start_queue_logging ne agent_flow.propagate = False kar diya — root logger (livekit IPC handler) tak nahi jaata
 
 
 
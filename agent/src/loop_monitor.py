@@ -0,0 +1,235 @@
+"""
+Event-loop lag monitor and slow-callback detector.
+
+Audio frames, VAD and the data channel all share the job process's event
+loop, so any callback that blocks it (a synchronous file write, a big
+json.loads, a plugin imported mid-session) delays everything behind it.
+Two probes, one per process:
+
+- lag sampler: a task that sleeps LOOP_LAG_SAMPLE_SECONDS and records how
+  late it woke up, into a rolling histogram (p50/p95/p99)
+- slow-callback detector: every loop callback is timed; a watchdog thread
+  grabs the loop thread's stack while a callback is still running past
+  LOOP_SLOW_CALLBACK_MS, so the log shows where it was stuck, not just
+  which task it was
+
+Slow callbacks are attributed to the session (room / agent / turn) through
+the callback's own contextvars context, i.e. the log context bound in
+my_agent, and summed per room for the session report. The detector wraps
+asyncio.Handle._run, so it covers the stock asyncio loop only (under uvloop
+just the lag sampler reports).
+
+Usage:
+    monitor = LoopMonitor(slow_callback_ms=50)
+    monitor.start()                       # idempotent, from any session
+    monitor.session_summary("room-1")
+    monitor.write_prometheus("logs/event_loop.prom")
+"""
+
+import asyncio
+import contextvars
+import sys
+import threading
+import time
+import traceback
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Any
+
+from src.log_pipeline import log_context
+from src.logger_config import agent_flow
+from src.speech_ledger import active_speech_id
+from src.tracing import RollingHistogram, write_atomic
+
+_QUANTILES = (0.5, 0.95, 0.99)
+_STACK_LIMIT = 12
+_MAX_ROOMS = 64
+_RECENT = 20
+
+_original_run = asyncio.Handle._run
+_monitor: "LoopMonitor | None" = None
+
+
+def _timed_run(handle: asyncio.Handle) -> None:
+    monitor = _monitor
+    if monitor is None or handle._loop is not monitor.loop:
+        return _original_run(handle)
+    start = time.perf_counter()
+    monitor._running = (handle, start)
+    try:
+        return _original_run(handle)
+    finally:
+        monitor._running = None
+        elapsed = time.perf_counter() - start
+        if elapsed >= monitor.slow_seconds:
+            monitor._on_slow(handle, elapsed)
+
+
+def describe_callback(handle: asyncio.Handle) -> str:
+    callback = handle._callback
+    owner = getattr(callback, "__self__", None)
+    if isinstance(owner, asyncio.Task):
+        coro = owner.get_coro()
+        return f"task {owner.get_name()} ({getattr(coro, '__qualname__', coro)})"
+    return getattr(callback, "__qualname__", repr(callback))
+
+
+@dataclass
+class SlowCallback:
+    callback:    str
+    duration_ms: float
+    room:        str | None
+    agent:       str | None
+    turn:        str | None
+    stack:       list[str] = field(default_factory=list)
+
+
+@dataclass
+class RoomStalls:
+    count:    int = 0
+    total_ms: float = 0.0
+    max_ms:   float = 0.0
+    worst:    str = ""
+
+    def add(self, stall: SlowCallback) -> None:
+        self.count += 1
+        self.total_ms += stall.duration_ms
+        if stall.duration_ms > self.max_ms:
+            self.max_ms = stall.duration_ms
+            self.worst = stall.callback
+
+
+class LoopMonitor:
+    """Process-wide; created in prewarm and started by the first session."""
+
+    def __init__(self, slow_callback_ms: float = 50.0, sample_seconds: float = 0.1) -> None:
+        self.slow_seconds = slow_callback_ms / 1000
+        self.sample_seconds = sample_seconds
+        self.loop: asyncio.AbstractEventLoop | None = None
+        self.lag = RollingHistogram()
+        self.recent: deque[SlowCallback] = deque(maxlen=_RECENT)
+        self.rooms: OrderedDict[str, RoomStalls] = OrderedDict()
+        self.agents: dict[str, RoomStalls] = {}
+        self._lock = threading.Lock()
+        self._running: tuple[asyncio.Handle, float] | None = None
+        self._captured: tuple[asyncio.Handle, list[str]] | None = None
+        self._loop_thread_id = 0
+        self._sampler: asyncio.Task | None = None
+        self._watchdog: threading.Thread | None = None
+        self._stopped = threading.Event()
+
+    def running_context(self) -> contextvars.Context | None:
+        """Context of the callback the loop is running right now (None when idle) — for samplers."""
+        running = self._running
+        return running[0]._context if running is not None else None
+
+    def start(self) -> None:
+        global _monitor
+        if self.loop is not None:
+            return
+        self.loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._stopped.clear()
+        _monitor = self
+        asyncio.Handle._run = _timed_run   # also covers TimerHandle, its subclass
+        self._sampler = asyncio.create_task(self._sample_lag(), name="loop-lag-sampler")
+        self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._watchdog.start()
+
+    def stop(self) -> None:
+        global _monitor
+        if _monitor is self:
+            _monitor = None
+            asyncio.Handle._run = _original_run
+        if self._sampler is not None:
+            self._sampler.cancel()
+        self._stopped.set()
+        self.loop = None
+
+    async def _sample_lag(self) -> None:
+        while True:
+            expected = time.perf_counter() + self.sample_seconds
+            await asyncio.sleep(self.sample_seconds)
+            with self._lock:
+                self.lag.observe(max(0.0, time.perf_counter() - expected) * 1000)
+
+    def _watch(self) -> None:
+        interval = self.slow_seconds / 4
+        while not self._stopped.wait(interval):
+            running = self._running
+            if running is None or time.perf_counter() - running[1] < self.slow_seconds:
+                continue
+            handle = running[0]
+            if self._captured is not None and self._captured[0] is handle:
+                continue
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is not None and self._running is running:
+                self._captured = (handle, traceback.format_stack(frame, limit=_STACK_LIMIT))
+
+    def _on_slow(self, handle: asyncio.Handle, elapsed: float) -> None:
+        # The callback has returned, so its context can be entered to read the session's ids
+        context, turn = handle._context.run(lambda: (log_context(), active_speech_id()))
+        captured, self._captured = self._captured, None
+        stall = SlowCallback(
+            callback=describe_callback(handle),
+            duration_ms=round(elapsed * 1000, 1),
+            room=context.get("room"),
+            agent=context.get("agent"),
+            turn=turn,
+            stack=captured[1] if captured is not None and captured[0] is handle else [],
+        )
+        with self._lock:
+            self.recent.append(stall)
+            if stall.room:
+                self.rooms.setdefault(stall.room, RoomStalls()).add(stall)
+                self.rooms.move_to_end(stall.room)
+                while len(self.rooms) > _MAX_ROOMS:
+                    self.rooms.popitem(last=False)
+            self.agents.setdefault(stall.agent or "none", RoomStalls()).add(stall)
+        # Logged from inside the callback's context, so the JSON record carries the session's ids too
+        handle._context.run(
+            agent_flow.warning,
+            "🐢 Event loop blocked %.1f ms by %s [room=%s agent=%s turn=%s]\n%s",
+            stall.duration_ms, stall.callback, stall.room, stall.agent, stall.turn,
+            "".join(stall.stack) or "  (finished before the watchdog sampled its stack)",
+            extra={"category": "loop"},
+        )
+
+    def session_summary(self, room: str) -> dict[str, Any]:
+        with self._lock:
+            stalls = self.rooms.get(room, RoomStalls())
+            return {
+                "slow_callbacks": stalls.count,
+                "blocked_ms": round(stalls.total_ms, 1),
+                "max_ms": stalls.max_ms,
+                "worst": stalls.worst,
+                "process_lag_ms": {f"p{round(q * 100)}": round(self.lag.percentile(q), 1) for q in _QUANTILES},
+            }
+
+    def to_prometheus(self) -> str:
+        lines = [
+            "# HELP event_loop_lag_ms How late the loop woke a sleeping task, in milliseconds.",
+            "# TYPE event_loop_lag_ms summary",
+        ]
+        with self._lock:
+            for q in _QUANTILES:
+                lines.append(f'event_loop_lag_ms{{quantile="{q}"}} {self.lag.percentile(q):.1f}')
+            lines.append(f"event_loop_lag_ms_sum {self.lag.total:.1f}")
+            lines.append(f"event_loop_lag_ms_count {self.lag.count}")
+            lines += [
+                "# HELP event_loop_slow_callbacks_total Callbacks that blocked the loop past the threshold.",
+                "# TYPE event_loop_slow_callbacks_total counter",
+            ]
+            for agent, stalls in sorted(self.agents.items()):
+                lines.append(f'event_loop_slow_callbacks_total{{agent="{agent}"}} {stalls.count}')
+            lines += [
+                "# HELP event_loop_blocked_ms_total Time the loop spent in slow callbacks, in milliseconds.",
+                "# TYPE event_loop_blocked_ms_total counter",
+            ]
+            for agent, stalls in sorted(self.agents.items()):
+                lines.append(f'event_loop_blocked_ms_total{{agent="{agent}"}} {stalls.total_ms:.1f}')
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str) -> None:
+        """Atomically replace `path` — blocking, call it through asyncio.to_thread."""
+        write_atomic(path, self.to_prometheus())
@@ -0,0 +1,174 @@
+"""
+Menu catalog with a fuzzy + phonetic search index.
+
+STT mangles dish names ("pepperony pizza", "seezer salad", "penny arabiata"),
+and the menu is too large to paste into every prompt. MenuCatalog is built once
+per process and resolves what the user said to menu items in one call:
+- inverted index over the words of dish names and categories (exact hits)
+- phonetic keys of the same words (sounds-alike hits)
+- character trigrams of the whole dish name (misspellings, split/joined words)
+
+Usage:
+    menu = MenuCatalog()
+    matches = menu.search("tiramisoo", k=3)
+    matches[0].item.name   # → "Tiramisu"
+"""
+
+import heapq
+import re
+from collections import defaultdict
+from dataclasses import dataclass
+
+from src.variables import MENU_ITEMS
+
+MIN_MATCH_SCORE = 0.3
+
+# Weights of the three signals — exact words dominate, trigrams break ties
+_TOKEN_WEIGHT = 0.6
+_TRIGRAM_WEIGHT = 0.4
+_PHONETIC_HIT = 0.8      # a sounds-alike word counts as 80% of an exact word
+_CATEGORY_HIT = 0.7      # matching the category counts less than the dish name
+
+_STOPWORDS = {
+    "a", "an", "the", "some", "please", "and", "with", "of", "i", "want", "like",
+    "id", "i'd", "would", "get", "me", "can", "have", "order", "add", "one",
+}
+_PHONETIC_RULES = (
+    ("ae", "e"), ("ph", "f"), ("ck", "k"), ("gh", "g"), ("sch", "sk"),
+    ("ch", "x"), ("sh", "x"), ("th", "t"), ("qu", "k"), ("wr", "r"), ("kn", "n"),
+)
+
+
+@dataclass(frozen=True)
+class MenuItem:
+    id:          int
+    name:        str
+    price:       float
+    category:    str
+    description: str = ""
+    emoji:       str = ""
+
+
+@dataclass(frozen=True)
+class MenuMatch:
+    item:  MenuItem
+    score: float   # 0.0 - 1.0
+
+
+def _words(text: str) -> list[str]:
+    words = re.findall(r"[a-z']+", str(text).lower())
+    # Cheap plural folding: "pizzas" → "pizza", "desserts" → "dessert"
+    return [w[:-1] if len(w) > 3 and w.endswith("s") and not w.endswith("ss") else w for w in words]
+
+
+def phonetic_key(word: str) -> str:
+    """Sounds-alike key: first letter, then consonant classes with repeats collapsed."""
+    word = re.sub(r"[^a-z]", "", word.lower())
+    if not word:
+        return ""
+    for old, new in _PHONETIC_RULES:
+        word = word.replace(old, new)
+    out: list[str] = []
+    for i, ch in enumerate(word):
+        nxt = word[i + 1] if i + 1 < len(word) else ""
+        if ch == "c":
+            ch = "s" if nxt in ("e", "i", "y") else "k"
+        elif ch == "q":
+            ch = "k"
+        elif ch == "z":
+            ch = "s"
+        elif ch == "v":
+            ch = "f"
+        elif ch in "aeiouyhw":
+            if i > 0:
+                continue
+            ch = "a"  # every leading vowel sounds alike over the phone
+        if not out or out[-1] != ch:
+            out.append(ch)
+    return "".join(out)
+
+
+def _trigrams(text: str) -> set[str]:
+    # Spaces removed so "rib eye" and "ribeye" share all their trigrams
+    squashed = "".join(_words(text))
+    padded = f"  {squashed} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class MenuCatalog:
+    """Menu items plus the search indexes, built once per process (see prewarm)."""
+
+    def __init__(self, items: list[dict] | None = None) -> None:
+        items = items if items is not None else MENU_ITEMS
+        self.items: dict[int, MenuItem] = {
+            item["id"]: MenuItem(**{k: v for k, v in item.items() if k in MenuItem.__dataclass_fields__})
+            for item in items
+        }
+        self.categories: list[str] = list(dict.fromkeys(item.category for item in self.items.values()))
+
+        self._tokens: dict[str, dict[int, float]] = defaultdict(dict)
+        self._phonetic: dict[str, dict[int, float]] = defaultdict(dict)
+        self._trigram_index: dict[str, set[int]] = defaultdict(set)
+        self._trigram_counts: dict[int, int] = {}
+        self._name_keys: dict[str, set[int]] = defaultdict(set)   # whole-name phonetic key
+
+        for item in self.items.values():
+            for words, weight in ((_words(item.category), _CATEGORY_HIT), (_words(item.name), 1.0)):
+                for word in words:
+                    self._tokens[word][item.id] = max(self._tokens[word].get(item.id, 0.0), weight)
+                    key = phonetic_key(word)
+                    self._phonetic[key][item.id] = max(self._phonetic[key].get(item.id, 0.0), weight)
+            self._name_keys[phonetic_key("".join(_words(item.name)))].add(item.id)
+            grams = _trigrams(item.name)
+            self._trigram_counts[item.id] = len(grams)
+            for gram in grams:
+                self._trigram_index[gram].add(item.id)
+
+    def get(self, item_id: int) -> MenuItem | None:
+        return self.items.get(item_id)
+
+    def search(
+        self,
+        query: str,
+        k: int = 3,
+        category: str | None = None,
+        item_ids: set[int] | None = None,
+    ) -> list[MenuMatch]:
+        """Top `k` items for what the user said, best first.
+
+        `category` and `item_ids` restrict the result (e.g. to what is already in the cart).
+        """
+        words = [w for w in _words(query) if w not in _STOPWORDS]
+        if not words:
+            return []
+
+        # Per query word take the best of exact and phonetic hit, then average over words
+        coverage: dict[int, float] = defaultdict(float)
+        for word in words:
+            hits = dict(self._tokens.get(word, {}))
+            for item_id, weight in self._phonetic.get(phonetic_key(word), {}).items():
+                hits[item_id] = max(hits.get(item_id, 0.0), weight * _PHONETIC_HIT)
+            for item_id, weight in hits.items():
+                coverage[item_id] += weight / len(words)
+        # Word boundaries heard wrong ("terra misu", "rib eye") — compare the whole phrase
+        for item_id in self._name_keys.get(phonetic_key("".join(words)), ()):
+            coverage[item_id] = max(coverage[item_id], _PHONETIC_HIT)
+
+        query_grams = _trigrams(" ".join(words))
+        shared: dict[int, int] = defaultdict(int)
+        for gram in query_grams:
+            for item_id in self._trigram_index.get(gram, ()):
+                shared[item_id] += 1
+
+        scored: list[MenuMatch] = []
+        for item_id in coverage.keys() | shared.keys():
+            if item_ids is not None and item_id not in item_ids:
+                continue
+            item = self.items[item_id]
+            if category and item.category.lower() != category.lower():
+                continue
+            dice = 2 * shared.get(item_id, 0) / (len(query_grams) + self._trigram_counts[item_id])
+            score = _TOKEN_WEIGHT * min(coverage.get(item_id, 0.0), 1.0) + _TRIGRAM_WEIGHT * dice
+            if score >= MIN_MATCH_SCORE:
+                scored.append(MenuMatch(item, round(score, 3)))
+        return heapq.nlargest(k, scored, key=lambda m: (m.score, -m.item.id))
@@ -0,0 +1,144 @@
+"""
+Phone number normalizer for speech-to-text output.
+
+STT rarely hands us a clean "9876543210". It gives "nine eight seven six
+double five...", "+91 98765 43210", "ninety eight seventy six..." or digits
+split by commas and filler words. normalize_phone() turns all of these into a
+10-digit Indian number plus a confidence score, so a slightly odd transcript
+does not bounce back to the user as an error: a number below MIN_CONFIDENCE
+is still kept, and the agent reads it back to the user to confirm.
+
+Usage:
+    from src.phone import normalize_phone
+    result = normalize_phone("plus nine one nine eight seven six double five four three two one")
+    result.digits       # → "9876554321"
+    result.confidence   # → 1.0
+    result.needs_confirmation  # → False
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Optional
+
+NATIONAL_LENGTH = 10
+COUNTRY_CODE = "91"
+MIN_CONFIDENCE = 0.9  # below this the number is kept but read back to the user to confirm
+
+_DIGIT_WORDS = {
+    "zero": "0", "oh": "0", "o": "0", "nought": "0", "nil": "0",
+    "one": "1", "two": "2", "three": "3", "four": "4", "five": "5",
+    "six": "6", "seven": "7", "eight": "8", "nine": "9",
+}
+_TEEN_WORDS = {
+    "ten": "10", "eleven": "11", "twelve": "12", "thirteen": "13", "fourteen": "14",
+    "fifteen": "15", "sixteen": "16", "seventeen": "17", "eighteen": "18", "nineteen": "19",
+}
+_TENS_WORDS = {
+    "twenty": "2", "thirty": "3", "forty": "4", "fourty": "4", "fifty": "5",
+    "sixty": "6", "seventy": "7", "eighty": "8", "ninety": "9",
+}
+# Common STT mishearings of digits — accepted, but lower the confidence
+_HOMOPHONES = {"to": "2", "too": "2", "for": "4", "fore": "4", "ate": "8", "won": "1", "tree": "3", "free": "3"}
+_REPEATS = {"double": 2, "triple": 3}
+_FILLERS = {
+    "my", "number", "phone", "mobile", "is", "it's", "its", "the", "and", "uh", "um",
+    "dash", "hyphen", "space", "plus", "country", "code", "india", "sorry", "i", "mean",
+}
+
+
+@dataclass
+class PhoneResult:
+    digits:       Optional[str]          # 10-digit national number, None if not usable
+    confidence:   float                  # 0.0 - 1.0
+    country_code: Optional[str] = None   # "91" when it was said and stripped
+    issues:       list[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return self.digits is not None
+
+    @property
+    def needs_confirmation(self) -> bool:
+        return self.ok and self.confidence < MIN_CONFIDENCE
+
+    def to_dict(self) -> dict:
+        return {"number": self.digits, "confidence": self.confidence, "issues": self.issues}
+
+
+def _tokens(text: str) -> list[str]:
+    text = str(text).lower().replace("+", " plus ")
+    # Keep digit runs and words; everything else (.,-/()) separates tokens
+    return re.findall(r"\d+|[a-z']+", text)
+
+
+def normalize_phone(text: str) -> PhoneResult:
+    """Spoken or written phone number → PhoneResult."""
+    digits: list[str] = []
+    issues: list[str] = []
+    penalty = 0.0
+    repeat = 1
+    said_plus = "+" in str(text) or bool(re.search(r"\bplus\b", str(text).lower()))
+
+    tokens = _tokens(text)
+    i = 0
+    while i < len(tokens):
+        token = tokens[i]
+        nxt = tokens[i + 1] if i + 1 < len(tokens) else ""
+        chunk = None
+
+        if token.isdigit():
+            chunk = token
+        elif token in _REPEATS:
+            repeat = _REPEATS[token]
+            i += 1
+            continue
+        elif token in _DIGIT_WORDS:
+            chunk = _DIGIT_WORDS[token]
+        elif token in _TEEN_WORDS:
+            chunk = _TEEN_WORDS[token]
+        elif token in _TENS_WORDS:
+            # "ninety eight" → 98, "ninety" → 90
+            if nxt in _DIGIT_WORDS and _DIGIT_WORDS[nxt] != "0":
+                chunk = _TENS_WORDS[token] + _DIGIT_WORDS[nxt]
+                i += 1
+            else:
+                chunk = _TENS_WORDS[token] + "0"
+        elif token == "hundred" and digits:
+            chunk = "00"
+        elif token in _HOMOPHONES and (digits or nxt in _DIGIT_WORDS or nxt.isdigit()):
+            chunk = _HOMOPHONES[token]
+            penalty += 0.15
+            issues.append(f"read '{token}' as {chunk}")
+        elif token in _FILLERS:
+            pass
+        else:
+            if digits:
+                penalty += 0.1
+                issues.append(f"ignored '{token}'")
+
+        if chunk is not None:
+            # "double five" repeats only the next single digit
+            digits.append(chunk[0] * repeat + chunk[1:] if repeat > 1 else chunk)
+            repeat = 1
+        i += 1
+
+    number = "".join(digits)
+    country_code = None
+    if len(number) == NATIONAL_LENGTH + len(COUNTRY_CODE) and number.startswith(COUNTRY_CODE):
+        number, country_code = number[len(COUNTRY_CODE):], COUNTRY_CODE
+    elif len(number) == NATIONAL_LENGTH + 1 and number.startswith("0"):
+        number = number[1:]  # trunk prefix 0
+        issues.append("dropped leading 0")
+    elif said_plus and len(number) > NATIONAL_LENGTH:
+        issues.append("unsupported country code")
+        return PhoneResult(None, 0.0, None, issues)
+
+    if len(number) != NATIONAL_LENGTH:
+        issues.append(f"got {len(number)} digits")
+        return PhoneResult(None, 0.0, country_code, issues)
+
+    if number[0] not in "6789":
+        penalty += 0.2
+        issues.append("does not look like a mobile number")
+
+    return PhoneResult(number, round(max(0.0, 1.0 - penalty), 2), country_code, issues)
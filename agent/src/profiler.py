@@ -0,0 +1,181 @@
+"""
+On-demand sampling profiler for a live job process.
+
+Opt-in with PROFILER_ENABLED=true. Nothing runs until a capture is requested,
+so the idle cost is one signal handler and one idle unix socket. A capture is
+triggered by any of:
+
+- signal:   kill -USR2 <job pid>             (SIGUSR1 is livekit's stack dump)
+- env var:  PROFILE_ON_START_SECONDS=30      (every session start, e.g. in staging)
+- socket:   echo 20 | nc -U logs/profiles/<pid>.sock   (replies with the output paths)
+
+A capture runs for a bounded time on a sampler thread:
+
+- CPU: every PROFILER_INTERVAL_MS, the stacks of all threads are read from
+  sys._current_frames() and counted as collapsed stacks. Event-loop samples
+  are rooted at the room / agent of the callback running at that moment
+  (via LoopMonitor); other threads are rooted at their thread name.
+- allocations: tracemalloc runs for the capture window only; the top
+  allocation sites are written when it ends.
+
+Output, under logs/profiles/:
+    <ts>-<pid>.folded      flamegraph.pl / speedscope / inferno input
+    <ts>-<pid>.alloc.txt   top allocation sites by size
+
+Usage:
+    profiler = Profiler("logs/profiles", loop_monitor=monitor)
+    await profiler.install()              # idempotent, once per process
+    await profiler.capture(20)            # → (folded_path, alloc_path)
+"""
+
+import asyncio
+import os
+import signal
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from collections.abc import Callable
+from typing import Any
+
+from src.log_pipeline import log_context_in
+from src.logger_config import agent_flow
+
+_MAX_SECONDS = 120
+_ALLOC_TOP = 50
+_ALLOC_FRAMES = 8
+
+
+def _frame_label(frame: Any) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def collapse(frame: Any) -> list[str]:
+    """Root-first function labels of a frame's stack."""
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    labels.reverse()
+    return labels
+
+
+class Profiler:
+    """Process-wide; one capture at a time."""
+
+    def __init__(self, directory: str = "logs/profiles", interval_ms: float = 5.0, loop_monitor: Any = None) -> None:
+        self.directory = directory
+        self.interval = interval_ms / 1000
+        self.loop_monitor = loop_monitor
+        self.busy = False
+        self._installed = False
+        self._server: asyncio.AbstractServer | None = None
+
+    # ── Triggers ──────────────────────────────────────────────────────
+
+    async def install(self) -> None:
+        if self._installed:
+            return
+        self._installed = True
+        loop = asyncio.get_running_loop()
+        if hasattr(signal, "SIGUSR2"):
+            loop.add_signal_handler(signal.SIGUSR2, lambda: asyncio.create_task(self.capture(30)))
+        if hasattr(asyncio, "start_unix_server"):
+            os.makedirs(self.directory, exist_ok=True)
+            path = os.path.join(self.directory, f"{os.getpid()}.sock")
+            if os.path.exists(path):
+                os.unlink(path)
+            self._server = await asyncio.start_unix_server(self._handle_control, path)
+        agent_flow.info("🔬 Profiler ready: kill -USR2 %s or echo <seconds> | nc -U %s/%s.sock",
+                        os.getpid(), self.directory, os.getpid())
+
+    async def _handle_control(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            line = (await reader.readline()).decode().strip()
+            seconds = float(line or 10)
+            paths = await self.capture(seconds)
+            writer.write(("\n".join(paths) if paths else "busy").encode() + b"\n")
+            await writer.drain()
+        except ValueError:
+            writer.write(b"usage: <seconds>\n")
+        finally:
+            writer.close()
+
+    # ── Capture ───────────────────────────────────────────────────────
+
+    async def capture(self, seconds: float) -> tuple[str, str] | None:
+        """Profile for `seconds` (capped) without blocking the loop. None if a capture is already running."""
+        if self.busy:
+            return None
+        self.busy = True
+        try:
+            seconds = max(0.1, min(seconds, _MAX_SECONDS))
+            agent_flow.info("🔬 Profiling for %.0f s", seconds)
+            probe = self._loop_tags(threading.get_ident())
+            return await asyncio.to_thread(self._capture, seconds, probe)
+        finally:
+            self.busy = False
+
+    def _loop_tags(self, loop_thread_id: int) -> Callable[[int], str | None]:
+        monitor = self.loop_monitor
+
+        def tags(thread_id: int) -> str | None:
+            if thread_id != loop_thread_id:
+                return None
+            context = monitor.running_context() if monitor is not None else None
+            if context is None:
+                return "event_loop;idle" if monitor is not None else "event_loop"
+            ids = log_context_in(context)
+            return f"event_loop;room={ids.get('room', '-')};agent={ids.get('agent', '-')}"
+
+        return tags
+
+    def _capture(self, seconds: float, loop_tags: Callable[[int], str | None]) -> tuple[str, str]:
+        stacks: Counter[str] = Counter()
+        own_id = threading.get_ident()
+        names = {t.ident: t.name for t in threading.enumerate()}
+        tracing = not tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.start(_ALLOC_FRAMES)
+        try:
+            deadline = time.perf_counter() + seconds
+            while time.perf_counter() < deadline:
+                for thread_id, frame in sys._current_frames().items():
+                    if thread_id == own_id:
+                        continue
+                    root = loop_tags(thread_id)
+                    if root is None:
+                        if thread_id not in names:
+                            names = {t.ident: t.name for t in threading.enumerate()}
+                        root = f"thread={names.get(thread_id, thread_id)}"
+                    stacks[";".join([root, *collapse(frame)])] += 1
+                time.sleep(self.interval)
+            snapshot = tracemalloc.take_snapshot()
+        finally:
+            if tracing:
+                tracemalloc.stop()
+        return self._write(stacks, snapshot)
+
+    def _write(self, stacks: Counter[str], snapshot: tracemalloc.Snapshot) -> tuple[str, str]:
+        os.makedirs(self.directory, exist_ok=True)
+        base = os.path.join(self.directory, f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}")
+        folded_path, alloc_path = f"{base}.folded", f"{base}.alloc.txt"
+        with open(folded_path, "w", encoding="utf-8") as f:
+            for stack, count in stacks.most_common():
+                f.write(f"{stack} {count}\n")
+        with open(alloc_path, "w", encoding="utf-8") as f:
+            snapshot = snapshot.filter_traces([tracemalloc.Filter(False, tracemalloc.__file__)])
+            for stat in snapshot.statistics("traceback")[:_ALLOC_TOP]:
+                f.write(f"{stat.size / 1024:.1f} KiB in {stat.count} blocks\n")
+                f.writelines(f"    {line}\n" for line in stat.traceback.format())
+        agent_flow.info("🔬 Profile written: %s (%d samples), %s", folded_path, sum(stacks.values()), alloc_path)
+        return folded_path, alloc_path
+
+    async def aclose(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            path = os.path.join(self.directory, f"{os.getpid()}.sock")
+            if os.path.exists(path):
+                os.unlink(path)
@@ -0,0 +1,236 @@
+"""
+Session timeline recorder, for reproducing slow sessions offline.
+
+The session report (SESSION_REPORT_DIR) keeps usage and summaries; this
+keeps the timeline: every event that drives or shows a turn — the transcript
+included — with its offset from session start, one compact JSON line each in
+logs/recordings/<room>-<job id>.jsonl.gz:
+
+    {"kind": "header", "room": ..., "start_agent": "greeter", "started_at": <unix s>, "version": 1}
+    {"t": 2150, "kind": "ui_in",   "type": "FORM_UPDATE", "payload": {...}}
+    {"t": 4410, "kind": "user",    "agent": "Greeter", "text": "I want to book a table"}
+    {"t": 4412, "kind": "state",   "agent": "Greeter", "state": "thinking"}
+    {"t": 4730, "kind": "metrics", "agent": "Greeter", "type": "llm", "ttft_ms": 311.0, "duration_ms": 402.5}
+    {"t": 4750, "kind": "tools",   "agent": "Greeter", "calls": [{"name": ..., "arguments": {...}, "output": ..., "is_error": false}]}
+    {"t": 4760, "kind": "ui_out",  "type": "NAVIGATE_PAGE", "payload": {"page": "booking"}}
+    {"t": 5020, "kind": "agent",   "agent": "Reservation", "text": "...", "interrupted": false}
+
+`t` is milliseconds since the recorder was attached. `agent` is the agent
+whose activity emitted the event (from the log context), so a handoff shows
+up as the agent changing between a "tools" line and the next "agent" line.
+
+In production the events are streamed as they happen through a
+GzipJsonlWriter (src/jsonl_stream.py): memory stays flat however long the
+session runs, and the shutdown callback only writes the footer. Without a
+stream (replays, tests) they are kept in .events and written by save().
+Either way the count is capped; the overflow is counted in the footer.
+src.session_replay drives a recording back through the offline harness;
+turn_latencies() compares the two.
+
+Usage:
+    recorder = SessionRecorder(ctx.room.name, stream=GzipJsonlWriter(f"logs/recordings/{ctx.room.name}-{ctx.job.id}.jsonl.gz"))
+    recorder.attach(session, ctx.room)          # before session.start
+    ctx.add_shutdown_callback(recorder.aclose)
+"""
+
+import asyncio
+import contextlib
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+from livekit import rtc
+from livekit.agents.metrics import EOUMetrics, LLMMetrics, TTSMetrics
+
+from src.jsonl_stream import GzipJsonlWriter, read_jsonl
+from src.log_pipeline import log_context
+
+FORMAT_VERSION = 1
+_MAX_EVENTS = 20000
+
+# One recorder per room, so send_to_ui (which only has the JobContext) can record outbound messages
+_RECORDERS: dict[str, "SessionRecorder"] = {}
+
+
+def recorder_for(room: str | None) -> "SessionRecorder | None":
+    return _RECORDERS.get(room) if room else None
+
+
+class SessionRecorder:
+    def __init__(
+        self,
+        room: str,
+        start_agent: str = "greeter",
+        max_events: int = _MAX_EVENTS,
+        stream: GzipJsonlWriter | None = None,
+    ) -> None:
+        self.room = room
+        self.start_agent = start_agent
+        self.max_events = max_events
+        self.stream = stream
+        self.events: list[dict[str, Any]] = []   # only without a stream
+        self.count = 0
+        self.dropped = 0
+        self._started = time.perf_counter()
+        self._started_at = time.time()
+        self._session: Any = None
+
+    def attach(self, session: Any, room: Any) -> None:
+        """Subscribe to the session's and room's events; call before session.start."""
+        self._session = session
+        self._started = time.perf_counter()
+        self._started_at = time.time()
+        _RECORDERS[self.room] = self
+        if self.stream is not None:
+            self.stream.write(self.header())
+        room.on("data_received", self._on_data_received)
+        session.on("conversation_item_added", self._on_conversation_item_added)
+        session.on("function_tools_executed", self._on_function_tools_executed)
+        session.on("agent_state_changed", self._on_agent_state_changed)
+        session.on("metrics_collected", self._on_metrics_collected)
+
+    def close(self) -> None:
+        if _RECORDERS.get(self.room) is self:
+            del _RECORDERS[self.room]
+
+    def _agent(self) -> str | None:
+        agent = log_context().get("agent")
+        if agent is None and self._session is not None:
+            with contextlib.suppress(RuntimeError):   # not started yet
+                agent = type(self._session.current_agent).__name__
+        return agent
+
+    def record(self, kind: str, **fields: Any) -> None:
+        if self.count >= self.max_events:
+            self.dropped += 1
+            return
+        self.count += 1
+        event = {"t": round((time.perf_counter() - self._started) * 1000), "kind": kind, **fields}
+        if self.stream is not None:
+            self.stream.write(event)
+        else:
+            self.events.append(event)
+
+    # ── event handlers ──────────────────────────────────────────────────
+
+    def record_ui_out(self, msg_type: str, payload: dict) -> None:
+        self.record("ui_out", type=msg_type, payload=payload)
+
+    def _on_data_received(self, packet: rtc.DataPacket) -> None:
+        if packet.topic != "ui-to-agent":
+            return
+        try:
+            msg = json.loads(packet.data.decode())
+        except ValueError:
+            return   # the agents log the bad packet
+        self.record("ui_in", type=msg.get("type"), payload=msg.get("payload", {}))
+
+    def _on_conversation_item_added(self, ev: Any) -> None:
+        item = ev.item
+        if getattr(item, "type", None) != "message" or item.role not in ("user", "assistant"):
+            return
+        if item.role == "user":
+            self.record("user", agent=self._agent(), text=item.text_content or "")
+        else:
+            self.record("agent", agent=self._agent(), text=item.text_content or "", interrupted=item.interrupted)
+
+    def _on_function_tools_executed(self, ev: Any) -> None:
+        calls = []
+        for call, output in ev.zipped():
+            try:
+                arguments = json.loads(call.arguments or "{}")
+            except ValueError:
+                arguments = call.arguments
+            calls.append({
+                "name": call.name,
+                "arguments": arguments,
+                "output": output.output if output is not None else None,
+                "is_error": output.is_error if output is not None else False,
+            })
+        self.record("tools", agent=self._agent(), calls=calls)
+
+    def _on_agent_state_changed(self, ev: Any) -> None:
+        self.record("state", agent=self._agent(), state=ev.new_state)
+
+    def _on_metrics_collected(self, ev: Any) -> None:
+        m = ev.metrics
+        if isinstance(m, LLMMetrics):
+            self.record("metrics", agent=self._agent(), type="llm", ttft_ms=round(m.ttft * 1000, 1), duration_ms=round(m.duration * 1000, 1))
+        elif isinstance(m, TTSMetrics):
+            self.record("metrics", agent=self._agent(), type="tts", ttfb_ms=round(m.ttfb * 1000, 1))
+        elif isinstance(m, EOUMetrics):
+            self.record("metrics", agent=self._agent(), type="eou", end_of_utterance_delay_ms=round(m.end_of_utterance_delay * 1000, 1))
+
+    # ── output ──────────────────────────────────────────────────────────
+
+    def header(self) -> dict[str, Any]:
+        return {"kind": "header", "room": self.room, "start_agent": self.start_agent, "started_at": self._started_at, "version": FORMAT_VERSION}
+
+    def footer(self) -> dict[str, Any]:
+        return {"kind": "footer", "events": self.count, "dropped": self.dropped}
+
+    def write(self, path: str) -> None:
+        """Write header, kept events and footer to `path` — blocking, call it through asyncio.to_thread."""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        lines = [self.header(), *self.events, self.footer()]
+        with open(path, "w", encoding="utf-8") as f:
+            for line in lines:
+                f.write(json.dumps(line, separators=(",", ":"), ensure_ascii=False, default=str) + "\n")
+
+    async def save(self, directory: str) -> str:
+        self.close()
+        path = os.path.join(directory, f"{self.room}.jsonl")
+        await asyncio.to_thread(self.write, path)
+        return path
+
+    async def aclose(self) -> None:
+        """Stop recording; with a stream, write the footer and close the file."""
+        self.close()
+        if self.stream is not None:
+            await self.stream.aclose(self.footer())
+
+
+# ── Reading ─────────────────────────────────────────────────────────────
+
+
+@dataclass
+class Recording:
+    header: dict[str, Any]
+    events: list[dict[str, Any]] = field(default_factory=list)
+
+    def of(self, *kinds: str) -> list[dict[str, Any]]:
+        return [e for e in self.events if e["kind"] in kinds]
+
+
+def load_recording(path: str) -> Recording:
+    """Read a .jsonl or streamed .jsonl.gz recording; one cut short by a crash has no footer but still loads."""
+    header: dict[str, Any] = {}
+    events = []
+    for event in read_jsonl(path):
+        if event["kind"] == "header":
+            header = event
+        elif event["kind"] != "footer":
+            events.append(event)
+    if header.get("version", FORMAT_VERSION) > FORMAT_VERSION:
+        raise ValueError(f"{path}: recording format v{header['version']} is newer than this reader (v{FORMAT_VERSION})")
+    return Recording(header, events)
+
+
+def turn_latencies(events: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Per user turn: ms from the user message to the agent starting to speak, and to its reply text."""
+    turns = []
+    for i, event in enumerate(events):
+        if event["kind"] != "user":
+            continue
+        speaking = reply = None
+        for later in events[i + 1:]:
+            if later["kind"] == "user":
+                break
+            if speaking is None and later["kind"] == "state" and later["state"] == "speaking":
+                speaking = later["t"] - event["t"]
+            if reply is None and later["kind"] == "agent":
+                reply = later["t"] - event["t"]
+        turns.append({"text": event["text"], "speaking_ms": speaking, "reply_ms": reply})
+    return turns
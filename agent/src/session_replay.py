@@ -0,0 +1,132 @@
+"""
+Replays a recorded session (src.session_recorder) offline, through the
+harness — the real agents, tools and data-channel bridge of the current code,
+with the recorded model outputs standing in for the LLM.
+
+- RecordedLLM   answers each agent's LLM calls with that agent's recorded
+                outputs in order (tool calls, then reply text), never ahead
+                of the user turn being replayed; optionally with the recorded
+                time to first token, to reproduce a slow provider
+- replay()      sends the recorded user turns (typed) and ui-to-agent
+                messages at their recorded offsets (scaled by `speed`,
+                0 = back to back), and records the replayed session with a
+                SessionRecorder of its own
+
+Comparing turn_latencies() of a recording and of its replay — or of replays
+on two code versions — separates time spent in our code from provider time.
+Replies spoken with session.say (no LLM call) are not told apart from LLM
+replies in a recording; they are served to the same agent's next LLM call.
+
+Usage:
+    recording = load_recording("logs/recordings/room-abc.jsonl")
+    replayed = await replay(recording, speed=0, recorded_latency=True)
+    turn_latencies(replayed.events)
+"""
+
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass
+
+from src.agents.base import BaseAgent
+from src.harness import FakeRoom, LLMRequest, Reply, ScriptedLLM, SessionHarness
+from src.log_pipeline import log_context
+from src.session_recorder import Recording, SessionRecorder
+
+_SETTLE_SECONDS = 0.2
+
+
+@dataclass
+class RecordedOutput:
+    agent:   str | None
+    turn:    int           # user turns before it was generated; 0 = before the first one
+    reply:   Reply
+    ttft:    float = 0.0   # seconds
+    used:    bool = False
+
+
+def recorded_outputs(recording: Recording) -> list[RecordedOutput]:
+    outputs: list[RecordedOutput] = []
+    pending_ttft: dict[str | None, deque[float]] = {}
+    # An output belongs to the turn in which its agent started thinking: a greeting
+    # committed just after the user spoke was still generated before that turn
+    thinking_turn: dict[str | None, int] = {}
+    turn = 0
+    for event in recording.events:
+        kind, agent = event["kind"], event.get("agent")
+        if kind == "user":
+            turn += 1
+        elif kind == "state" and event["state"] == "thinking":
+            thinking_turn[agent] = turn
+        elif kind == "metrics" and event.get("type") == "llm":
+            pending_ttft.setdefault(agent, deque()).append(event["ttft_ms"] / 1000)
+        elif kind in ("tools", "agent"):
+            if kind == "tools":
+                reply = Reply(tool_calls=[(c["name"], c["arguments"]) for c in event["calls"]])
+            else:
+                reply = Reply(event["text"])
+            ttfts = pending_ttft.get(agent)
+            outputs.append(RecordedOutput(agent, thinking_turn.get(agent, turn), reply, ttfts.popleft() if ttfts else 0.0))
+    return outputs
+
+
+class RecordedLLM(ScriptedLLM):
+    """Serves each agent its recorded outputs in order; "" once they run out."""
+
+    def __init__(self, recording: Recording, recorded_latency: bool = False) -> None:
+        super().__init__(default=Reply(""), ttft=self._next_ttft)
+        self.outputs = recorded_outputs(recording)
+        self.recorded_latency = recorded_latency
+        self.turn = 0   # advanced by replay() as it sends each user turn
+        self._ttfts: deque[float] = deque()
+
+    def _next_ttft(self) -> float:
+        return self._ttfts.popleft() if self._ttfts else 0.0
+
+    def answer(self, request: LLMRequest) -> Reply:
+        agent = log_context().get("agent")
+        output = next((o for o in self.outputs if not o.used and o.agent == agent and o.turn <= self.turn), None)
+        if output is None:
+            self._ttfts.append(0.0)
+            return self.default
+        output.used = True
+        self._ttfts.append(output.ttft if self.recorded_latency else 0.0)
+        return output.reply
+
+
+async def replay(
+    recording: Recording,
+    *,
+    speed: float = 1.0,
+    recorded_latency: bool = False,
+    debounce_seconds: float = BaseAgent.UI_DEBOUNCE_SECONDS,
+    turn_timeout: float = 30.0,
+) -> SessionRecorder:
+    """Drive `recording` through a fresh offline session; returns that session's recorder."""
+    llm_ = RecordedLLM(recording, recorded_latency)
+    room = FakeRoom(recording.header.get("room") or "replay")
+    harness = SessionHarness(
+        llm_,
+        room=room,
+        start_agent=recording.header.get("start_agent", "greeter"),
+        debounce_seconds=debounce_seconds,
+    )
+    recorder = SessionRecorder(room.name, start_agent=harness.start_agent)
+    recorder.attach(harness.session, room)
+    try:
+        async with harness:
+            started = time.perf_counter()
+            for event in recording.of("user", "ui_in"):
+                if speed > 0:
+                    await asyncio.sleep(max(0.0, started + event["t"] / 1000 / speed - time.perf_counter()))
+                if event["kind"] == "user":
+                    llm_.turn += 1
+                    await asyncio.wait_for(harness.say(event["text"]), turn_timeout)
+                else:
+                    room.send_ui(event["type"], event["payload"])
+            # let debounced UI replies and handoff greetings finish
+            await asyncio.sleep(debounce_seconds + _SETTLE_SECONDS)
+            await harness.wait_for(lambda: harness.session.agent_state == "listening", timeout=turn_timeout)
+    finally:
+        recorder.close()
+    return recorder
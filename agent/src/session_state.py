@@ -0,0 +1,125 @@
+"""
+Concurrency helpers that make tools safe to run as parallel tool calls.
+
+With parallel tool calls the LLM can fire save_booking_fields, hold_table and
+add_to_cart in one response, and livekit runs them as concurrent tasks. Two
+things must not interleave:
+- read-modify-write of UserData across an `await` (e.g. a table hold that
+  releases the previous hold in a worker thread) — guarded by StateLock
+- FORM_PREFILL messages — each tool used to send its own, so the UI could
+  receive them out of order. PrefillBatcher merges them per form and sends
+  once the tool batch is done
+
+Usage:
+    class Reservation(BaseAgent):
+        @function_tool
+        @serialized
+        async def find_table(self, ...): ...
+
+    userdata.queue_form_prefill(BOOKING_FORM_ID, {"table_id": 7})
+"""
+
+import asyncio
+import functools
+from typing import Any
+
+from src.fn import send_to_ui
+from src.logger_config import agent_flow
+
+# Prefills queued within this window are merged into one message, unless the
+# tool batch finishes first (BaseAgent flushes on "function_tools_executed")
+PREFILL_COALESCE_SECONDS = 0.05
+
+
+class StateLock:
+    """Re-entrant asyncio lock — a serialized tool may call serialized helpers."""
+
+    def __init__(self) -> None:
+        self._lock = asyncio.Lock()
+        self._owner: asyncio.Task | None = None
+        self._depth = 0
+
+    async def __aenter__(self) -> "StateLock":
+        task = asyncio.current_task()
+        if self._owner is not task:
+            await self._lock.acquire()
+            self._owner = task
+        self._depth += 1
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        self._depth -= 1
+        if self._depth == 0:
+            self._owner = None
+            self._lock.release()
+
+    def locked(self) -> bool:
+        return self._lock.locked()
+
+
+def serialized(method):
+    """Run an agent method under the session's StateLock.
+
+    Goes below @function_tool; functools.wraps keeps the signature the tool schema is built from.
+    """
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        async with self.session.userdata.state_lock:
+            return await method(self, *args, **kwargs)
+    return wrapper
+
+
+class PrefillBatcher:
+    """Merges FORM_PREFILL values per form and sends one message per form."""
+
+    def __init__(self, delay: float = PREFILL_COALESCE_SECONDS) -> None:
+        self.delay = delay
+        self._pending: dict[str, dict[str, Any]] = {}
+        self._job_ctx: Any = None
+        self._flush_task: asyncio.Task | None = None
+        self._sending: asyncio.Task | None = None   # task inside flush(), values already swapped out
+        self.queued = 0   # prefills requested by tools
+        self.sent = 0     # FORM_PREFILL messages actually sent
+
+    def queue(self, job_ctx: Any, form_id: str, values: dict[str, Any]) -> None:
+        self._job_ctx = job_ctx
+        # Later values win — tools queue under StateLock, so the last one is the newest state
+        self._pending.setdefault(form_id, {}).update(values)
+        self.queued += 1
+
+        self._cancel_debounce()
+        try:
+            self._flush_task = asyncio.get_running_loop().create_task(self._flush_later())
+        except RuntimeError:
+            agent_flow.warning("⚠️ No running event loop for FORM_PREFILL flush")
+
+    def _cancel_debounce(self) -> None:
+        """Cancel the scheduled flush only while it is still sleeping — never mid-send."""
+        task = self._flush_task
+        if task and not task.done() and task is not self._sending and task is not asyncio.current_task():
+            task.cancel()
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.delay)
+        await self.flush()
+
+    async def flush(self) -> None:
+        """Send everything queued so far — one FORM_PREFILL per form."""
+        current = asyncio.current_task()
+        self._cancel_debounce()
+        if self._sending and not self._sending.done() and self._sending is not current:
+            # Older values are in flight — let them land first so the UI ends on the newest
+            await asyncio.shield(self._sending)
+        pending, self._pending = self._pending, {}
+        if self._job_ctx is None:
+            return
+        self._sending = current
+        try:
+            for form_id, values in pending.items():
+                self.sent += 1
+                await send_to_ui(self._job_ctx, "FORM_PREFILL", {"formId": form_id, "values": values})
+        finally:
+            if self._sending is current:
+                self._sending = None
+        if pending and self.queued > self.sent:
+            agent_flow.info(f"🧩 FORM_PREFILL batching: {self.queued} updates sent as {self.sent} message(s) so far")
@@ -0,0 +1,201 @@
+"""
+Per-speech accounting of the work paid for each agent reply.
+
+Every reply livekit plays is a SpeechHandle. For each one the ledger keeps:
+- the LLM text generated and the characters sent to TTS — counted by
+  BaseAgent's llm_node / tts_node, which run inside the handle's task
+- LLM tokens and TTS audio seconds from the session's metrics_collected
+  events (livekit tags LLM/TTS metrics with the speech_id)
+- whether the reply was interrupted, and why: a UI update, an agent switch,
+  or the user barging in (any interrupt nobody claimed)
+
+When the handle is done, its work is split into delivered and discarded by
+the share of the generated text the user actually heard (the transcript of
+an interrupted reply is cut where playback stopped), and added to per-agent
+totals. SpeechLedger.summary() is logged per agent in on_exit and for the
+whole session at shutdown.
+
+Usage:
+    ledger = userdata.speech_ledger
+    session.on("speech_created", ledger.on_speech_created)
+    session.on("metrics_collected", ledger.on_metrics_collected)
+    ledger.claim_interrupt(UI_UPDATE)      # before session.interrupt(force=True)
+    ledger.summary("Reservation")
+"""
+
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+from livekit.agents.metrics import LLMMetrics, TTSMetrics
+
+# livekit-agents has no public way to ask which reply the current task runs for; its private
+# context var is the only source. Everything (log records, tracing, the LLM recorder, the loop
+# monitor) goes through active_speech_id() below, so a livekit release that moves it only
+# costs the turn ids.
+try:
+    from livekit.agents.voice.agent_activity import _SpeechHandleContextVar as SPEECH_HANDLE_VAR
+except ImportError:
+    SPEECH_HANDLE_VAR = None
+
+# Interrupt causes
+UI_UPDATE = "ui_update"
+AGENT_SWITCH = "agent_switch"
+BARGE_IN = "barge_in"
+
+# Only in-flight and recent replies are looked up — older records are dropped
+_MAX_RECORDS = 64
+_CHARS_PER_TOKEN = 4  # same rough estimate as the tool-schema token counts
+
+
+@dataclass
+class SpeechRecord:
+    speech_id:         str
+    agent:             str
+    llm_text:          str = ""     # LLM output generated for this reply so far
+    tts_chars:         int = 0      # characters sent to TTS so far
+    prompt_tokens:     int = 0      # from LLMMetrics
+    completion_tokens: int = 0      # from LLMMetrics; 0 when the stream was cancelled early
+    audio_seconds:     float = 0.0  # from TTSMetrics
+    cause:             str | None = None   # why it was interrupted, when claimed
+    delivered_ratio:   float | None = None  # set when the handle is done
+
+    @property
+    def llm_tokens(self) -> int:
+        """Estimated completion tokens — cancelled LLM streams report no usage."""
+        return -(-len(self.llm_text) // _CHARS_PER_TOKEN)
+
+    @property
+    def settled(self) -> bool:
+        return self.delivered_ratio is not None
+
+
+@dataclass
+class WorkTotals:
+    speeches:      int = 0
+    llm_tokens:    int = 0
+    tts_chars:     int = 0
+    audio_seconds: float = 0.0
+
+    def add(self, llm_tokens: float, tts_chars: float, audio_seconds: float) -> None:
+        self.llm_tokens += round(llm_tokens)
+        self.tts_chars += round(tts_chars)
+        self.audio_seconds = round(self.audio_seconds + audio_seconds, 3)
+
+
+@dataclass
+class AgentWork:
+    delivered: WorkTotals = field(default_factory=WorkTotals)
+    discarded: dict[str, WorkTotals] = field(default_factory=dict)   # cause → totals
+
+    def summary(self) -> dict[str, Any]:
+        discarded_tokens = sum(t.llm_tokens for t in self.discarded.values())
+        total_tokens = self.delivered.llm_tokens + discarded_tokens
+        return {
+            "delivered": asdict(self.delivered),
+            "discarded": {cause: asdict(t) for cause, t in self.discarded.items()},
+            "discarded_token_share": round(discarded_tokens / total_tokens, 3) if total_tokens else 0.0,
+        }
+
+
+def active_speech_id() -> str | None:
+    """Id of the SpeechHandle whose task we are running in, if any."""
+    if SPEECH_HANDLE_VAR is None:
+        return None
+    handle = SPEECH_HANDLE_VAR.get(None)
+    return getattr(handle, "id", None)
+
+
+def _delivered_text(handle: Any) -> str:
+    return "".join(
+        item.text_content or ""
+        for item in handle.chat_items
+        if item.type == "message" and item.role == "assistant"
+    )
+
+
+class SpeechLedger:
+    """Bounded map speech_id → SpeechRecord plus delivered / discarded totals per agent."""
+
+    def __init__(self, max_records: int = _MAX_RECORDS) -> None:
+        self.max_records = max_records
+        self._records: OrderedDict[str, SpeechRecord] = OrderedDict()
+        self.agents: dict[str, AgentWork] = {}
+        self.current_agent: str = "unknown"   # owner of speeches created outside an llm_node
+
+    def track(self, speech_id: str, agent: str | None = None) -> SpeechRecord:
+        record = self._records.get(speech_id)
+        if record is None:
+            record = self._records[speech_id] = SpeechRecord(speech_id, agent or self.current_agent)
+            while len(self._records) > self.max_records:
+                self._records.popitem(last=False)
+        return record
+
+    def get(self, speech_id: str | None) -> SpeechRecord | None:
+        return self._records.get(speech_id) if speech_id else None
+
+    def claim_interrupt(self, cause: str) -> None:
+        """Attribute the interrupt that is about to happen to `cause` — every unsettled reply is cut by it."""
+        for record in self._records.values():
+            if not record.settled and record.cause is None:
+                record.cause = cause
+
+    # ── Session event handlers ───────────────────────────────────────
+
+    def on_speech_created(self, ev: Any) -> None:
+        handle = ev.speech_handle
+        self.track(handle.id)
+        handle.add_done_callback(self.settle)
+
+    def on_metrics_collected(self, ev: Any) -> None:
+        metrics = ev.metrics
+        record = self.get(getattr(metrics, "speech_id", None))
+        if record is None:
+            return
+        if isinstance(metrics, LLMMetrics):
+            # A reply settled without usage was booked with completion tokens estimated from its text
+            estimated = record.llm_tokens if record.settled and not record.completion_tokens else 0
+            record.prompt_tokens += metrics.prompt_tokens
+            record.completion_tokens += metrics.completion_tokens
+            tokens, chars, audio = metrics.prompt_tokens + max(metrics.completion_tokens - estimated, 0), 0, 0.0
+        elif isinstance(metrics, TTSMetrics):
+            record.audio_seconds += metrics.audio_duration
+            tokens, chars, audio = 0, 0, metrics.audio_duration
+        else:
+            return
+        if record.settled:
+            # Metrics of a stream closed by the interrupt can land after the handle is done
+            self._book(record, tokens, chars, audio, count=False)
+
+    def settle(self, handle: Any) -> None:
+        record = self.track(handle.id)
+        if record.settled:
+            return
+        if not handle.interrupted:
+            record.delivered_ratio = 1.0
+        else:
+            generated = len(record.llm_text)
+            record.delivered_ratio = min(len(_delivered_text(handle)) / generated, 1.0) if generated else 0.0
+            record.cause = record.cause or BARGE_IN
+
+        tokens = record.prompt_tokens + (record.completion_tokens or record.llm_tokens)
+        self._book(record, tokens, record.tts_chars, record.audio_seconds, count=True)
+
+    def _book(self, record: SpeechRecord, tokens: float, chars: float, audio: float, count: bool) -> None:
+        work = self.agents.setdefault(record.agent, AgentWork())
+        ratio = record.delivered_ratio
+        if ratio > 0:
+            work.delivered.add(tokens * ratio, chars * ratio, audio * ratio)
+        if ratio < 1:
+            discarded = work.discarded.setdefault(record.cause or BARGE_IN, WorkTotals())
+            discarded.add(tokens * (1 - ratio), chars * (1 - ratio), audio * (1 - ratio))
+            if count:
+                discarded.speeches += 1
+        elif count:
+            work.delivered.speeches += 1
+
+    def summary(self, agent: str | None = None) -> dict[str, Any]:
+        """Delivered / discarded work for one agent, or for every agent in the session."""
+        if agent is not None:
+            return self.agents.get(agent, AgentWork()).summary()
+        return {name: work.summary() for name, work in self.agents.items()}
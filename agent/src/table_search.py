@@ -0,0 +1,234 @@
+"""
+Best-fit table assignment and nearest free slot search.
+
+Built on top of TableAvailability:
+- Every single table and every run of adjacent tables in the same row is a
+  candidate "group". Per party size the groups are pre-sorted by preference
+  (fewest tables, then fewest empty seats), so best-fit is a first-match scan.
+- Per day, the free tables of every slot on the grid are kept as a bitmask.
+  Grids are built on first use and patched per table when the availability
+  engine reloads that table, instead of being rebuilt.
+
+Usage:
+    search = TableSearch(availability)
+    group = search.best_fit("2026-10-20", "20:00", party_size=10)
+    alternatives = search.nearest_slots("2026-10-20", "20:00", party_size=10, k=3)
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from src.availability import TableAvailability, from_minute, to_minute
+from src.datetime_resolver import restaurant_now
+from src.variables import (
+    MAX_RESERVATION_GUESTS,
+    RESERVATION_SLOT_STEP_MINUTES,
+    RESTAURANT_TABLES,
+    VALID_RESTAURANTS_TIME_RANGE,
+)
+
+_MAX_CACHED_DAYS = 14
+
+
+@dataclass(frozen=True)
+class TableGroup:
+    table_ids: tuple[int, ...]
+    seats:     int
+    mask:      int   # one bit per table, see TableSearch._bits
+
+    @property
+    def table_id(self) -> int:
+        """Table saved in the booking form — the first table of a joined group."""
+        return self.table_ids[0]
+
+
+@dataclass(frozen=True)
+class SlotSuggestion:
+    reservation_date: str
+    reservation_time: str
+    group:            TableGroup
+
+
+@dataclass
+class _DayGrid:
+    starts: list[int]                                    # absolute minute of each slot start
+    free:   list[int]                                    # bitmask of free tables per slot
+    epochs: dict[int, int] = field(default_factory=dict)     # table → change epoch last applied
+    expiry: dict[int, float] = field(default_factory=dict)   # table → earliest hold expiry seen
+
+
+def _clock_minutes(value: str) -> int:
+    hour, minute = map(int, value.split(":"))
+    return hour * 60 + minute
+
+
+class TableSearch:
+    """Answers "which table?" and "what else is free?" in one call."""
+
+    def __init__(
+        self,
+        availability: TableAvailability,
+        tables: list[dict] | None = None,
+        max_guests: int = MAX_RESERVATION_GUESTS,
+        step_minutes: int = RESERVATION_SLOT_STEP_MINUTES,
+    ) -> None:
+        self.availability = availability
+        self.max_guests = max_guests
+        self.step_minutes = step_minutes
+
+        tables = tables if tables is not None else RESTAURANT_TABLES
+        self._bits: dict[int, int] = {t["id"]: 1 << i for i, t in enumerate(tables)}
+        self.groups: list[TableGroup] = self._build_groups(tables)
+        self._by_party: dict[int, list[TableGroup]] = {}
+
+        opening = _clock_minutes(VALID_RESTAURANTS_TIME_RANGE["opening_time"])
+        closing = _clock_minutes(VALID_RESTAURANTS_TIME_RANGE["closing_time"])
+        last_seating = closing - availability.slot_minutes
+        self._day_offsets = list(range(opening, last_seating + 1, step_minutes))
+
+        self._lock = threading.Lock()
+        self._days: OrderedDict[str, _DayGrid] = OrderedDict()
+        # Bumped by the availability listener (engine lock held) — grids compare against it
+        self._epochs: dict[int, int] = dict.fromkeys(self._bits, 0)
+        availability.add_listener(self._mark_dirty)
+
+    # ── Candidate groups ─────────────────────────────────────────────
+
+    def _build_groups(self, tables: list[dict]) -> list[TableGroup]:
+        rows: dict[str, list[dict]] = {}
+        for table in sorted(tables, key=lambda t: t["id"]):
+            rows.setdefault(table.get("row", str(table["id"])), []).append(table)
+
+        groups: list[TableGroup] = []
+        for row in rows.values():
+            for i in range(len(row)):
+                seats, mask, ids = 0, 0, []
+                for table in row[i:]:
+                    # Only consecutive ids stand side by side
+                    if ids and table["id"] != ids[-1] + 1:
+                        break
+                    ids.append(table["id"])
+                    seats += table["seats"]
+                    mask |= self._bits[table["id"]]
+                    groups.append(TableGroup(tuple(ids), seats, mask))
+                    if seats >= self.max_guests:
+                        break
+        return groups
+
+    def candidates(self, party_size: int) -> list[TableGroup]:
+        """Groups that seat `party_size`, best first: fewest tables, fewest empty seats, lowest id."""
+        ranked = self._by_party.get(party_size)
+        if ranked is None:
+            ranked = sorted(
+                (g for g in self.groups if g.seats >= party_size),
+                key=lambda g: (len(g.table_ids), g.seats - party_size, g.table_ids[0]),
+            )
+            self._by_party[party_size] = ranked
+        return ranked
+
+    def group_for(self, table_ids: list[int]) -> TableGroup | None:
+        """The group made of exactly these tables, or None if they are not adjacent."""
+        wanted = tuple(sorted(table_ids))
+        return next((g for g in self.groups if g.table_ids == wanted), None)
+
+    # ── Queries ──────────────────────────────────────────────────────
+
+    def free_mask(self, start: int) -> int:
+        end = start + self.availability.slot_minutes
+        mask = 0
+        for table_id, bit in self._bits.items():
+            if self.availability.is_free(table_id, start, end):
+                mask |= bit
+        return mask
+
+    def best_fit(self, reservation_date: str, reservation_time: str, party_size: int) -> TableGroup | None:
+        """Best free table (or adjacent tables) for the party at exactly this slot."""
+        start = to_minute(reservation_date, reservation_time)
+        return self._first_fit(self.free_mask(start), party_size)
+
+    def nearest_slots(
+        self,
+        reservation_date: str,
+        reservation_time: str,
+        party_size: int,
+        k: int = 3,
+        now: datetime | None = None,
+    ) -> list[SlotSuggestion]:
+        """Up to `k` grid slots on the same day closest to the requested time that fit the party.
+        Slots that have already started (restaurant time) are never suggested."""
+        requested = to_minute(reservation_date, reservation_time)
+        now = now or restaurant_now()
+        not_before = to_minute(now.date().isoformat(), now.strftime("%H:%M"))
+        with self._lock:
+            grid = self._grid(reservation_date)
+            right = bisect_left(grid.starts, requested)
+            left = right - 1
+            found: list[SlotSuggestion] = []
+            while len(found) < k and (left >= 0 or right < len(grid.starts)):
+                # Walk outwards, always taking the closer side first
+                take_left = right >= len(grid.starts) or (
+                    left >= 0 and requested - grid.starts[left] <= grid.starts[right] - requested
+                )
+                i = left if take_left else right
+                if take_left:
+                    left -= 1
+                else:
+                    right += 1
+                if grid.starts[i] <= not_before:
+                    continue
+                group = self._first_fit(grid.free[i], party_size)
+                if group is not None:
+                    found.append(SlotSuggestion(*from_minute(grid.starts[i]), group))
+            return found
+
+    def _first_fit(self, free: int, party_size: int) -> TableGroup | None:
+        for group in self.candidates(party_size):
+            if group.mask & free == group.mask:
+                return group
+        return None
+
+    # ── Per-day grids ────────────────────────────────────────────────
+
+    def _mark_dirty(self, table_id: int) -> None:
+        if table_id in self._epochs:
+            self._epochs[table_id] += 1
+
+    def _grid(self, reservation_date: str) -> _DayGrid:
+        """Grid for the day, patched only for tables that changed since its last use.
+
+        Call with self._lock held.
+        """
+        grid = self._days.get(reservation_date)
+        if grid is None:
+            day_start = to_minute(reservation_date, "00:00")
+            starts = [day_start + m for m in self._day_offsets]
+            grid = _DayGrid(starts=starts, free=[0] * len(starts), epochs=dict.fromkeys(self._bits, -1))
+            self._days[reservation_date] = grid
+            while len(self._days) > _MAX_CACHED_DAYS:
+                self._days.popitem(last=False)
+        self._days.move_to_end(reservation_date)
+
+        now = time.time()
+        for table_id, epoch in list(self._epochs.items()):
+            if grid.epochs.get(table_id) != epoch or grid.expiry.get(table_id, float("inf")) <= now:
+                grid.epochs[table_id] = epoch
+                self._patch_table(grid, table_id)
+        return grid
+
+    def _patch_table(self, grid: _DayGrid, table_id: int) -> None:
+        bit = self._bits[table_id]
+        slot = self.availability.slot_minutes
+        grid.expiry.pop(table_id, None)
+        for i, start in enumerate(grid.starts):
+            busy = self.availability.overlapping(table_id, start, start + slot)
+            if not busy:
+                grid.free[i] |= bit
+                continue
+            grid.free[i] &= ~bit
+            for booking in busy:
+                if booking.expires_at is not None:
+                    grid.expiry[table_id] = min(grid.expiry.get(table_id, float("inf")), booking.expires_at)
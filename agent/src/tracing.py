@@ -0,0 +1,262 @@
+"""
+Per-turn latency tracing across the voice pipeline.
+
+Each agent reply is a turn, keyed by its SpeechHandle id. Livekit tags its
+EOU, LLM and TTS metrics with that id, and tool runs and data-channel
+publishes happen inside the handle's task, so one span tree per turn can be
+stitched together:
+
+    turn speech_ab12 [Reservation]
+      eou_delay               end of user speech → turn committed
+      stt_final               end of user speech → final transcript
+      on_user_turn_completed  our hook (intent fast path, ...)
+      llm_ttft                per LLM call, tagged with provider/model
+      tool                    per tool call (call → output)
+      tts_ttfb                per TTS segment, tagged with provider/model
+      publish                 per send_to_ui data-channel publish
+      response                eou_delay + first llm_ttft + first tts_ttfb
+
+Every span also goes into process-wide rolling histograms (p50/p95/p99 per
+span, agent and provider), exported as a Prometheus text file.
+
+Usage:
+    tracer = TurnTracer(proc.userdata["latency"], room="room-1", agent_name=lambda: "Greeter")
+    session.on("metrics_collected", tracer.on_metrics_collected)
+    session.on("speech_created", tracer.on_speech_created)
+    session.on("function_tools_executed", tracer.on_function_tools_executed)
+    histograms.write_prometheus("logs/latency.prom")
+"""
+
+import math
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from livekit.agents.metrics import EOUMetrics, LLMMetrics, TTSMetrics
+
+from src.logger_config import agent_flow
+from src.speech_ledger import active_speech_id
+
+# Rolling window per histogram — percentiles describe the recent past, not the whole process lifetime
+_WINDOW = 1000
+_QUANTILES = (0.5, 0.95, 0.99)
+_MAX_OPEN_TURNS = 32
+# Metrics can land after the speech is done (e.g. TTS metrics of an interrupted reply)
+_MAX_FINISHED_TURNS = 64
+_METRIC = "voice_turn_span_ms"
+
+# One tracer per room, so send_to_ui (which only has the JobContext) can find its session's tracer
+_TRACERS: dict[str, "TurnTracer"] = {}
+
+
+@dataclass
+class Span:
+    name:        str
+    duration_ms: float
+    attrs:       dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class TurnTrace:
+    turn_id:    str
+    agent:      str
+    user_turn:  bool = False   # started by the user speaking, not by generate_reply / say
+    started_at: float = field(default_factory=time.time)
+    spans:      list[Span] = field(default_factory=list)
+
+    def first(self, name: str) -> float | None:
+        return next((s.duration_ms for s in self.spans if s.name == name), None)
+
+    def response_ms(self) -> float | None:
+        """End of user speech → first audio, when every piece was measured."""
+        parts = [self.first("eou_delay"), self.first("llm_ttft"), self.first("tts_ttfb")]
+        return round(sum(parts), 1) if self.user_turn and None not in parts else None
+
+    def tree(self) -> dict[str, Any]:
+        return {
+            "turn": self.turn_id,
+            "agent": self.agent,
+            "user_turn": self.user_turn,
+            "spans": [{"name": s.name, "ms": s.duration_ms, **s.attrs} for s in self.spans],
+            "response_ms": self.response_ms(),
+        }
+
+
+class RollingHistogram:
+    def __init__(self, window: int = _WINDOW) -> None:
+        self._values: deque[float] = deque(maxlen=window)
+        self.count = 0      # lifetime totals, as Prometheus summaries expect
+        self.total = 0.0
+
+    def observe(self, value: float) -> None:
+        self._values.append(value)
+        self.count += 1
+        self.total += value
+
+    def percentile(self, q: float) -> float:
+        if not self._values:
+            return 0.0
+        ordered = sorted(self._values)
+        return ordered[min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))]
+
+
+class LatencyHistograms:
+    """Process-wide span histograms keyed by (span, agent, provider); shared by every session (see prewarm)."""
+
+    def __init__(self, window: int = _WINDOW) -> None:
+        self.window = window
+        self._histograms: dict[tuple[str, str, str], RollingHistogram] = {}
+        self._lock = threading.Lock()   # the exporter renders in a worker thread
+
+    def observe(self, span: str, agent: str, provider: str, value_ms: float) -> None:
+        key = (span, agent, provider)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = RollingHistogram(self.window)
+            histogram.observe(value_ms)
+
+    def snapshot(self) -> dict[str, dict[str, float]]:
+        with self._lock:
+            return {
+                "/".join(k for k in key if k): {
+                    "count": h.count,
+                    **{f"p{round(q * 100)}": round(h.percentile(q), 1) for q in _QUANTILES},
+                }
+                for key, h in sorted(self._histograms.items())
+            }
+
+    def to_prometheus(self) -> str:
+        lines = [
+            f"# HELP {_METRIC} Voice pipeline latency per turn span, in milliseconds.",
+            f"# TYPE {_METRIC} summary",
+        ]
+        with self._lock:
+            for (span, agent, provider), h in sorted(self._histograms.items()):
+                labels = f'span="{span}",agent="{agent}",provider="{provider}"'
+                for q in _QUANTILES:
+                    lines.append(f'{_METRIC}{{{labels},quantile="{q}"}} {h.percentile(q):.1f}')
+                lines.append(f"{_METRIC}_sum{{{labels}}} {h.total:.1f}")
+                lines.append(f"{_METRIC}_count{{{labels}}} {h.count}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str) -> None:
+        """Atomically replace `path` — blocking, call it through asyncio.to_thread."""
+        write_atomic(path, self.to_prometheus())
+
+
+def write_atomic(path: str, text: str) -> None:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+
+def tracer_for(room: str | None) -> "TurnTracer | None":
+    return _TRACERS.get(room) if room else None
+
+
+def _provider(metrics: Any) -> str:
+    metadata = getattr(metrics, "metadata", None)
+    return (metadata.model_provider or "") if metadata else ""
+
+
+class TurnTracer:
+    """Builds one span tree per turn for a session and feeds the shared histograms."""
+
+    def __init__(
+        self,
+        histograms: LatencyHistograms,
+        room: str | None = None,
+        agent_name: Callable[[], str] | None = None,
+    ) -> None:
+        self.histograms = histograms
+        self.room = room
+        self._agent_name = agent_name or (lambda: "unknown")
+        self._turns: OrderedDict[str, TurnTrace] = OrderedDict()
+        self._finished: OrderedDict[str, str] = OrderedDict()   # finished turn id → agent
+        if room:
+            _TRACERS[room] = self
+
+    def close(self) -> None:
+        if self.room and _TRACERS.get(self.room) is self:
+            del _TRACERS[self.room]
+
+    def _turn(self, turn_id: str) -> TurnTrace:
+        turn = self._turns.get(turn_id)
+        if turn is None:
+            try:
+                agent = self._agent_name()
+            except RuntimeError:
+                agent = "unknown"
+            turn = self._turns[turn_id] = TurnTrace(turn_id, agent)
+            while len(self._turns) > _MAX_OPEN_TURNS:
+                self._turns.popitem(last=False)
+        return turn
+
+    def add_span(self, turn_id: str | None, name: str, duration_ms: float, provider: str = "", **attrs: str) -> None:
+        if turn_id is None:
+            # Outside any reply (e.g. a UI-triggered publish) — histogram only
+            self.histograms.observe(name, "session", provider, duration_ms)
+            return
+        if turn_id in self._finished:
+            # Already exported — a late metric still counts for latency, but must not open an orphan trace
+            self.histograms.observe(name, self._finished[turn_id], provider, duration_ms)
+            return
+        turn = self._turn(turn_id)
+        span_attrs = {"provider": provider, **attrs} if provider else attrs
+        turn.spans.append(Span(name, round(duration_ms, 1), span_attrs))
+        self.histograms.observe(name, turn.agent, provider, duration_ms)
+
+    # ── Session event handlers ───────────────────────────────────────
+
+    def on_speech_created(self, ev: Any) -> None:
+        handle = ev.speech_handle
+        self._turn(handle.id)
+        handle.add_done_callback(self.finish)
+
+    def on_metrics_collected(self, ev: Any) -> None:
+        metrics = ev.metrics
+        turn_id = getattr(metrics, "speech_id", None)
+        if turn_id is None:
+            return
+        if isinstance(metrics, EOUMetrics):
+            if turn_id not in self._finished:
+                self._turn(turn_id).user_turn = True
+            self.add_span(turn_id, "eou_delay", metrics.end_of_utterance_delay * 1000)
+            self.add_span(turn_id, "stt_final", metrics.transcription_delay * 1000)
+            self.add_span(turn_id, "on_user_turn_completed", metrics.on_user_turn_completed_delay * 1000)
+        elif isinstance(metrics, LLMMetrics):
+            model = metrics.metadata.model_name if metrics.metadata else ""
+            self.add_span(turn_id, "llm_ttft", metrics.ttft * 1000, _provider(metrics), model=model or "")
+        elif isinstance(metrics, TTSMetrics):
+            self.add_span(turn_id, "tts_ttfb", metrics.ttfb * 1000, _provider(metrics))
+
+    def on_function_tools_executed(self, ev: Any) -> None:
+        # Emitted from the reply's own task, so the active speech is this turn
+        turn_id = active_speech_id()
+        for call, output in zip(ev.function_calls, ev.function_call_outputs):
+            if output is None:
+                continue
+            self.add_span(turn_id, "tool", (output.created_at - call.created_at) * 1000, tool=call.name)
+
+    def record_publish(self, msg_type: str, duration_ms: float) -> None:
+        self.add_span(active_speech_id(), "publish", duration_ms, type=msg_type)
+
+    def finish(self, handle: Any) -> None:
+        turn = self._turns.pop(handle.id, None)
+        if turn is None:
+            return
+        self._finished[turn.turn_id] = turn.agent
+        while len(self._finished) > _MAX_FINISHED_TURNS:
+            self._finished.popitem(last=False)
+        response = turn.response_ms()
+        if response is not None:
+            self.histograms.observe("response", turn.agent, "", response)
+        if turn.spans:
+            agent_flow.info("⏱️ Turn trace: %s", turn.tree())
@@ -0,0 +1,111 @@
+"""
+Speech-aware scheduling of UI updates.
+
+Form edits, page changes and session syncs from the frontend are batched by
+BaseAgent and turned into a "[UI Updates]" user message. Force-interrupting
+the agent for every batch throws away TTS audio and LLM tokens that are
+already paid for, so each batch is scheduled against what the agent is
+doing right now:
+- agent idle / listening → reply now, nothing to interrupt
+- agent speaking or thinking, and the batch invalidates the reply (form
+  submitted, a saved value corrected, or the reply talks about a field that
+  just changed) → interrupt and reply
+- otherwise → defer; the update goes into the chat context now and is
+  answered in the next natural turn
+
+Every interrupt records the TTS characters and LLM tokens of the reply it
+cut off.
+
+Usage:
+    update = UIUpdate("User updated form 'booking' ...", fields=frozenset({"customer_phone"}))
+    decision = decide([update], session.agent_state, speech_text="Could I get your phone number?")
+    decision.action   # → "interrupt"
+"""
+
+import re
+from dataclasses import dataclass, field
+
+REPLY_NOW = "reply_now"
+DEFER = "defer"
+INTERRUPT = "interrupt"
+
+# After a deferred update, give the user this long to take the turn before the agent replies
+NEXT_TURN_GRACE_SECONDS = 2.0
+
+_BUSY_STATES = ("speaking", "thinking")
+
+# Words (or phrases) in the agent's reply that show it is talking about a form field.
+# A bare "number" is no cue — "number of guests" is about the party, not the phone.
+FIELD_CUES: dict[str, tuple[str, ...]] = {
+    "customer_name":    ("name",),
+    "customer_phone":   ("phone", "contact", "mobile", "your number"),
+    "no_of_guests":     ("guest", "guests", "people", "party", "persons"),
+    "reservation_date": ("date", "day", "today", "tomorrow"),
+    "reservation_time": ("time", "o'clock", "pm"),
+    "special_requests": ("request", "requests", "occasion"),
+    "table_id":         ("table",),
+    "table_seats":      ("table", "seats"),
+    "items":            ("order", "cart", "item", "items"),
+    "total_price":      ("total", "price"),
+    "total_items":      ("total", "items"),
+}
+
+
+@dataclass(frozen=True)
+class UIUpdate:
+    text:   str
+    fields: frozenset[str] = frozenset()   # form fields the update touched
+    urgent: bool = False                   # invalidates any reply in flight (submit, correction)
+
+
+@dataclass(frozen=True)
+class ScheduleDecision:
+    action: str   # REPLY_NOW | DEFER | INTERRUPT
+    reason: str
+
+
+@dataclass(frozen=True)
+class InterruptCost:
+    reason:     str
+    speech_id:  str | None
+    tts_chars:  int   # characters already sent to TTS for the cut-off reply
+    llm_tokens: int   # completion tokens already generated for it
+
+
+@dataclass
+class UIUpdateStats:
+    replied:     int = 0
+    deferred:    int = 0
+    interrupts:  list[InterruptCost] = field(default_factory=list)
+
+    def summary(self) -> dict:
+        return {
+            "replied": self.replied,
+            "deferred": self.deferred,
+            "interrupted": len(self.interrupts),
+            "wasted_tts_chars": sum(c.tts_chars for c in self.interrupts),
+            "wasted_llm_tokens": sum(c.llm_tokens for c in self.interrupts),
+        }
+
+
+def fields_mentioned(text: str) -> set[str]:
+    words = re.findall(r"[a-z']+", str(text).lower())
+    vocabulary = set(words)
+    padded = f" {' '.join(words)} "
+    return {
+        name for name, cues in FIELD_CUES.items()
+        if any(f" {cue} " in padded if " " in cue else cue in vocabulary for cue in cues)
+    }
+
+
+def decide(updates: list[UIUpdate], agent_state: str, speech_text: str = "") -> ScheduleDecision:
+    """Reply now, defer to the next turn, or interrupt the reply in flight."""
+    if agent_state not in _BUSY_STATES:
+        return ScheduleDecision(REPLY_NOW, agent_state)
+    if any(u.urgent for u in updates):
+        return ScheduleDecision(INTERRUPT, "urgent")
+
+    touched = set().union(*(u.fields for u in updates)) & fields_mentioned(speech_text)
+    if touched:
+        return ScheduleDecision(INTERRUPT, f"invalidates:{','.join(sorted(touched))}")
+    return ScheduleDecision(DEFER, f"agent_{agent_state}")
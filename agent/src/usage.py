@@ -0,0 +1,192 @@
+"""
+Per-agent and per-turn token and cost attribution.
+
+livekit's UsageCollector only keeps session totals, so the usage each agent
+logged on exit was cumulative for the whole session. UsageLedger prices
+every metrics_collected event and books it three ways:
+- per agent activation — one row every time an agent is entered
+  ("Reservation#2" is the second time the session entered Reservation)
+- per turn — the reply's speech_id; LLM calls outside a reply are booked
+  under their scope, e.g. "handoff_summary" for summarize_agent_handoff
+  in BaseAgent.on_enter
+- per model
+
+Prices come from a RateTable: USD per 1M input / output LLM tokens, per 1M
+TTS characters and per STT audio minute, grouped per provider (see
+RATE_TABLE in src/agent.py, overridable with a JSON file at RATE_TABLE_PATH).
+Rates are looked up by model name, because livekit's provider labels are
+host names for OpenAI-compatible APIs.
+
+Usage:
+    ledger = UsageLedger(RateTable(RATE_TABLE))
+    ledger.begin_activation("Reservation")
+    with usage_scope("handoff_summary"):
+        await summarize_agent_handoff(...)
+    session.on("metrics_collected", ledger.on_metrics_collected)
+    ledger.report()
+"""
+
+import contextlib
+import contextvars
+import json
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+from livekit.agents.metrics import LLMMetrics, STTMetrics, TTSMetrics
+
+from src.logger_config import agent_flow
+
+LLM = "llm"
+TTS = "tts"
+STT = "stt"
+
+_MAX_TURNS = 200   # per-turn rows kept for the session report
+
+# Label for LLM/TTS calls made outside a reply (handoff summaries, ...)
+_SCOPE = contextvars.ContextVar[str | None]("usage_scope", default=None)
+
+
+@contextlib.contextmanager
+def usage_scope(name: str):
+    """Book metrics emitted by calls started inside this block under turn `name`."""
+    token = _SCOPE.set(name)
+    try:
+        yield
+    finally:
+        _SCOPE.reset(token)
+
+
+class RateTable:
+    """{kind: {provider: {model: rate}}} — LLM rates are (input, output) per 1M tokens,
+    TTS per 1M characters, STT per audio minute."""
+
+    def __init__(self, table: dict[str, dict[str, dict[str, Any]]], path: str | None = None) -> None:
+        table = {kind: {p: dict(models) for p, models in providers.items()} for kind, providers in table.items()}
+        if path and Path(path).exists():
+            # Same shape as RATE_TABLE; entries override or extend it
+            for kind, providers in json.loads(Path(path).read_text(encoding="utf-8")).items():
+                for provider, models in providers.items():
+                    table.setdefault(kind, {}).setdefault(provider, {}).update(models)
+        self.table = table
+        self._by_model: dict[str, dict[str, Any]] = {
+            kind: {model: rate for models in providers.values() for model, rate in models.items()}
+            for kind, providers in table.items()
+        }
+        self._missing: set[tuple[str, str]] = set()
+
+    def rate(self, kind: str, model: str | None) -> Any:
+        rate = self._by_model.get(kind, {}).get(model or "")
+        if rate is None and (kind, model) not in self._missing:
+            self._missing.add((kind, model))
+            agent_flow.warning(f"💸 No {kind} rate for model '{model}' — its usage is costed at $0")
+        return rate
+
+    def llm_cost(self, model: str | None, prompt_tokens: int, completion_tokens: int) -> float:
+        input_rate, output_rate = self.rate(LLM, model) or (0.0, 0.0)
+        return (prompt_tokens * input_rate + completion_tokens * output_rate) / 1_000_000
+
+    def tts_cost(self, model: str | None, characters: int) -> float:
+        return characters * (self.rate(TTS, model) or 0.0) / 1_000_000
+
+    def stt_cost(self, model: str | None, audio_seconds: float) -> float:
+        return audio_seconds / 60 * (self.rate(STT, model) or 0.0)
+
+
+@dataclass
+class Usage:
+    llm_prompt_tokens:     int = 0
+    llm_completion_tokens: int = 0
+    tts_characters:        int = 0
+    stt_seconds:           float = 0.0
+    cost:                  float = 0.0
+
+    def add(self, other: "Usage") -> None:
+        self.llm_prompt_tokens += other.llm_prompt_tokens
+        self.llm_completion_tokens += other.llm_completion_tokens
+        self.tts_characters += other.tts_characters
+        self.stt_seconds += other.stt_seconds
+        self.cost += other.cost
+
+    def to_dict(self) -> dict[str, Any]:
+        data = asdict(self)
+        data["total_tokens"] = self.llm_prompt_tokens + self.llm_completion_tokens
+        data["stt_seconds"] = round(self.stt_seconds, 2)
+        data["cost"] = round(self.cost, 6)
+        return data
+
+
+class UsageLedger:
+    """Prices metrics and books them per agent activation, per turn and per model for one session."""
+
+    def __init__(self, rates: RateTable) -> None:
+        self.rates = rates
+        self.total = Usage()
+        self.activations: dict[str, Usage] = {}
+        self.turns: OrderedDict[tuple[str, str], Usage] = OrderedDict()
+        self.models: dict[str, Usage] = {}
+        self.activation = "session"
+        self._entries: dict[str, int] = {}
+        self._turn_activation: dict[str, str] = {}   # speech_id → activation it was first seen in
+
+    def begin_activation(self, agent: str) -> str:
+        self._entries[agent] = self._entries.get(agent, 0) + 1
+        self.activation = f"{agent}#{self._entries[agent]}"
+        self.activations.setdefault(self.activation, Usage())
+        return self.activation
+
+    def on_metrics_collected(self, ev: Any) -> None:
+        metrics = ev.metrics
+        model = metrics.metadata.model_name if getattr(metrics, "metadata", None) else None
+        if isinstance(metrics, LLMMetrics):
+            usage = Usage(
+                llm_prompt_tokens=metrics.prompt_tokens,
+                llm_completion_tokens=metrics.completion_tokens,
+                cost=self.rates.llm_cost(model, metrics.prompt_tokens, metrics.completion_tokens),
+            )
+        elif isinstance(metrics, TTSMetrics):
+            usage = Usage(tts_characters=metrics.characters_count, cost=self.rates.tts_cost(model, metrics.characters_count))
+        elif isinstance(metrics, STTMetrics):
+            usage = Usage(stt_seconds=metrics.audio_duration, cost=self.rates.stt_cost(model, metrics.audio_duration))
+        else:
+            return
+        self.book(usage, getattr(metrics, "speech_id", None), model or "unknown", kind=metrics.type)
+
+    def book(self, usage: Usage, speech_id: str | None, model: str, kind: str = "") -> None:
+        # A scope wins over speech_id: an agent entered from a tool call inherits that reply's context
+        scope = _SCOPE.get()
+        if scope is None and speech_id is not None:
+            activation = self._turn_activation.setdefault(speech_id, self.activation)
+            turn = speech_id
+        else:
+            activation = self.activation
+            # STT runs continuously and belongs to no reply
+            turn = scope or ("stt" if kind == "stt_metrics" else "untracked")
+
+        self.total.add(usage)
+        self.activations.setdefault(activation, Usage()).add(usage)
+        self.models.setdefault(model, Usage()).add(usage)
+        key = (activation, turn)
+        self.turns.setdefault(key, Usage()).add(usage)
+        self.turns.move_to_end(key)
+        while len(self.turns) > _MAX_TURNS:
+            self.turns.popitem(last=False)
+
+    def activation_usage(self, activation: str | None = None) -> dict[str, Any]:
+        return self.activations.get(activation or self.activation, Usage()).to_dict()
+
+    def report(self) -> dict[str, Any]:
+        per_agent: dict[str, Usage] = {}
+        for activation, usage in self.activations.items():
+            per_agent.setdefault(activation.split("#")[0], Usage()).add(usage)
+        return {
+            "total": self.total.to_dict(),
+            "per_agent": {agent: u.to_dict() for agent, u in per_agent.items()},
+            "per_activation": {a: u.to_dict() for a, u in self.activations.items()},
+            "per_turn": [
+                {"activation": activation, "turn": turn, **usage.to_dict()}
+                for (activation, turn), usage in self.turns.items()
+            ],
+            "per_model": {m: u.to_dict() for m, u in self.models.items()},
+        }
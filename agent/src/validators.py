@@ -0,0 +1,100 @@
+"""
+Booking form field validators — mirror frontend lib/form-rules.ts BOOKING_FIELD_RULES.
+
+Each validator takes the raw value passed by the LLM and returns (clean_value, error).
+`error` is None when the value is valid; otherwise it is a short instruction for the LLM.
+
+Usage:
+    from src.validators import validate_booking_fields
+    clean, errors = validate_booking_fields({"no_of_guests": 4, "customer_phone": "98765"})
+"""
+
+from typing import Any, Callable, Optional
+
+from src.datetime_resolver import check_not_past, resolve_date, resolve_time
+from src.phone import normalize_phone
+from src.variables import MAX_RESERVATION_GUESTS
+
+ValidationResult = tuple[Any, Optional[str]]
+
+
+def validate_customer_name(name: Any) -> ValidationResult:
+    name = str(name or "").strip()
+    if len(name) < 2:
+        return None, "Invalid name. Please ask the user for their full name."
+    return name, None
+
+
+def validate_customer_phone(phone: Any) -> ValidationResult:
+    # Spoken digits, "double five", +91 and STT punctuation are normalized to 10 digits
+    result = normalize_phone(str(phone or ""))
+    if not result.ok:
+        return None, "Invalid phone number. It must be exactly 10 digits. Please ask the user to repeat."
+    return result.digits, None
+
+
+def validate_no_of_guests(no_of_guests: Any) -> ValidationResult:
+    try:
+        no_of_guests = int(no_of_guests)
+    except (TypeError, ValueError):
+        return None, f"Invalid number of guests. Please provide a number between 1 and {MAX_RESERVATION_GUESTS}."
+    if no_of_guests <= 0 or no_of_guests > MAX_RESERVATION_GUESTS:
+        return None, f"Invalid number of guests. Please provide a number between 1 and {MAX_RESERVATION_GUESTS}."
+    return no_of_guests, None
+
+
+def validate_reservation_date(reservation_date: Any) -> ValidationResult:
+    # Accepts YYYY-MM-DD as well as spoken dates ("tomorrow", "next friday")
+    return resolve_date(str(reservation_date or ""))
+
+
+def validate_reservation_time(reservation_time: Any) -> ValidationResult:
+    # Accepts HH:MM as well as spoken times ("8 pm", "half past seven"), within operating hours
+    return resolve_time(str(reservation_time or ""))
+
+
+def validate_special_requests(special_requests: Any) -> ValidationResult:
+    special_requests = str(special_requests or "").strip()
+    # Optional: empty means "none"; if filled, min 3 chars
+    if special_requests and len(special_requests) < 3:
+        return None, "Special request is too short. Please ask the user to repeat it."
+    return special_requests or "none", None
+
+
+BOOKING_VALIDATORS: dict[str, Callable[[Any], ValidationResult]] = {
+    "customer_name":    validate_customer_name,
+    "customer_phone":   validate_customer_phone,
+    "no_of_guests":     validate_no_of_guests,
+    "reservation_date": validate_reservation_date,
+    "reservation_time": validate_reservation_time,
+    "special_requests": validate_special_requests,
+}
+
+
+def validate_booking_fields(
+    values: dict[str, Any], saved: dict[str, Any] | None = None
+) -> tuple[dict[str, Any], dict[str, str]]:
+    """Validate every given field independently → (clean values, per-field errors).
+    `saved` holds the already stored fields, so a new date or time is also checked against
+    the other half of the slot (a time earlier today is rejected)."""
+    clean: dict[str, Any] = {}
+    errors: dict[str, str] = {}
+    for field_name, value in values.items():
+        validator = BOOKING_VALIDATORS.get(field_name)
+        if validator is None:
+            errors[field_name] = "Unknown field."
+            continue
+        result, error = validator(value)
+        if error:
+            errors[field_name] = error
+        else:
+            clean[field_name] = result
+
+    slot = {**(saved or {}), **clean}
+    if ({"reservation_date", "reservation_time"} & clean.keys()) and slot.get("reservation_date") and slot.get("reservation_time"):
+        error = check_not_past(slot["reservation_date"], slot["reservation_time"])
+        if error:
+            field_name = "reservation_time" if "reservation_time" in clean else "reservation_date"
+            errors[field_name] = error
+            del clean[field_name]
+    return clean, errors
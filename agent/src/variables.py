@@ -30,6 +30,7 @@ GREETER_INSTRUCTIONS: str = (
 "If reservation: call to_reservation immediately.\n"
 "If food order: call to_order_food immediately.\n"
 "Do not collect any details yourself — hand off as soon as intent is clear.\n"
+"For general questions (hours, location, parking, cuisine, payment, dietary needs) call lookup_info and answer briefly from its result only.\n"
 "If the user navigated here from a specific page, greet them contextually for that page.\n"
 )
 
@@ -44,7 +45,7 @@ GREETER_INSTRUCTIONS: str = (
 
 COLLECTION_TASK_INSTRUCTIONS: str = (
 "# Your goal \n"
-"Collect the following reservation details one by one in this order :\n"
+"Collect the following reservation details in this order :\n"
 "1. Customer name \n"
 "2. Customer phone number \n"
 "3. Reservation date \n"
@@ -52,9 +53,13 @@ COLLECTION_TASK_INSTRUCTIONS: str = (
 "5. Number of guests \n"
 "6. Any special requests \n"
 
-"After all these 6 details are collected, ask user to select a table from UI\n"
+"After all these 6 details are collected, call find_table — it holds the best table for the party.\n"
+"If it reports no table at that time, offer the user the suggested alternative times.\n"
+"If the user wants a specific table instead, call check_availability and hold it with hold_table.\n"
+"Finally read back the details, and once the user agrees call confirm_reservation.\n"
 
-"Everytime you get a piece of information, save it using the relevant tool. (e.g. save_customer_name for customer name, save_reservation_date for reservation date and so on). \n"
+"Everytime you get information, save ALL details the user just gave in ONE save_booking_fields call (e.g. name, guests, date and time together). \n"
+"If it returns errors for some fields, ask the user again only for those fields.\n"
 
 "# UI Sync:\n"
 "- The user has a booking form open on their screen alongside this conversation.\n"
@@ -65,11 +70,15 @@ COLLECTION_TASK_INSTRUCTIONS: str = (
 
 "# Guidelines:\n"
 "- While asking for time, mention the restaurant operating hours.\n"
+"- Pass dates and times exactly as the user said them (e.g. 'next friday', '8 pm') — they are converted and checked automatically.\n"
 )
 
 
 ORDER_FOOD_INSTRUCTIONS: str = (
 "You are a friendly, professional food ordering assistant for Terra restaurant.\n"
+"Use search_menu to answer questions about dishes and prices — never guess menu items.\n"
+"Call add_to_cart / remove_from_cart with the dish exactly as the user said it; misheard names are matched automatically.\n"
+"If a tool returns options, ask the user which one they meant.\n"
 )
 
 VALID_RESTAURANTS_TIME_RANGE: dict[str, str] = {
@@ -79,9 +88,101 @@ VALID_RESTAURANTS_TIME_RANGE: dict[str, str] = {
 
 MAX_RESERVATION_GUESTS: int = 20
 
+# Dates and times said by the user ("tomorrow", "8 pm") are resolved in this timezone
+RESTAURANT_TIMEZONE: str = os.getenv("RESTAURANT_TIMEZONE", "Asia/Kolkata")
+
 AVAILABLE_CUISINES: list[str] = [
     "italian",
     "chinese",
     "indian",
     "mexican",
-]
\ No newline at end of file
+]
+
+# Floor plan — must match frontend seating-plan.tsx TABLES.
+# Tables in the same row with consecutive ids stand side by side and can be joined.
+RESTAURANT_TABLES: list[dict] = [
+    {"id": 1,  "seats": 2, "row": "window"},
+    {"id": 2,  "seats": 2, "row": "window"},
+    {"id": 3,  "seats": 2, "row": "window"},
+    {"id": 4,  "seats": 2, "row": "window"},
+    {"id": 5,  "seats": 2, "row": "window"},
+    {"id": 6,  "seats": 2, "row": "window"},
+    {"id": 7,  "seats": 4, "row": "classic-1"},
+    {"id": 8,  "seats": 4, "row": "classic-1"},
+    {"id": 9,  "seats": 4, "row": "classic-1"},
+    {"id": 10, "seats": 4, "row": "classic-1"},
+    {"id": 11, "seats": 4, "row": "classic-1"},
+    {"id": 12, "seats": 4, "row": "classic-2"},
+    {"id": 13, "seats": 4, "row": "classic-2"},
+    {"id": 14, "seats": 4, "row": "classic-2"},
+    {"id": 15, "seats": 4, "row": "classic-2"},
+    {"id": 16, "seats": 4, "row": "classic-2"},
+    {"id": 17, "seats": 6, "row": "social"},
+    {"id": 18, "seats": 6, "row": "social"},
+    {"id": 19, "seats": 6, "row": "social"},
+    {"id": 20, "seats": 8, "row": "banquet"},
+    {"id": 21, "seats": 8, "row": "banquet"},
+]
+
+# How long one reservation occupies a table, and how long an unconfirmed hold lives.
+RESERVATION_SLOT_MINUTES: int = 90
+RESERVATION_SLOT_STEP_MINUTES: int = 30  # granularity of suggested alternative times
+TABLE_HOLD_TTL_SECONDS: int = 300
+
+AVAILABILITY_DB_PATH: str = os.getenv("AVAILABILITY_DB_PATH", "data/reservations.db")
+
+# FAQ passages answered by the Greeter's lookup_info tool (see src/knowledge.py)
+KNOWLEDGE_PATH: str = os.getenv("KNOWLEDGE_PATH", "knowledge/restaurant.json")
+
+# Greeter routes straight to Reservation / OrderFood when the local intent
+# classifier is at least this confident; otherwise the LLM decides (see src/intent.py)
+INTENTS_PATH: str = os.getenv("INTENTS_PATH", "knowledge/intents.json")
+INTENT_FAST_PATH_ENABLED: bool = os.getenv("INTENT_FAST_PATH_ENABLED", "true").lower() in ["true", "1", "yes"]
+INTENT_FAST_PATH_MIN_CONFIDENCE: float = float(os.getenv("INTENT_FAST_PATH_MIN_CONFIDENCE", "0.85"))
+
+# Per-turn latency histograms, exported in Prometheus text format (see src/tracing.py)
+LATENCY_METRICS_PATH: str = os.getenv("LATENCY_METRICS_PATH", "logs/latency.prom")
+LATENCY_EXPORT_SECONDS: float = float(os.getenv("LATENCY_EXPORT_SECONDS", "15"))
+
+# Optional JSON overrides for RATE_TABLE in src/agent.py, and where per-session reports are written
+RATE_TABLE_PATH: str = os.getenv("RATE_TABLE_PATH", "rates.json")
+SESSION_REPORT_DIR: str = os.getenv("SESSION_REPORT_DIR", "logs/sessions")
+
+# Per-session event timeline for offline replay (see src/session_recorder.py, src/session_replay.py)
+SESSION_RECORDING_ENABLED: bool = os.getenv("SESSION_RECORDING_ENABLED", "true").lower() in ["true", "1", "yes"]
+SESSION_RECORDING_DIR: str = os.getenv("SESSION_RECORDING_DIR", "logs/recordings")
+
+# Menu — must match frontend app/(website)/order/page.tsx menuItems.
+MENU_ITEMS: list[dict] = [
+    {"id": 1,  "name": "Margherita Pizza",    "description": "Classic tomato, mozzarella, basil",   "price": 12.99, "category": "Pizza",       "emoji": "🍕"},
+    {"id": 2,  "name": "Pepperoni Pizza",     "description": "Tomato sauce, mozzarella, pepperoni", "price": 14.99, "category": "Pizza",       "emoji": "🍕"},
+    {"id": 3,  "name": "Caesar Salad",        "description": "Romaine lettuce, parmesan, croutons", "price": 8.99,  "category": "Salads",      "emoji": "🥗"},
+    {"id": 4,  "name": "Greek Salad",         "description": "Tomatoes, cucumber, feta, olives",    "price": 9.99,  "category": "Salads",      "emoji": "🥗"},
+    {"id": 5,  "name": "Spaghetti Carbonara", "description": "Pasta, eggs, bacon, parmesan",        "price": 13.99, "category": "Pasta",       "emoji": "🍝"},
+    {"id": 6,  "name": "Penne Arrabbiata",    "description": "Spicy tomato sauce, garlic",          "price": 11.99, "category": "Pasta",       "emoji": "🍝"},
+    {"id": 7,  "name": "Grilled Salmon",      "description": "Fresh salmon, herbs, lemon",          "price": 18.99, "category": "Main Course", "emoji": "🐟"},
+    {"id": 8,  "name": "Ribeye Steak",        "description": "Premium beef, grilled to perfection", "price": 24.99, "category": "Main Course", "emoji": "🥩"},
+    {"id": 9,  "name": "Tiramisu",            "description": "Classic Italian dessert",             "price": 6.99,  "category": "Desserts",    "emoji": "🍰"},
+    {"id": 10, "name": "Chocolate Lava Cake", "description": "Warm chocolate cake with ice cream",  "price": 7.99,  "category": "Desserts",    "emoji": "🍫"},
+]
+
+# Model cascade: easy turns go to the small model, the rest to models["llm"] (see src/cascade.py).
+# Opt-in — the small model's provider needs its own API key (GROQ_API_KEY for the default).
+LLM_CASCADE_ENABLED: bool = os.getenv("LLM_CASCADE_ENABLED", "false").lower() in ["true", "1", "yes"]
+LLM_CASCADE_SMALL: str = os.getenv("LLM_CASCADE_SMALL", "groq:llama-8b-instant")  # "<provider>:<model key in LLM_MODELS>"
+
+# LLM request / response bodies, one JSONL file per session (see src/llm_recorder.py)
+LLM_RECORDER_ENABLED: bool = os.getenv("LLM_RECORDER_ENABLED", "false").lower() in ["true", "1", "yes"]
+LLM_RECORDER_DIR: str = os.getenv("LLM_RECORDER_DIR", "logs/llm")
+
+# Event-loop lag sampling and slow-callback detection (see src/loop_monitor.py)
+LOOP_MONITOR_ENABLED: bool = os.getenv("LOOP_MONITOR_ENABLED", "true").lower() in ["true", "1", "yes"]
+LOOP_SLOW_CALLBACK_MS: float = float(os.getenv("LOOP_SLOW_CALLBACK_MS", "50"))
+LOOP_LAG_SAMPLE_SECONDS: float = float(os.getenv("LOOP_LAG_SAMPLE_SECONDS", "0.1"))
+LOOP_METRICS_PATH: str = os.getenv("LOOP_METRICS_PATH", "logs/event_loop.prom")
+
+# On-demand CPU / allocation profiling of a live job process, opt-in (see src/profiler.py)
+PROFILER_ENABLED: bool = os.getenv("PROFILER_ENABLED", "false").lower() in ["true", "1", "yes"]
+PROFILER_DIR: str = os.getenv("PROFILER_DIR", "logs/profiles")
+PROFILER_INTERVAL_MS: float = float(os.getenv("PROFILER_INTERVAL_MS", "5"))
+PROFILE_ON_START_SECONDS: float = float(os.getenv("PROFILE_ON_START_SECONDS", "0"))
@@ -0,0 +1,106 @@
+import time
+
+import pytest
+
+from src.availability import (
+    CONFIRMED,
+    Booking,
+    BookingNotFoundError,
+    SlotUnavailableError,
+    TableAvailability,
+    TableIntervalIndex,
+    from_minute,
+    to_minute,
+)
+
+TABLES = [
+    {"id": 1, "seats": 2, "row": "window"},
+    {"id": 2, "seats": 4, "row": "classic"},
+]
+
+
+@pytest.fixture
+def availability(tmp_path) -> TableAvailability:
+    engine = TableAvailability(str(tmp_path / "reservations.db"), tables=TABLES, slot_minutes=90, hold_ttl=60)
+    yield engine
+    engine.close()
+
+
+def test_minute_round_trip() -> None:
+    assert from_minute(to_minute("2026-10-20", "19:45")) == ("2026-10-20", "19:45")
+
+
+def test_interval_index_overlap() -> None:
+    index = TableIntervalIndex()
+    index.replace_all([
+        Booking(1, 1, 100, 190, CONFIRMED, "a"),
+        Booking(2, 1, 300, 390, CONFIRMED, "a"),
+    ])
+    now = time.time()
+    assert not index.is_free(150, 240, now)
+    assert index.is_free(190, 300, now)  # back-to-back slots touch but do not overlap
+    assert not index.is_free(0, 1000, now)
+    assert index.is_free(390, 480, now)
+
+
+def test_hold_blocks_slot_and_free_tables_filters_seats(availability: TableAvailability) -> None:
+    start, end = availability.slot_bounds("2026-10-20", "20:00")
+    assert availability.free_tables(start, end, min_seats=3) == [2]
+
+    availability.hold(2, start, end, owner="room-a")
+
+    assert availability.free_tables(start, end, min_seats=3) == []
+    assert availability.is_free(2, end, end + 90)
+    with pytest.raises(SlotUnavailableError):
+        availability.hold(2, start + 30, end + 30, owner="room-b")
+
+
+def test_confirm_requires_owner_and_unexpired_hold(availability: TableAvailability) -> None:
+    start, end = availability.slot_bounds("2026-10-20", "20:00")
+    booking = availability.hold(1, start, end, owner="room-a")
+
+    with pytest.raises(BookingNotFoundError):
+        availability.confirm(booking.id, owner="room-b")
+
+    confirmed = availability.confirm(booking.id, owner="room-a")
+    assert confirmed.status == CONFIRMED
+
+
+def test_expired_hold_frees_table(tmp_path) -> None:
+    engine = TableAvailability(str(tmp_path / "r.db"), tables=TABLES, hold_ttl=0.01)
+    start, end = engine.slot_bounds("2026-10-20", "20:00")
+    booking = engine.hold(1, start, end, owner="room-a")
+    time.sleep(0.02)
+
+    assert engine.is_free(1, start, end)
+    with pytest.raises(BookingNotFoundError):
+        engine.confirm(booking.id, owner="room-a")
+    engine.hold(1, start, end, owner="room-b")
+    engine.close()
+
+
+def test_release_frees_table(availability: TableAvailability) -> None:
+    start, end = availability.slot_bounds("2026-10-20", "20:00")
+    booking = availability.hold(1, start, end, owner="room-a")
+    availability.release(booking.id, owner="room-a")
+    assert availability.is_free(1, start, end)
+
+
+def test_two_workers_cannot_double_book(tmp_path) -> None:
+    """Each worker process opens its own engine on the same SQLite file."""
+    path = str(tmp_path / "shared.db")
+    worker_a = TableAvailability(path, tables=TABLES)
+    worker_b = TableAvailability(path, tables=TABLES)
+    start, end = worker_a.slot_bounds("2026-10-20", "20:00")
+
+    # Both see the table as free in their in-memory index
+    assert worker_a.is_free(1, start, end) and worker_b.is_free(1, start, end)
+
+    worker_a.hold(1, start, end, owner="room-a")
+    with pytest.raises(SlotUnavailableError):
+        worker_b.hold(1, start, end, owner="room-b")
+
+    # The losing worker's index was refreshed by the failed write
+    assert not worker_b.is_free(1, start, end)
+    worker_a.close()
+    worker_b.close()
@@ -0,0 +1,132 @@
+import asyncio
+
+from livekit.agents import function_tool, llm
+from livekit.agents.llm import ChatChunk, ChoiceDelta, CompletionUsage, FunctionToolCall
+from livekit.agents.types import DEFAULT_API_CONNECT_OPTIONS
+
+from src.cascade import LARGE, SMALL, CascadeLLM, TurnRouter
+
+
+class ScriptedLLM(llm.LLM):
+    """Answers every call with the same chunks, or raises `error`."""
+
+    def __init__(self, name: str, chunks: list[ChatChunk] | None = None, error: Exception | None = None) -> None:
+        super().__init__()
+        self.name = name
+        self.chunks = chunks or []
+        self.error = error
+        self.calls = 0
+
+    @property
+    def model(self) -> str:
+        return self.name
+
+    def chat(self, *, chat_ctx, tools=None, conn_options=DEFAULT_API_CONNECT_OPTIONS, **kwargs) -> llm.LLMStream:
+        self.calls += 1
+        return _ScriptedStream(self, chat_ctx=chat_ctx, tools=tools or [], conn_options=conn_options)
+
+
+class _ScriptedStream(llm.LLMStream):
+    async def _run(self) -> None:
+        if self._llm.error:
+            raise self._llm.error
+        for chunk in self._llm.chunks:
+            self._event_ch.send_nowait(chunk)
+
+
+def _text(content: str) -> list[ChatChunk]:
+    return [
+        ChatChunk(id="1", delta=ChoiceDelta(role="assistant", content=content)),
+        ChatChunk(id="1", usage=CompletionUsage(completion_tokens=5, prompt_tokens=100, total_tokens=105)),
+    ]
+
+
+def _call(name: str, arguments: str) -> list[ChatChunk]:
+    call = FunctionToolCall(name=name, arguments=arguments, call_id="c1")
+    return [ChatChunk(id="1", delta=ChoiceDelta(role="assistant", tool_calls=[call]))]
+
+
+@function_tool
+async def save_guests(no_of_guests: int) -> str:
+    """Save the number of guests."""
+    return "ok"
+
+
+@function_tool
+async def confirm_reservation() -> str:
+    """Confirm the reservation."""
+    return "ok"
+
+
+def _user_ctx(text: str) -> llm.ChatContext:
+    ctx = llm.ChatContext.empty()
+    ctx.add_message(role="system", content="You are a restaurant assistant.")
+    ctx.add_message(role="user", content=text)
+    return ctx
+
+
+def _answer(cascade: CascadeLLM, chat_ctx: llm.ChatContext, tools: list | None = None) -> list[ChatChunk]:
+    async def collect() -> list[ChatChunk]:
+        async with cascade.chat(chat_ctx=chat_ctx, tools=tools or []) as stream:
+            return [chunk async for chunk in stream]
+    return asyncio.run(collect())
+
+
+def test_router_picks_tiers() -> None:
+    router = TurnRouter()
+    assert router.route(_user_ctx("yes, 8 pm")).tier == SMALL
+    assert router.route(_user_ctx("I'd like a table for my parents and me on the weekend, ideally near a window")).reason == "long_turn"
+    assert router.route(_user_ctx("yes"), tools=[confirm_reservation]).reason == "complex_stage"
+
+    ctx = _user_ctx("four of us")
+    ctx.items.append(llm.FunctionCall(call_id="c1", name="save_guests", arguments='{"no_of_guests": 40}'))
+    ctx.items.append(llm.FunctionCallOutput(call_id="c1", name="save_guests", output="Error: too many guests", is_error=False))
+    assert router.route(ctx).reason == "tool_error"
+
+
+def test_easy_turn_stays_on_small_model() -> None:
+    small, large = ScriptedLLM("small", _text("Great!")), ScriptedLLM("large", _text("Great!"))
+    cascade = CascadeLLM(small, large, prices={SMALL: (1.0, 1.0)})
+
+    chunks = _answer(cascade, _user_ctx("sounds good"))
+
+    assert "".join(c.delta.content for c in chunks if c.delta and c.delta.content) == "Great!"
+    assert (small.calls, large.calls) == (1, 0)
+    summary = cascade.stats.summary()
+    assert summary["tiers"][SMALL]["prompt_tokens"] == 100
+    assert summary["tiers"][SMALL]["cost"] > 0
+
+
+def test_invalid_tool_call_escalates_before_reaching_the_user() -> None:
+    small = ScriptedLLM("small", _call("save_guests", '{"no_of_guests": "lots"}'))
+    large = ScriptedLLM("large", _call("save_guests", '{"no_of_guests": 4}'))
+    cascade = CascadeLLM(small, large)
+
+    chunks = _answer(cascade, _user_ctx("four people"), tools=[save_guests])
+
+    calls = [call for c in chunks if c.delta for call in c.delta.tool_calls]
+    assert [call.arguments for call in calls] == ['{"no_of_guests": 4}']
+    assert cascade.stats.escalations == {"invalid_tool_arguments": 1}
+    assert cascade.stats.summary()["escalation_rate"] == 1.0
+
+
+def test_small_model_error_falls_back_to_large() -> None:
+    small = ScriptedLLM("small", error=RuntimeError("rate limited"))
+    large = ScriptedLLM("large", _text("Sure."))
+    cascade = CascadeLLM(small, large)
+
+    chunks = _answer(cascade, _user_ctx("ok"))
+
+    assert any(c.delta and c.delta.content == "Sure." for c in chunks)
+    assert cascade.stats.tiers[LARGE].calls == 1
+
+
+def test_hedging_small_answer_escalates_before_reaching_the_user() -> None:
+    small = ScriptedLLM("small", _text("I'm not sure we have that. Maybe?"))
+    large = ScriptedLLM("large", _text("Yes, we have vegan pizza."))
+    cascade = CascadeLLM(small, large)
+
+    chunks = _answer(cascade, _user_ctx("vegan pizza?"))
+
+    assert "".join(c.delta.content for c in chunks if c.delta and c.delta.content) == "Yes, we have vegan pizza."
+    assert cascade.stats.escalations == {"low_confidence": 1}
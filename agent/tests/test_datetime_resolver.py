@@ -0,0 +1,31 @@
+import json
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from src.datetime_resolver import resolve_date, resolve_time
+
+CORPUS = json.loads((Path(__file__).parent / "data" / "datetime_corpus.json").read_text())
+NOW = datetime.fromisoformat(CORPUS["now"])
+
+
+@pytest.mark.parametrize("case", CORPUS["dates"], ids=lambda c: c["text"])
+def test_resolve_date_corpus(case: dict) -> None:
+    value, error = resolve_date(case["text"], NOW)
+    assert value == case["expected"]
+    assert (error is None) == (case["expected"] is not None)
+
+
+@pytest.mark.parametrize("case", CORPUS["times"], ids=lambda c: c["text"])
+def test_resolve_time_corpus(case: dict) -> None:
+    value, error = resolve_time(case["text"])
+    assert value == case["expected"]
+    assert (error is None) == (case["expected"] is not None)
+
+
+def test_resolve_time_rejects_a_time_already_past_today() -> None:
+    today = NOW.date().isoformat()
+    assert resolve_time("2 pm", today, now=NOW)[0] is None
+    assert resolve_time("8 pm", today, now=NOW) == ("20:00", None)
+    assert resolve_time("2 pm", "2026-10-20", now=NOW) == ("14:00", None)
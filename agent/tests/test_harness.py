@@ -0,0 +1,50 @@
+import asyncio
+
+from livekit.agents import llm
+
+from src.harness import (
+    FakeRoom,
+    FakeTTS,
+    LLMRequest,
+    Reply,
+    ScriptedLLM,
+    all_of,
+    offered,
+    user_said,
+)
+
+
+def _request(text: str, tools: list[str]) -> LLMRequest:
+    ctx = llm.ChatContext.empty()
+    ctx.add_message(role="user", content=text)
+    return LLMRequest(ctx, tools)
+
+
+def test_first_matching_rule_answers() -> None:
+    scripted = ScriptedLLM(default=Reply("Sorry?"))
+    scripted.when(all_of(user_said("table"), offered("to_reservation")), Reply(tool_calls=[("to_reservation", {})]))
+    scripted.when(user_said("table"), Reply("Which restaurant?"))
+
+    assert scripted.answer(_request("A TABLE please", ["to_reservation"])).tool_calls == [("to_reservation", {})]
+    assert scripted.answer(_request("a table please", [])).text == "Which restaurant?"
+    assert scripted.answer(_request("hello", [])).text == "Sorry?"
+
+
+def test_fake_tts_synthesizes_silence_sized_to_the_text() -> None:
+    async def synthesize() -> float:
+        async with FakeTTS() as fake:
+            frames = [ev.frame async for ev in fake.synthesize("Table for four?")]
+        return sum(f.duration for f in frames)
+
+    assert abs(asyncio.run(synthesize()) - 0.9) < 0.05
+
+
+def test_fake_room_round_trips_data_packets() -> None:
+    room = FakeRoom()
+    seen = []
+    room.on("data_received", lambda packet: seen.append((packet.topic, packet.data)))
+    room.send_ui("PAGE_CHANGED", {"page": "order"})
+    asyncio.run(room.local_participant.publish_data(b'{"type": "NAVIGATE_PAGE"}', topic="agent-to-ui"))
+
+    assert seen[0][0] == "ui-to-agent" and b'"PAGE_CHANGED"' in seen[0][1]
+    assert room.messages("NAVIGATE_PAGE") == [{"type": "NAVIGATE_PAGE"}]
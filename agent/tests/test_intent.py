@@ -0,0 +1,42 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from src.intent import IntentClassifier
+from src.variables import INTENT_FAST_PATH_MIN_CONFIDENCE
+
+UTTERANCES = json.loads((Path(__file__).parent / "data" / "intent_utterances.json").read_text())
+
+
+@pytest.fixture(scope="module")
+def classifier() -> IntentClassifier:
+    return IntentClassifier()
+
+
+@pytest.mark.parametrize("case", UTTERANCES, ids=lambda c: c["text"])
+def test_fast_path_never_routes_to_the_wrong_agent(classifier: IntentClassifier, case: dict) -> None:
+    result = classifier.classify(case["text"])
+    if result.routes(INTENT_FAST_PATH_MIN_CONFIDENCE):
+        assert result.intent == case["intent"]
+
+
+def test_fast_path_covers_most_clear_requests(classifier: IntentClassifier) -> None:
+    requests = [c for c in UTTERANCES if c["intent"] != "other"]
+    routed = sum(classifier.classify(c["text"]).routes(INTENT_FAST_PATH_MIN_CONFIDENCE) for c in requests)
+    assert routed / len(requests) >= 0.8
+
+
+def test_questions_about_booking_fall_back_to_the_llm(classifier: IntentClassifier) -> None:
+    assert not classifier.classify("do you take reservations on weekends").routes(INTENT_FAST_PATH_MIN_CONFIDENCE)
+    assert classifier.classify("can I book a table for the weekend").routes(INTENT_FAST_PATH_MIN_CONFIDENCE)
+
+
+def test_negated_cue_does_not_count() -> None:
+    classifier = IntentClassifier(examples={
+        "reservation": ["book a table", "reserve a table"],
+        "order_food": ["order food", "order a pizza"],
+        "other": ["hello", "thanks"],
+    })
+    result = classifier.classify("I don't want to order food")
+    assert result.intent != "order_food" or result.confidence < 1.0
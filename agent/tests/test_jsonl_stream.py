@@ -0,0 +1,78 @@
+import gzip
+import threading
+import time
+from pathlib import Path
+
+from src.jsonl_stream import GzipJsonlWriter, read_jsonl
+
+
+async def test_streams_lines_and_appends_footer_on_close(tmp_path) -> None:
+    path = str(tmp_path / "session.jsonl.gz")
+    writer = GzipJsonlWriter(path)
+    for i in range(100):
+        writer.write({"kind": "event", "i": i})
+    await writer.aclose({"kind": "footer", "dropped": 2})
+
+    lines = list(read_jsonl(path))
+    assert [line["i"] for line in lines[:-1]] == list(range(100))
+    assert lines[-1] == {"kind": "footer", "dropped": 2, "lines": 100}
+    writer.write({"kind": "late"})   # ignored after close
+    assert len(list(read_jsonl(path))) == 101
+
+
+def test_file_of_a_killed_process_reads_up_to_the_last_flush(tmp_path) -> None:
+    path = str(tmp_path / "session.jsonl.gz")
+    writer = GzipJsonlWriter(path, flush_seconds=0.0)
+    for i in range(10):
+        writer.write({"i": i})
+    deadline = time.monotonic() + 2
+    while writer.written < 10 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    time.sleep(0.05)
+
+    # The gzip member is still open: no trailer, as if the process had died here
+    with open(path, "rb") as f:
+        partial = f.read()
+    truncated = tmp_path / "truncated.jsonl.gz"
+    truncated.write_bytes(partial)
+    assert [line["i"] for line in read_jsonl(str(truncated))] == list(range(10))
+    writer.close()
+
+
+def test_unserializable_line_is_counted_not_fatal(tmp_path) -> None:
+    path = str(tmp_path / "session.jsonl.gz")
+    writer = GzipJsonlWriter(path)
+    circular: dict = {}
+    circular["self"] = circular
+    writer.write({"ok": 1})
+    writer.write(circular)
+    writer.write({"ok": 2})
+    writer.close({"kind": "footer"})
+
+    lines = list(read_jsonl(path))
+    assert [line.get("ok") for line in lines[:-1]] == [1, 2]
+    assert lines[-1]["dropped"] == 1
+    assert gzip.decompress(Path(path).read_bytes())   # a complete, valid gzip file
+
+
+async def test_a_reused_path_holds_only_the_new_session(tmp_path) -> None:
+    path = str(tmp_path / "room.jsonl.gz")
+    for session in ("first", "second"):
+        writer = GzipJsonlWriter(path)
+        writer.write({"session": session})
+        await writer.aclose({"kind": "footer"})
+
+    assert [line.get("session") for line in read_jsonl(path)] == ["second", None]
+
+
+def test_close_on_a_stalled_writer_counts_the_footer_as_dropped(tmp_path) -> None:
+    writer = GzipJsonlWriter(str(tmp_path / "room.jsonl.gz"), max_buffered=1)
+    stalled = threading.Event()
+    writer._thread = threading.Thread(target=stalled.wait, daemon=True)   # a disk that never drains
+    writer._thread.start()
+    writer.write({"i": 1})
+
+    writer.close({"kind": "footer"}, timeout=0.01)
+
+    assert writer.dropped == 1
+    stalled.set()
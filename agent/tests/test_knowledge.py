@@ -0,0 +1,55 @@
+import json
+from datetime import time
+from pathlib import Path
+
+import pytest
+
+from src.datetime_resolver import _booking_window
+from src.knowledge import KnowledgeBase
+from src.variables import VALID_RESTAURANTS_TIME_RANGE
+
+QUERIES = json.loads((Path(__file__).parent / "data" / "faq_queries.json").read_text())
+
+
+@pytest.fixture(scope="module")
+def kb() -> KnowledgeBase:
+    return KnowledgeBase()
+
+
+@pytest.mark.parametrize("case", QUERIES, ids=lambda c: c["query"])
+def test_search_finds_the_right_passage(kb: KnowledgeBase, case: dict) -> None:
+    matches = kb.search(case["query"], k=1)
+    assert (matches[0].passage.id if matches else None) == case["expected"]
+
+
+def test_every_sample_question_retrieves_its_own_passage(kb: KnowledgeBase) -> None:
+    for passage in kb.passages:
+        for question in passage.questions:
+            assert kb.search(question, k=1)[0].passage.id == passage.id, question
+
+
+def _spoken(minute: int) -> str:
+    """660 → '11 AM', 1230 → '8:30 PM' — the way the passages write times."""
+    return time(minute // 60, minute % 60).strftime("%-I:%M %p").replace(":00", "")
+
+
+def test_hours_passage_matches_the_booking_window(kb: KnowledgeBase) -> None:
+    text = next(p.text for p in kb.passages if p.id == "hours")
+    opening, last_start = _booking_window()
+    closing = time.fromisoformat(VALID_RESTAURANTS_TIME_RANGE["closing_time"])
+    assert f"from {_spoken(opening)} to {_spoken(closing.hour * 60 + closing.minute)}" in text
+    assert f"last seating is at {_spoken(last_start)}" in text
+
+
+def test_warm_cache_serves_sample_questions_without_ranking() -> None:
+    kb = KnowledgeBase(passages=[
+        {"id": "parking", "title": "Parking", "text": "Free parking for guests.", "questions": ["Is parking available?"]},
+        {"id": "hours", "title": "Hours", "text": "Open 11 to 11.", "questions": ["When do you open?"]},
+    ])
+    kb.warm()
+    misses = kb.stats.misses
+
+    # Same terms in another order and case hit the cache
+    assert kb.search("available parking IS?")[0].passage.id == "parking"
+    assert kb.stats.misses == misses
+    assert kb.stats.hits == 1
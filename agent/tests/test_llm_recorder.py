@@ -0,0 +1,102 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import httpx
+
+from src.llm_recorder import LLMRecorder, install_llm_recorder, parse_response_body
+from src.log_pipeline import bind_log_context
+
+SSE = (
+    b'data: {"choices":[{"delta":{"content":"Table for "}}]}\n\n'
+    b'data: {"choices":[{"delta":{"content":"four?"}}]}\n\n'
+    b'data: {"choices":[],"usage":{"prompt_tokens":12,"completion_tokens":3}}\n\n'
+    b"data: [DONE]\n\n"
+)
+
+
+def _handler(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(
+        200,
+        headers={"x-request-id": "req_1", "x-ratelimit-remaining-tokens": "9000"},
+        stream=httpx.ByteStream(SSE),
+    )
+
+
+def _fake_llm() -> SimpleNamespace:
+    client = httpx.AsyncClient(transport=httpx.MockTransport(_handler), base_url="https://api.test")
+    return SimpleNamespace(_client=SimpleNamespace(_client=client))   # openai.AsyncClient shape
+
+
+async def _chat(client: httpx.AsyncClient, messages: list[dict]) -> str:
+    body = {"model": "m", "stream": True, "messages": messages, "tools": [{"type": "function", "function": {"name": "book"}}]}
+    async with client.stream("POST", "/chat/completions", json=body) as response:
+        return (await response.aread()).decode()
+
+
+def test_parse_response_body_handles_sse_tool_calls_and_json() -> None:
+    sse = (
+        b'data: {"choices":[{"delta":{"tool_calls":[{"index":0,"function":{"name":"book","arguments":"{\\"n\\""}}]}}]}\n'
+        b'data: {"choices":[{"delta":{"tool_calls":[{"index":0,"function":{"arguments":": 4}"}}]}}]}\n'
+    )
+    assert parse_response_body(sse)["tool_calls"] == [{"name": "book", "arguments": '{"n": 4}'}]
+    plain = json.dumps({"choices": [{"message": {"content": "hi"}}], "usage": {"prompt_tokens": 1}}).encode()
+    assert parse_response_body(plain)["content"] == "hi"
+
+
+def test_records_only_new_messages_per_session(tmp_path) -> None:
+    recorder = LLMRecorder(str(tmp_path))
+    llm = _fake_llm()
+    assert install_llm_recorder(llm, recorder) == 1
+    assert install_llm_recorder(llm, recorder) == 1   # idempotent
+    client = llm._client._client
+    assert len(client.event_hooks["request"]) == 1
+
+    turn1 = [{"role": "system", "content": "You are a host."}, {"role": "user", "content": "book a table"}]
+    turn2 = [*turn1, {"role": "assistant", "content": "Table for four?"}, {"role": "user", "content": "yes"}]
+
+    async def session() -> str:
+        bind_log_context(room="room-1", job="AJ_1")
+        await _chat(client, turn1)
+        received = await _chat(client, turn2)
+        await _chat(client, [{"role": "system", "content": "You are a cashier."}])
+        return received
+
+    assert asyncio.run(session()) == SSE.decode()   # the tee doesn't alter what the client reads
+    recorder.flush()
+
+    entries = [json.loads(line) for line in (tmp_path / "room-1-AJ_1.jsonl").read_text().splitlines()]
+    requests = [e for e in entries if e["type"] == "request"]
+    responses = [e for e in entries if e["type"] == "response"]
+
+    assert [(r["message_offset"], len(r["messages"])) for r in requests] == [(0, 2), (2, 2), (0, 1)]
+    assert len({r["id"] for r in requests}) == 3 and requests[0]["job"] == "AJ_1"
+    assert requests[0]["tools"] == ["book"] and requests[0]["params"] == {"stream": True}
+    assert requests[1]["messages"][1] == {"role": "user", "content": "yes"}
+
+    first = next(r for r in responses if r["id"] == requests[0]["id"])
+    assert first["content"] == "Table for four?"
+    assert first["usage"] == {"prompt_tokens": 12, "completion_tokens": 3}
+    assert first["provider_request_id"] == "req_1"
+    assert first["rate_limit"] == {"remaining-tokens": "9000"}
+    assert first["status"] == 200 and not first["truncated"]
+    assert recorder.dropped == 0
+
+
+def test_a_reused_room_gets_its_own_file_and_ids(tmp_path) -> None:
+    client = _fake_llm()._client._client
+    ids = []
+    for job in ("AJ_1", "AJ_2"):
+        recorder = LLMRecorder(str(tmp_path))   # one per worker process
+        client.event_hooks = {"request": [recorder.on_request], "response": [recorder.on_response]}
+
+        async def session(job: str = job) -> None:
+            bind_log_context(room="room-1", job=job)
+            await _chat(client, [{"role": "user", "content": "hi"}])
+
+        asyncio.run(session())
+        recorder.flush()
+        entries = [json.loads(line) for line in (tmp_path / f"room-1-{job}.jsonl").read_text().splitlines()]
+        ids.extend(e["id"] for e in entries if e["type"] == "request")
+
+    assert len(ids) == len(set(ids)) == 2
@@ -0,0 +1,94 @@
+import asyncio
+import json
+import logging
+import queue
+from types import SimpleNamespace
+
+from src.log_pipeline import (
+    JsonFormatter,
+    LazyQueueHandler,
+    SamplingFilter,
+    bind_log_context,
+    parse_sample_rates,
+    start_queue_logging,
+    update_log_context,
+)
+from src.speech_ledger import SPEECH_HANDLE_VAR
+
+
+def _record(category: str | None = None, level: int = logging.INFO) -> logging.LogRecord:
+    record = logging.LogRecord("agent_flow", level, __file__, 1, "msg %s", ("x",), None)
+    if category:
+        record.category = category
+    return record
+
+
+def test_parse_sample_rates() -> None:
+    assert parse_sample_rates("ui_io=0.1, cascade=0.5") == {"ui_io": 0.1, "cascade": 0.5}
+    assert parse_sample_rates(None) == {}
+
+
+def test_sampling_keeps_one_in_n_and_never_drops_warnings() -> None:
+    sampler = SamplingFilter({"ui_io": 0.25, "noise": 0})
+    kept = [sampler.filter(_record("ui_io")) for _ in range(8)]
+    assert kept == [True, False, False, False, True, False, False, False]
+    assert sampler.filter(_record("ui_io", logging.WARNING))
+    assert not sampler.filter(_record("noise"))
+    assert sampler.filter(_record("other")) and sampler.filter(_record())
+    assert sampler.dropped == {"ui_io": 6, "noise": 1}
+
+
+def test_queue_handler_does_not_format_and_counts_overflow() -> None:
+    handler = LazyQueueHandler(queue.Queue(1))
+    record = _record()
+    handler.handle(record)
+    handler.handle(_record())
+    assert record.msg == "msg %s" and record.args == ("x",)
+    assert handler.overflow == 1
+
+
+class _ListHandler(logging.Handler):
+    def __init__(self) -> None:
+        super().__init__()
+        self.lines: list[str] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.lines.append(self.format(record))
+
+
+def test_pipeline_writes_json_with_room_agent_and_turn() -> None:
+    logger = logging.getLogger("test.log_pipeline")
+    logger.setLevel(logging.INFO)
+    sink = _ListHandler()
+    sink.setFormatter(JsonFormatter())
+    listener = start_queue_logging(logger, [sink], {"ui_io": 0.5})
+    assert logger.propagate is False  # the root logger's (IPC) handlers would run on the loop
+
+    async def session() -> None:
+        bind_log_context(room="room-1")
+
+        async def on_enter() -> None:
+            update_log_context(agent="Reservation")  # shared with the session's other tasks
+
+        await asyncio.create_task(on_enter())
+        token = SPEECH_HANDLE_VAR.set(SimpleNamespace(id="speech_1"))
+        try:
+            for i in range(4):
+                logger.info("📥 UI→Agent: %s", {"i": i}, extra={"category": "ui_io"})
+        finally:
+            SPEECH_HANDLE_VAR.reset(token)
+        logger.warning("⚠️ done")
+
+    try:
+        asyncio.run(session())
+    finally:
+        listener.stop()
+        logger.handlers.clear()
+
+    entries = [json.loads(line) for line in sink.lines]
+    assert [e["msg"] for e in entries] == ["📥 UI→Agent: {'i': 0}", "📥 UI→Agent: {'i': 2}", "⚠️ done"]
+    assert entries[0]["room"] == "room-1"
+    assert entries[0]["agent"] == "Reservation"
+    assert entries[0]["turn"] == "speech_1"
+    assert entries[0]["category"] == "ui_io"
+    assert entries[2]["turn"] is None
@@ -0,0 +1,61 @@
+import asyncio
+import time
+
+from src.log_pipeline import bind_log_context, update_log_context
+from src.loop_monitor import LoopMonitor
+
+
+def _blocking_json_decode() -> None:
+    time.sleep(0.08)   # stands in for a synchronous decode / file write on the loop
+
+
+def test_slow_callback_is_attributed_to_its_session_with_stack() -> None:
+    monitor = LoopMonitor(slow_callback_ms=20, sample_seconds=0.01)
+
+    async def session(room: str, block: bool) -> None:
+        bind_log_context(room=room)
+        update_log_context(agent="Reservation")
+        await asyncio.sleep(0.03)
+        if block:
+            _blocking_json_decode()
+        await asyncio.sleep(0.03)
+
+    async def main() -> None:
+        monitor.start()
+        monitor.start()   # idempotent
+        try:
+            await asyncio.gather(session("room-1", True), session("room-2", False))
+        finally:
+            monitor.stop()
+
+    asyncio.run(main())
+
+    assert len(monitor.recent) == 1
+    stall = monitor.recent[0]
+    assert stall.room == "room-1" and stall.agent == "Reservation"
+    assert stall.duration_ms >= 80
+    assert "session" in stall.callback
+    assert any("_blocking_json_decode" in line for line in stall.stack)
+
+    summary = monitor.session_summary("room-1")
+    assert summary["slow_callbacks"] == 1 and summary["blocked_ms"] >= 80
+    assert monitor.session_summary("room-2")["slow_callbacks"] == 0
+    # The sampler woke up late at least once while the loop was blocked
+    assert monitor.lag.count > 0 and summary["process_lag_ms"]["p99"] >= 20
+
+    prom = monitor.to_prometheus()
+    assert 'event_loop_slow_callbacks_total{agent="Reservation"} 1' in prom
+    assert "event_loop_lag_ms_count" in prom
+
+
+def test_stop_restores_the_loop() -> None:
+    original = asyncio.Handle._run
+
+    async def main() -> None:
+        monitor = LoopMonitor()
+        monitor.start()
+        assert asyncio.Handle._run is not original
+        monitor.stop()
+
+    asyncio.run(main())
+    assert asyncio.Handle._run is original
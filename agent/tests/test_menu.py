@@ -0,0 +1,48 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from src.dataclass import OrderFormData, OrderItem
+from src.menu import MenuCatalog, phonetic_key
+
+QUERIES = json.loads((Path(__file__).parent / "data" / "menu_queries.json").read_text())
+
+
+@pytest.fixture(scope="module")
+def menu() -> MenuCatalog:
+    return MenuCatalog()
+
+
+@pytest.mark.parametrize("case", QUERIES, ids=lambda c: c["query"])
+def test_search_resolves_misheard_dishes(menu: MenuCatalog, case: dict) -> None:
+    matches = menu.search(case["query"])
+    top = matches[0].item.name if matches else None
+    assert top == case["expected"]
+
+
+def test_phonetic_key_groups_sounds_alike_spellings() -> None:
+    assert phonetic_key("pepperoni") == phonetic_key("pepperony")
+    assert phonetic_key("caesar") == phonetic_key("seezer")
+    assert phonetic_key("spaghetti") == phonetic_key("spagetti")
+
+
+def test_category_query_returns_every_item_in_it(menu: MenuCatalog) -> None:
+    names = {m.item.name for m in menu.search("desserts", k=5)}
+    assert names == {"Tiramisu", "Chocolate Lava Cake"}
+
+
+def test_search_can_be_limited_to_cart_items(menu: MenuCatalog) -> None:
+    matches = menu.search("pizza", item_ids={2})
+    assert [m.item.name for m in matches] == ["Pepperoni Pizza"]
+
+
+def test_remove_item_decrements_quantity_before_dropping_line() -> None:
+    order = OrderFormData()
+    order.add_item(OrderItem(id=9, name="Tiramisu", price=6.99, quantity=3))
+
+    order.remove_item(9, quantity=2)
+    assert order.total_items == 1
+
+    order.remove_item(9, quantity=2)
+    assert order.items == [] and order.total_price == 0
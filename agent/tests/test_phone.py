@@ -0,0 +1,28 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from src.phone import normalize_phone
+
+CORPUS = json.loads((Path(__file__).parent / "data" / "phone_corpus.json").read_text())
+
+
+@pytest.mark.parametrize("case", CORPUS, ids=lambda c: c["text"] or "<empty>")
+def test_normalize_phone_corpus(case: dict) -> None:
+    result = normalize_phone(case["text"])
+    assert (result.digits if result.ok else None) == case["expected"]
+
+
+def test_homophones_lower_confidence() -> None:
+    clean = normalize_phone("nine eight seven six five four three two one zero")
+    misheard = normalize_phone("nine eight seven six five for three two one zero")
+    assert clean.confidence == 1.0
+    assert misheard.digits == clean.digits
+    assert misheard.confidence < clean.confidence
+    assert misheard.ok and misheard.needs_confirmation
+    assert not clean.needs_confirmation
+
+
+def test_country_code_is_reported() -> None:
+    assert normalize_phone("+91 98765 43210").country_code == "91"
@@ -0,0 +1,68 @@
+import asyncio
+import os
+import time
+from pathlib import Path
+
+from src.log_pipeline import bind_log_context, update_log_context
+from src.loop_monitor import LoopMonitor
+from src.profiler import Profiler
+
+
+def _build_context_window() -> list[str]:
+    end = time.perf_counter() + 0.02
+    chunks = []
+    while time.perf_counter() < end:
+        chunks.append("x" * 256)
+    return chunks
+
+
+async def _busy_session(seconds: float) -> None:
+    bind_log_context(room="room-1")
+    update_log_context(agent="Reservation")
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        _build_context_window()
+        await asyncio.sleep(0.005)
+
+
+def test_capture_tags_loop_samples_with_room_and_agent(tmp_path) -> None:
+    monitor = LoopMonitor(slow_callback_ms=1000)
+    profiler = Profiler(str(tmp_path), interval_ms=2, loop_monitor=monitor)
+
+    async def main() -> tuple[str, str] | None:
+        monitor.start()
+        try:
+            session = asyncio.create_task(_busy_session(0.6))
+            await asyncio.sleep(0.05)
+            paths, busy = await asyncio.gather(profiler.capture(0.4), profiler.capture(0.4))
+            assert busy is None   # one capture at a time
+            await session
+            return paths
+        finally:
+            monitor.stop()
+
+    folded_path, alloc_path = asyncio.run(main())
+    lines = Path(folded_path).read_text().splitlines()
+    loop_stacks = [line for line in lines if line.startswith("event_loop;room=room-1;agent=Reservation;")]
+    assert any("_build_context_window" in line for line in loop_stacks)
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+    assert "KiB in" in Path(alloc_path).read_text()
+
+
+def test_control_socket_triggers_a_capture(tmp_path) -> None:
+    profiler = Profiler(str(tmp_path), interval_ms=2)
+
+    async def main() -> str:
+        await profiler.install()
+        try:
+            reader, writer = await asyncio.open_unix_connection(os.path.join(tmp_path, f"{os.getpid()}.sock"))
+            writer.write(b"0.2\n")
+            await writer.drain()
+            return (await reader.read()).decode()
+        finally:
+            await profiler.aclose()
+
+    reply = asyncio.run(main())
+    folded_path, alloc_path = reply.split()
+    assert folded_path.endswith(".folded") and os.path.exists(folded_path)
+    assert alloc_path.endswith(".alloc.txt") and os.path.exists(alloc_path)
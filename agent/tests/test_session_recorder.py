@@ -0,0 +1,96 @@
+import json
+from pathlib import Path
+
+from src.dataclass import BOOKING_FORM_ID
+from src.harness import Reply, ScriptedLLM, SessionHarness, tool_returned, user_said
+from src.jsonl_stream import GzipJsonlWriter
+from src.session_recorder import SessionRecorder, load_recording, recorder_for, turn_latencies
+from src.session_replay import RecordedLLM, replay
+
+
+def _booking_llm() -> ScriptedLLM:
+    return ScriptedLLM([
+        (user_said("book a table"), Reply(tool_calls=[("to_reservation", {})])),
+        (tool_returned("to_reservation"), Reply("Let me hand you over.")),
+        (user_said("priya"), Reply(tool_calls=[("save_booking_fields", {"customer_name": "Priya Sharma", "no_of_guests": 4})])),
+        (tool_returned("save_booking_fields"), Reply("Thanks Priya, what date?")),
+    ], default=Reply("Welcome!"))
+
+
+async def _record(tmp_path) -> str:
+    h = SessionHarness(_booking_llm(), debounce_seconds=0.02)
+    recorder = SessionRecorder(h.room.name)
+    recorder.attach(h.session, h.room)
+    async with h:
+        await h.wait_for(lambda: h.llm.calls)
+        await h.say("I want to book a table")
+        h.room.send_ui("FORM_UPDATE", {"formId": BOOKING_FORM_ID, "values": {"special_requests": "window seat"}})
+        await h.say("I'm Priya, we are four")
+        await h.wait_for(lambda: h.room.messages("FORM_PREFILL"))
+    assert recorder_for(h.room.name) is recorder
+    return await recorder.save(str(tmp_path))
+
+
+async def test_records_timeline_with_agents_tools_and_ui(tmp_path) -> None:
+    path = await _record(tmp_path)
+    lines = [json.loads(line) for line in Path(path).read_text(encoding="utf-8").splitlines()]
+    assert lines[0]["kind"] == "header" and lines[0]["start_agent"] == "greeter"
+    assert lines[-1] == {"kind": "footer", "events": len(lines) - 2, "dropped": 0}
+    assert recorder_for("test-room") is None   # save() unregisters
+
+    recording = load_recording(path)
+    assert [e["text"] for e in recording.of("user")] == ["I want to book a table", "I'm Priya, we are four"]
+    [handoff, save] = recording.of("tools")
+    assert handoff["agent"] == "Greeter" and handoff["calls"][0]["name"] == "to_reservation"
+    assert save["agent"] == "Reservation" and save["calls"][0]["arguments"] == {"customer_name": "Priya Sharma", "no_of_guests": 4}
+    assert [e["type"] for e in recording.of("ui_in")] == ["FORM_UPDATE"]
+    assert {"NAVIGATE_PAGE", "FORM_PREFILL"} <= {e["type"] for e in recording.of("ui_out")}
+    times = [e["t"] for e in recording.events]
+    assert times == sorted(times)
+    assert all(t["reply_ms"] is not None for t in turn_latencies(recording.events))
+
+
+def test_event_cap_counts_overflow() -> None:
+    recorder = SessionRecorder("room", max_events=2)
+    for i in range(5):
+        recorder.record("ui_out", type="X", payload={"i": i})
+    assert len(recorder.events) == 2 and recorder.dropped == 3
+
+
+async def test_replay_reproduces_tools_handoff_and_ui(tmp_path) -> None:
+    recording = load_recording(await _record(tmp_path))
+
+    replayed = await replay(recording, speed=0, debounce_seconds=0.02)
+
+    def calls(events: list[dict]) -> list[tuple]:
+        return [(e["agent"], c["name"], json.dumps(c["arguments"])) for e in events if e["kind"] == "tools" for c in e["calls"]]
+
+    assert calls(replayed.events) == calls(recording.events)
+    assert [e["type"] for e in replayed.events if e["kind"] == "ui_in"] == ["FORM_UPDATE"]
+    assert [e["type"] for e in replayed.events if e["kind"] == "ui_out"] == [e["type"] for e in recording.of("ui_out")]
+    assert [e["text"] for e in replayed.events if e["kind"] == "agent"] == [e["text"] for e in recording.of("agent")]
+
+
+async def test_recorded_llm_never_answers_ahead_of_the_turn(tmp_path) -> None:
+    recording = load_recording(await _record(tmp_path))
+    llm_ = RecordedLLM(recording)
+    first = next(o for o in llm_.outputs if o.turn == 1)
+    assert first.agent == "Greeter" and first.reply.tool_calls == [("to_reservation", {})]
+    assert [o.turn for o in llm_.outputs] == sorted(o.turn for o in llm_.outputs)
+
+
+async def test_streamed_recording_keeps_no_events_in_memory(tmp_path) -> None:
+    path = str(tmp_path / "room.jsonl.gz")
+    h = SessionHarness(_booking_llm())
+    recorder = SessionRecorder(h.room.name, stream=GzipJsonlWriter(path))
+    recorder.attach(h.session, h.room)
+    async with h:
+        await h.wait_for(lambda: h.llm.calls)
+        await h.say("I want to book a table")
+    await recorder.aclose()
+
+    assert recorder.events == [] and recorder.count > 0
+    recording = load_recording(path)
+    assert recording.header["room"] == h.room.name
+    assert len(recording.events) == recorder.count
+    assert [e["text"] for e in recording.of("user")] == ["I want to book a table"]
@@ -0,0 +1,142 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from src.agents.order_food import OrderFood
+from src.agents.reservation import Reservation
+from src.dataclass import UserData
+from src.menu import MenuCatalog
+from src.session_state import PrefillBatcher, StateLock
+
+
+class FakeParticipant:
+    def __init__(self) -> None:
+        self.published: list[dict] = []
+
+    async def publish_data(self, payload: bytes, topic: str, destination_identities: list) -> None:
+        await asyncio.sleep(0)  # a real publish yields to the event loop
+        self.published.append(json.loads(payload))
+
+
+class GatedParticipant(FakeParticipant):
+    """publish_data blocks until the test opens the gate — a send stuck in flight."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.gate = asyncio.Event()
+
+    async def publish_data(self, payload: bytes, topic: str, destination_identities: list) -> None:
+        await self.gate.wait()
+        self.published.append(json.loads(payload))
+
+
+def _session(monkeypatch, agent_cls, userdata: UserData) -> FakeParticipant:
+    participant = FakeParticipant()
+    userdata.job_ctx = SimpleNamespace(room=SimpleNamespace(name="room-1", local_participant=participant))
+    monkeypatch.setattr(agent_cls, "session", property(lambda self: SimpleNamespace(userdata=userdata)))
+    return participant
+
+
+def test_state_lock_is_reentrant_and_serializes_tasks() -> None:
+    lock = StateLock()
+    events: list[str] = []
+
+    async def worker(name: str) -> None:
+        async with lock:
+            events.append(f"{name}-start")
+            async with lock:  # nested helper
+                await asyncio.sleep(0.01)
+            events.append(f"{name}-end")
+
+    async def main() -> None:
+        await asyncio.gather(worker("a"), worker("b"))
+
+    asyncio.run(main())
+    assert events == ["a-start", "a-end", "b-start", "b-end"]
+
+
+def test_parallel_saves_are_merged_into_one_form_prefill(monkeypatch) -> None:
+    userdata = UserData()
+    participant = _session(monkeypatch, Reservation, userdata)
+    agent = Reservation(None)
+
+    async def main() -> list:
+        results = await asyncio.gather(
+            agent.save_booking_fields(customer_name="Priya Sharma", customer_phone="98765 43210"),
+            agent.save_booking_fields(no_of_guests=4, special_requests="window seat"),
+            agent.save_customer_name("Priya"),
+        )
+        await userdata.prefills.flush()
+        return results
+
+    results = asyncio.run(main())
+
+    assert [json.loads(r)["status"] for r in results] == ["ok", "ok", "ok"]
+    prefills = [m for m in participant.published if m["type"] == "FORM_PREFILL"]
+    assert len(prefills) == 1
+    values = prefills[0]["payload"]["values"]
+    assert values == {
+        "customer_name": "Priya",
+        "customer_phone": "9876543210",
+        "no_of_guests": 4,
+        "special_requests": "window seat",
+    }
+    assert userdata.booking.customer_name == "Priya"
+
+
+@pytest.mark.parametrize("rounds", [5])
+def test_parallel_cart_updates_keep_every_item(monkeypatch, rounds: int) -> None:
+    userdata = UserData(menu=MenuCatalog())
+    participant = _session(monkeypatch, OrderFood, userdata)
+    agent = OrderFood(None)
+
+    async def main() -> None:
+        await asyncio.gather(*(agent.add_to_cart(item="tiramisu") for _ in range(rounds)),
+                             agent.add_to_cart(item="grilled salmon", quantity=2))
+        await userdata.prefills.flush()
+
+    asyncio.run(main())
+
+    assert userdata.order.total_items == rounds + 2
+    prefills = [m for m in participant.published if m["type"] == "FORM_PREFILL"]
+    assert len(prefills) == 1
+    assert prefills[0]["payload"]["values"]["total_items"] == rounds + 2
+
+
+def test_weak_match_is_confirmed_before_changing_the_cart(monkeypatch) -> None:
+    userdata = UserData(menu=MenuCatalog())
+    _session(monkeypatch, OrderFood, userdata)
+    agent = OrderFood(None)
+
+    async def main() -> tuple[dict, dict]:
+        unsure = json.loads(await agent.add_to_cart(item="coke"))  # only sounds like Chocolate Lava Cake
+        confirmed = json.loads(await agent.add_to_cart(item=str(unsure["options"][0]["id"])))
+        return unsure, confirmed
+
+    unsure, confirmed = asyncio.run(main())
+
+    assert unsure["status"] == "confirm"
+    assert unsure["options"][0]["name"] == "Chocolate Lava Cake"
+    assert confirmed["status"] == "added"
+    assert userdata.order.total_items == 1
+
+
+def test_prefill_queued_during_an_inflight_send_is_not_lost() -> None:
+    participant = GatedParticipant()
+    job_ctx = SimpleNamespace(room=SimpleNamespace(name="room-1", local_participant=participant))
+    batcher = PrefillBatcher(delay=0.01)
+
+    async def main() -> None:
+        batcher.queue(job_ctx, "booking", {"customer_name": "Priya"})
+        await asyncio.sleep(0.05)  # debounce over, first send now waits on the gate
+        batcher.queue(job_ctx, "booking", {"no_of_guests": 4})
+        await asyncio.sleep(0.05)
+        participant.gate.set()
+        await batcher.flush()
+
+    asyncio.run(main())
+
+    values = [m["payload"]["values"] for m in participant.published]
+    assert values == [{"customer_name": "Priya"}, {"no_of_guests": 4}]
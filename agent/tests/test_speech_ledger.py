@@ -0,0 +1,106 @@
+from types import SimpleNamespace
+
+from livekit.agents.llm import ChatMessage
+from livekit.agents.metrics import LLMMetrics, TTSMetrics
+
+from src.speech_ledger import AGENT_SWITCH, BARGE_IN, UI_UPDATE, SpeechLedger
+
+
+class FakeHandle:
+    def __init__(self, speech_id: str) -> None:
+        self.id = speech_id
+        self.interrupted = False
+        self.chat_items: list = []
+        self._callbacks: list = []
+
+    def add_done_callback(self, callback) -> None:
+        self._callbacks.append(callback)
+
+    def finish(self, heard: str, interrupted: bool = False) -> None:
+        self.interrupted = interrupted
+        self.chat_items = [ChatMessage(role="assistant", content=[heard], interrupted=interrupted)]
+        for callback in self._callbacks:
+            callback(self)
+
+
+def _llm(speech_id: str, prompt: int, completion: int) -> SimpleNamespace:
+    metrics = LLMMetrics(
+        label="llm", request_id="r", timestamp=0.0, duration=1.0, ttft=0.1, cancelled=False,
+        completion_tokens=completion, prompt_tokens=prompt, prompt_cached_tokens=0,
+        total_tokens=prompt + completion, tokens_per_second=0.0, speech_id=speech_id,
+    )
+    return SimpleNamespace(metrics=metrics)
+
+
+def _tts(speech_id: str, audio: float) -> SimpleNamespace:
+    metrics = TTSMetrics(
+        label="tts", request_id="r", timestamp=0.0, ttfb=0.1, duration=1.0, audio_duration=audio,
+        cancelled=False, characters_count=0, streamed=True, speech_id=speech_id,
+    )
+    return SimpleNamespace(metrics=metrics)
+
+
+def _speak(ledger: SpeechLedger, speech_id: str, text: str) -> FakeHandle:
+    handle = FakeHandle(speech_id)
+    ledger.on_speech_created(SimpleNamespace(speech_handle=handle))
+    record = ledger.get(speech_id)
+    record.llm_text = text
+    record.tts_chars = len(text)
+    return handle
+
+
+def test_delivered_reply_counts_all_work_as_delivered() -> None:
+    ledger = SpeechLedger()
+    ledger.current_agent = "Greeter"
+    handle = _speak(ledger, "s1", "Welcome to Terra!")
+    ledger.on_metrics_collected(_llm("s1", 100, 5))
+    ledger.on_metrics_collected(_tts("s1", 1.5))
+    handle.finish("Welcome to Terra!")
+
+    summary = ledger.summary("Greeter")
+    assert summary["delivered"] == {"speeches": 1, "llm_tokens": 105, "tts_chars": 17, "audio_seconds": 1.5}
+    assert summary["discarded"] == {}
+    assert summary["discarded_token_share"] == 0.0
+
+
+def test_interrupted_reply_is_split_by_the_share_heard() -> None:
+    ledger = SpeechLedger()
+    ledger.current_agent = "Reservation"
+    handle = _speak(ledger, "s1", "Could I get your phone number?")   # 30 chars
+    ledger.on_metrics_collected(_llm("s1", 90, 10))
+    ledger.on_metrics_collected(_tts("s1", 2.0))
+    ledger.claim_interrupt(UI_UPDATE)
+    handle.finish("Could I get your", interrupted=True)               # 16 chars heard
+
+    summary = ledger.summary("Reservation")
+    assert summary["delivered"]["llm_tokens"] == 53
+    assert summary["discarded"][UI_UPDATE] == {"speeches": 1, "llm_tokens": 47, "tts_chars": 14, "audio_seconds": 0.933}
+
+
+def test_unclaimed_interrupt_is_barge_in_and_claims_only_hit_open_replies() -> None:
+    ledger = SpeechLedger()
+    ledger.current_agent = "OrderFood"
+    done = _speak(ledger, "s1", "Added a pizza.")
+    done.finish("Added a pizza.")
+    barged = _speak(ledger, "s2", "Anything else?")
+    barged.finish("", interrupted=True)
+    ledger.claim_interrupt(AGENT_SWITCH)
+    switched = _speak(ledger, "s3", "Our desserts are")
+    ledger.claim_interrupt(AGENT_SWITCH)
+    switched.finish("Our", interrupted=True)
+
+    discarded = ledger.summary("OrderFood")["discarded"]
+    assert discarded[BARGE_IN]["speeches"] == 1
+    assert discarded[AGENT_SWITCH]["speeches"] == 1
+    assert ledger.get("s1").cause is None
+
+
+def test_late_llm_metrics_replace_the_token_estimate() -> None:
+    ledger = SpeechLedger()
+    handle = _speak(ledger, "s1", "x" * 40)   # estimated 10 completion tokens
+    handle.finish("x" * 20, interrupted=True)
+    ledger.on_metrics_collected(_llm("s1", 100, 12))
+
+    summary = ledger.summary("unknown")
+    total = summary["delivered"]["llm_tokens"] + summary["discarded"][BARGE_IN]["llm_tokens"]
+    assert total == 112
@@ -0,0 +1,77 @@
+from datetime import datetime
+
+import pytest
+
+from src.availability import TableAvailability
+from src.table_search import TableSearch
+
+TABLES = [
+    {"id": 1, "seats": 2, "row": "window"},
+    {"id": 2, "seats": 2, "row": "window"},
+    {"id": 3, "seats": 4, "row": "classic"},
+    {"id": 4, "seats": 4, "row": "classic"},
+    {"id": 5, "seats": 4, "row": "classic"},
+    {"id": 6, "seats": 8, "row": "banquet"},
+]
+
+DAY = "2026-10-20"
+DAY_BEFORE = datetime(2026, 10, 19, 12, 0)
+
+
+@pytest.fixture
+def search(tmp_path) -> TableSearch:
+    availability = TableAvailability(str(tmp_path / "r.db"), tables=TABLES, slot_minutes=90)
+    yield TableSearch(availability, tables=TABLES, max_guests=12, step_minutes=30)
+    availability.close()
+
+
+def _hold(search: TableSearch, table_id: int, reservation_time: str) -> None:
+    start, end = search.availability.slot_bounds(DAY, reservation_time)
+    search.availability.hold(table_id, start, end, owner="other-room")
+
+
+def test_best_fit_prefers_smallest_single_table(search: TableSearch) -> None:
+    assert search.best_fit(DAY, "20:00", 2).table_ids == (1,)
+    assert search.best_fit(DAY, "20:00", 3).table_ids == (3,)
+    assert search.best_fit(DAY, "20:00", 7).table_ids == (6,)
+
+
+def test_best_fit_joins_adjacent_tables_for_large_party(search: TableSearch) -> None:
+    group = search.best_fit(DAY, "20:00", 12)
+    assert group.table_ids == (3, 4, 5)
+    assert group.seats == 12
+
+
+def test_best_fit_skips_taken_tables(search: TableSearch) -> None:
+    _hold(search, 6, "20:00")
+    assert search.best_fit(DAY, "20:00", 7).table_ids == (3, 4)
+
+
+def test_group_for_rejects_non_adjacent_tables(search: TableSearch) -> None:
+    assert search.group_for([4, 3]).seats == 8
+    assert search.group_for([3, 5]) is None
+    assert search.group_for([2, 3]) is None  # different rows
+
+
+def test_nearest_slots_walk_outwards_and_follow_new_holds(search: TableSearch) -> None:
+    # Warm the day grid first so the holds below are applied incrementally
+    assert search.nearest_slots(DAY, "20:00", 8, k=1, now=DAY_BEFORE)[0].reservation_time == "20:00"
+
+    _hold(search, 6, "20:00")
+    for table_id in (3, 4, 5):
+        _hold(search, table_id, "20:00")
+
+    suggestions = search.nearest_slots(DAY, "20:00", 8, k=3, now=DAY_BEFORE)
+    times = [s.reservation_time for s in suggestions]
+    # 90 min slots: anything starting before 21:30 or after 18:30 overlaps 20:00
+    assert times == ["18:30", "18:00", "17:30"]
+    assert suggestions[0].group.table_ids == (6,)
+
+
+def test_nearest_slots_skip_slots_that_already_started(search: TableSearch) -> None:
+    for table_id in (3, 4, 5, 6):
+        _hold(search, table_id, "20:30")  # blocks every start from 19:30 on
+
+    suggestions = search.nearest_slots(DAY, "20:00", 8, k=3, now=datetime(2026, 10, 20, 18, 42))
+    # 18:30 and 18:00 would fit too, but they have already passed
+    assert [s.reservation_time for s in suggestions] == ["19:00"]
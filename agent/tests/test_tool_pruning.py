@@ -0,0 +1,35 @@
+from src.agents.reservation import Reservation
+from src.dataclass import UserData
+
+
+def _active(agent: Reservation, userdata: UserData) -> set[str]:
+    agent._userdata = userdata
+    return {t.info.name for t in agent._prune_tools(agent.tools)}
+
+
+def test_fresh_booking_hides_table_and_confirm_tools() -> None:
+    active = _active(Reservation(None), UserData())
+    assert "save_booking_fields" in active
+    assert "save_customer_name" in active
+    assert not active & {"find_table", "hold_table", "confirm_reservation"}
+
+
+def test_collected_fields_drop_their_save_tools_and_report_savings() -> None:
+    agent = Reservation(None)
+    userdata = UserData()
+    userdata.booking.update({
+        "customer_name": "Priya",
+        "customer_phone": "9876543210",
+        "no_of_guests": 4,
+        "reservation_date": "2026-10-20",
+        "reservation_time": "20:00",
+        "special_requests": "none",
+    })
+
+    active = _active(agent, userdata)
+
+    assert "save_customer_name" not in active
+    assert "get_todays_date_n_time" not in active
+    assert {"find_table", "check_data_collection_complete"} <= active
+    assert "confirm_reservation" not in active  # table not chosen yet
+    assert agent._tool_tokens_saved > 0
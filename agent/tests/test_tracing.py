@@ -0,0 +1,132 @@
+import asyncio
+from types import SimpleNamespace
+
+from livekit.agents.llm import FunctionCall, FunctionCallOutput
+from livekit.agents.metrics import EOUMetrics, LLMMetrics, TTSMetrics
+from livekit.agents.metrics.base import Metadata
+
+from src.fn import send_to_ui
+from src.speech_ledger import SPEECH_HANDLE_VAR
+from src.tracing import LatencyHistograms, RollingHistogram, TurnTracer
+
+GROQ = Metadata(model_name="llama-3.3-70b-versatile", model_provider="groq")
+DEEPGRAM = Metadata(model_name="aura-2-thalia-en", model_provider="deepgram")
+
+
+class FakeHandle:
+    def __init__(self, speech_id: str) -> None:
+        self.id = speech_id
+        self._callbacks: list = []
+
+    def add_done_callback(self, callback) -> None:
+        self._callbacks.append(callback)
+
+    def finish(self) -> None:
+        for callback in self._callbacks:
+            callback(self)
+
+
+def _ev(metrics) -> SimpleNamespace:
+    return SimpleNamespace(metrics=metrics)
+
+
+def _user_turn(tracer: TurnTracer, speech_id: str, ttft: float) -> FakeHandle:
+    handle = FakeHandle(speech_id)
+    tracer.on_speech_created(SimpleNamespace(speech_handle=handle))
+    tracer.on_metrics_collected(_ev(EOUMetrics(
+        timestamp=0.0, end_of_utterance_delay=0.5, transcription_delay=0.2,
+        on_user_turn_completed_delay=0.01, speech_id=speech_id,
+    )))
+    tracer.on_metrics_collected(_ev(LLMMetrics(
+        label="llm", request_id="r", timestamp=0.0, duration=1.0, ttft=ttft, cancelled=False,
+        completion_tokens=10, prompt_tokens=100, prompt_cached_tokens=0, total_tokens=110,
+        tokens_per_second=10.0, speech_id=speech_id, metadata=GROQ,
+    )))
+    tracer.on_metrics_collected(_ev(TTSMetrics(
+        label="tts", request_id="r", timestamp=0.0, ttfb=0.15, duration=1.0, audio_duration=2.0,
+        cancelled=False, characters_count=20, streamed=True, speech_id=speech_id, metadata=DEEPGRAM,
+    )))
+    return handle
+
+
+def test_turn_span_tree_and_response_time() -> None:
+    histograms = LatencyHistograms()
+    tracer = TurnTracer(histograms, agent_name=lambda: "Reservation")
+    handle = _user_turn(tracer, "s1", ttft=0.3)
+
+    turn = tracer._turns["s1"]
+    assert [s.name for s in turn.spans] == ["eou_delay", "stt_final", "on_user_turn_completed", "llm_ttft", "tts_ttfb"]
+    assert turn.spans[3].attrs == {"provider": "groq", "model": "llama-3.3-70b-versatile"}
+    assert turn.response_ms() == 950.0
+
+    handle.finish()
+    snapshot = histograms.snapshot()
+    assert "s1" not in tracer._turns
+    assert snapshot["response/Reservation"]["p50"] == 950.0
+    assert snapshot["llm_ttft/Reservation/groq"]["count"] == 1
+
+
+def test_metrics_after_finish_do_not_open_an_orphan_turn() -> None:
+    histograms = LatencyHistograms()
+    tracer = TurnTracer(histograms, agent_name=lambda: "Reservation")
+    _user_turn(tracer, "s1", ttft=0.3).finish()
+
+    tracer.on_metrics_collected(_ev(TTSMetrics(
+        label="tts", request_id="r", timestamp=0.0, ttfb=0.2, duration=1.0, audio_duration=2.0,
+        cancelled=True, characters_count=20, streamed=True, speech_id="s1", metadata=DEEPGRAM,
+    )))
+    assert "s1" not in tracer._turns
+    assert histograms.snapshot()["tts_ttfb/Reservation/deepgram"]["count"] == 2
+
+
+def test_agent_initiated_turn_has_no_response_time() -> None:
+    tracer = TurnTracer(LatencyHistograms(), agent_name=lambda: "Greeter")
+    tracer.add_span("s1", "llm_ttft", 300.0, "groq")
+    assert tracer._turns["s1"].response_ms() is None
+
+
+def test_tool_spans_use_call_and_output_timestamps() -> None:
+    tracer = TurnTracer(LatencyHistograms(), agent_name=lambda: "Reservation")
+    call = FunctionCall(call_id="c1", name="find_table", arguments="{}", created_at=10.0)
+    output = FunctionCallOutput(call_id="c1", name="find_table", output="{}", is_error=False, created_at=10.25)
+
+    token = SPEECH_HANDLE_VAR.set(SimpleNamespace(id="s1"))
+    try:
+        tracer.on_function_tools_executed(SimpleNamespace(function_calls=[call], function_call_outputs=[output]))
+    finally:
+        SPEECH_HANDLE_VAR.reset(token)
+
+    span = tracer._turns["s1"].spans[0]
+    assert (span.name, span.duration_ms, span.attrs) == ("tool", 250.0, {"tool": "find_table"})
+
+
+def test_send_to_ui_records_publish_span() -> None:
+    histograms = LatencyHistograms()
+    tracer = TurnTracer(histograms, room="room-trace", agent_name=lambda: "OrderFood")
+
+    async def publish_data(payload, topic, destination_identities) -> None:
+        await asyncio.sleep(0)
+
+    ctx = SimpleNamespace(room=SimpleNamespace(name="room-trace", local_participant=SimpleNamespace(publish_data=publish_data)))
+    try:
+        asyncio.run(send_to_ui(ctx, "FORM_PREFILL", {"formId": "order", "values": {}}))
+    finally:
+        tracer.close()
+
+    assert histograms.snapshot()["publish/session"]["count"] == 1
+
+
+def test_percentiles_and_prometheus_export(tmp_path) -> None:
+    histogram = RollingHistogram(window=100)
+    for value in range(1, 101):
+        histogram.observe(float(value))
+    assert (histogram.percentile(0.5), histogram.percentile(0.95), histogram.percentile(0.99)) == (50.0, 95.0, 99.0)
+
+    histograms = LatencyHistograms()
+    histograms.observe("tts_ttfb", "Greeter", "deepgram", 120.0)
+    path = tmp_path / "latency.prom"
+    histograms.write_prometheus(str(path))
+    text = path.read_text()
+    assert "# TYPE voice_turn_span_ms summary" in text
+    assert 'voice_turn_span_ms{span="tts_ttfb",agent="Greeter",provider="deepgram",quantile="0.95"} 120.0' in text
+    assert 'voice_turn_span_ms_count{span="tts_ttfb",agent="Greeter",provider="deepgram"} 1' in text
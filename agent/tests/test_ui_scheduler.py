@@ -0,0 +1,147 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from src.agents.reservation import Reservation
+from src.dataclass import UserData
+from src.speech_ledger import SPEECH_HANDLE_VAR, SpeechLedger, active_speech_id
+from src.ui_scheduler import DEFER, INTERRUPT, REPLY_NOW, UIUpdate, decide, fields_mentioned
+
+PHONE = UIUpdate("User updated form 'booking' with values: {'customer_phone': '98765 43210'}", frozenset({"customer_phone"}))
+
+
+@pytest.mark.parametrize(
+    "updates, state, speech, action",
+    [
+        ([PHONE], "listening", "", REPLY_NOW),
+        ([PHONE], "idle", "", REPLY_NOW),
+        ([PHONE], "speaking", "We have a lovely table by the window.", DEFER),
+        ([PHONE], "speaking", "Could I get your phone number, please?", INTERRUPT),
+        ([PHONE], "thinking", "", DEFER),
+        ([UIUpdate("submitted", urgent=True)], "speaking", "Anything else?", INTERRUPT),
+        ([UIUpdate("User navigated to page: home")], "speaking", "Your table is booked.", DEFER),
+    ],
+)
+def test_decide(updates, state, speech, action) -> None:
+    assert decide(updates, state, speech).action == action
+
+
+def test_fields_mentioned() -> None:
+    assert fields_mentioned("How many guests, and at what time?") == {"no_of_guests", "reservation_time"}
+    assert fields_mentioned("Hello there!") == set()
+    assert fields_mentioned("What number of guests should I put down?") == {"no_of_guests"}
+    assert fields_mentioned("Could I get your number, please?") == {"customer_phone"}
+    assert fields_mentioned("And your phone number?") == {"customer_phone"}
+
+
+def test_speech_ledger_is_bounded() -> None:
+    ledger = SpeechLedger(max_records=2)
+    for i in range(3):
+        ledger.track(f"speech_{i}", "Greeter")
+    assert ledger.get("speech_0") is None
+    assert ledger.get("speech_2").agent == "Greeter"
+    assert ledger.get(None) is None
+
+
+class _Stream:
+    def __init__(self, chunks: list[str]) -> None:
+        self._chunks = iter(chunks)
+        self.closed = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> str:
+        try:
+            return next(self._chunks)
+        except StopIteration as err:
+            raise StopAsyncIteration from err
+
+    async def aclose(self) -> None:
+        self.closed = True
+
+
+def test_llm_and_tts_output_is_attributed_to_the_active_speech() -> None:
+    agent = Reservation(None)
+    agent._userdata = UserData()
+    stream = _Stream(["Could I get ", "your phone number?"])
+
+    async def text():
+        yield "Could I get your phone number?"
+
+    async def main() -> None:
+        token = SPEECH_HANDLE_VAR.set(SimpleNamespace(id="speech_1"))
+        try:
+            assert active_speech_id() == "speech_1"
+            assert [c async for c in agent._track_llm_text(stream)] == ["Could I get ", "your phone number?"]
+            assert [c async for c in agent._track_tts_text(text())] == ["Could I get your phone number?"]
+        finally:
+            SPEECH_HANDLE_VAR.reset(token)
+
+    asyncio.run(main())
+
+    record = agent._userdata.speech_ledger.get("speech_1")
+    assert record.llm_text == "Could I get your phone number?"
+    assert record.tts_chars == 30
+    assert record.llm_tokens == 8
+    assert stream.closed
+
+
+class FakeSession:
+    def __init__(self, userdata: UserData, agent_state: str, speech) -> None:
+        self.userdata = userdata
+        self.agent_state = agent_state
+        self.user_state = "listening"
+        self.current_speech = speech
+        self.calls: list[str] = []
+
+    async def interrupt(self, force: bool = False) -> None:
+        self.calls.append("interrupt")
+
+    async def generate_reply(self) -> None:
+        self.calls.append("generate_reply")
+
+
+def _agent(monkeypatch, agent_state: str, speech_text: str) -> tuple[Reservation, FakeSession]:
+    userdata = UserData()
+    speech = SimpleNamespace(id="speech_1")
+    record = userdata.speech_ledger.track("speech_1", "Reservation")
+    record.llm_text = speech_text
+    record.tts_chars = len(speech_text)
+    session = FakeSession(userdata, agent_state, speech)
+    monkeypatch.setattr(Reservation, "session", property(lambda self: session))
+    agent = Reservation(None)
+    agent._userdata = userdata
+    return agent, session
+
+
+def test_non_urgent_update_is_deferred_while_speaking(monkeypatch) -> None:
+    agent, session = _agent(monkeypatch, "speaking", "We have a lovely table by the window.")
+
+    async def main() -> None:
+        agent._queue_llm_update("User updated form 'booking' with values: {'customer_name': 'Priya'}", frozenset({"customer_name"}))
+        await agent._debounced_reply(delay=0)
+        agent._cancel_deferred_reply()
+
+    asyncio.run(main())
+
+    assert session.calls == []
+    assert agent.chat_ctx.items[-1].text_content.startswith("[UI Updates]")
+    assert agent._ui_stats.summary()["deferred"] == 1
+
+
+def test_invalidating_update_interrupts_and_records_the_waste(monkeypatch) -> None:
+    agent, session = _agent(monkeypatch, "speaking", "Could I get your phone number?")
+
+    async def main() -> None:
+        agent._queue_llm_update(PHONE.text, PHONE.fields)
+        await agent._debounced_reply(delay=0)
+
+    asyncio.run(main())
+
+    assert session.calls == ["interrupt", "generate_reply"]
+    summary = agent._ui_stats.summary()
+    assert summary["interrupted"] == 1
+    assert summary["wasted_tts_chars"] == 30
+    assert summary["wasted_llm_tokens"] == 8
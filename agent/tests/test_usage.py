@@ -0,0 +1,96 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+from livekit.agents.metrics import LLMMetrics, STTMetrics, TTSMetrics
+from livekit.agents.metrics.base import Metadata
+
+from src.usage import RateTable, UsageLedger, usage_scope
+
+RATES = {
+    "llm": {"groq": {"llama-3.3-70b-versatile": (0.59, 0.79)}, "mistral": {"mistral-large-latest": (2.0, 6.0)}},
+    "tts": {"deepgram": {"aura-2-thalia-en": 30.0}},
+    "stt": {"deepgram": {"nova-3": 0.0077}},
+}
+
+
+def _llm(model: str, prompt: int, completion: int, speech_id: str | None = None) -> SimpleNamespace:
+    return SimpleNamespace(metrics=LLMMetrics(
+        label="llm", request_id="r", timestamp=0.0, duration=1.0, ttft=0.1, cancelled=False,
+        completion_tokens=completion, prompt_tokens=prompt, prompt_cached_tokens=0,
+        total_tokens=prompt + completion, tokens_per_second=0.0, speech_id=speech_id,
+        metadata=Metadata(model_name=model, model_provider="api.groq.com"),
+    ))
+
+
+def _tts(characters: int, speech_id: str) -> SimpleNamespace:
+    return SimpleNamespace(metrics=TTSMetrics(
+        label="tts", request_id="r", timestamp=0.0, ttfb=0.1, duration=1.0, audio_duration=1.0,
+        cancelled=False, characters_count=characters, streamed=True, speech_id=speech_id,
+        metadata=Metadata(model_name="aura-2-thalia-en", model_provider="Deepgram"),
+    ))
+
+
+def _stt(seconds: float) -> SimpleNamespace:
+    return SimpleNamespace(metrics=STTMetrics(
+        label="stt", request_id="r", timestamp=0.0, duration=0.0, audio_duration=seconds, streamed=True,
+        metadata=Metadata(model_name="nova-3", model_provider="Deepgram"),
+    ))
+
+
+def test_rate_table_costs() -> None:
+    rates = RateTable(RATES)
+    assert rates.llm_cost("mistral-large-latest", 1_000_000, 100_000) == pytest.approx(2.6)
+    assert rates.tts_cost("aura-2-thalia-en", 1000) == pytest.approx(0.03)
+    assert rates.stt_cost("nova-3", 120) == pytest.approx(0.0154)
+    assert rates.llm_cost("unknown-model", 1000, 1000) == 0.0
+
+
+def test_rate_table_file_overrides(tmp_path) -> None:
+    path = tmp_path / "rates.json"
+    path.write_text(json.dumps({"llm": {"groq": {"llama-3.3-70b-versatile": [1.0, 1.0]}, "openai": {"gpt-4o": [2.5, 10.0]}}}))
+    rates = RateTable(RATES, str(path))
+    assert rates.llm_cost("llama-3.3-70b-versatile", 1_000_000, 0) == pytest.approx(1.0)
+    assert rates.llm_cost("gpt-4o", 0, 1_000_000) == pytest.approx(10.0)
+    assert rates.llm_cost("mistral-large-latest", 1_000_000, 0) == pytest.approx(2.0)
+
+
+def test_usage_is_attributed_per_activation_turn_and_scope() -> None:
+    ledger = UsageLedger(RateTable(RATES))
+    ledger.begin_activation("Greeter")
+    ledger.on_metrics_collected(_llm("llama-3.3-70b-versatile", 1000, 100, speech_id="s1"))
+    ledger.on_metrics_collected(_tts(50, speech_id="s1"))
+    ledger.on_metrics_collected(_stt(30.0))
+
+    assert ledger.begin_activation("Reservation") == "Reservation#1"
+    with usage_scope("handoff_summary"):
+        ledger.on_metrics_collected(_llm("mistral-large-latest", 2000, 200, speech_id="s1"))
+    # A late metric of the Greeter's reply stays with the Greeter
+    ledger.on_metrics_collected(_llm("llama-3.3-70b-versatile", 500, 0, speech_id="s1"))
+    ledger.on_metrics_collected(_llm("mistral-large-latest", 1500, 50, speech_id="s2"))
+
+    report = ledger.report()
+    greeter = report["per_activation"]["Greeter#1"]
+    assert greeter["llm_prompt_tokens"] == 1500
+    assert greeter["tts_characters"] == 50
+    assert greeter["stt_seconds"] == 30.0
+    assert report["per_activation"]["Reservation#1"]["total_tokens"] == 3750
+
+    turns = {(t["activation"], t["turn"]): t for t in report["per_turn"]}
+    assert turns[("Reservation#1", "handoff_summary")]["cost"] == pytest.approx(0.0052)
+    assert turns[("Greeter#1", "stt")]["stt_seconds"] == 30.0
+    assert report["total"]["cost"] == pytest.approx(sum(u["cost"] for u in report["per_activation"].values()))
+    assert set(report["per_model"]) == {"llama-3.3-70b-versatile", "mistral-large-latest", "aura-2-thalia-en", "nova-3"}
+
+
+def test_reentered_agent_gets_a_new_activation() -> None:
+    ledger = UsageLedger(RateTable(RATES))
+    ledger.begin_activation("Greeter")
+    ledger.on_metrics_collected(_llm("llama-3.3-70b-versatile", 100, 10, speech_id="s1"))
+    ledger.begin_activation("Reservation")
+    ledger.begin_activation("Greeter")
+    ledger.on_metrics_collected(_llm("llama-3.3-70b-versatile", 200, 20, speech_id="s2"))
+
+    assert ledger.activation_usage()["llm_prompt_tokens"] == 200
+    assert ledger.activation_usage("Greeter#1")["llm_prompt_tokens"] == 100
+    assert ledger.report()["per_agent"]["Greeter"]["total_tokens"] == 330
@@ -0,0 +1,42 @@
+from datetime import timedelta
+
+from src.datetime_resolver import restaurant_now
+from src.validators import validate_booking_fields
+
+
+def test_valid_fields_are_cleaned() -> None:
+    tomorrow = (restaurant_now() + timedelta(days=1)).date().isoformat()
+    clean, errors = validate_booking_fields({
+        "customer_name": "  Priya ",
+        "no_of_guests": "4",
+        "reservation_date": "tomorrow",
+        "reservation_time": "8 pm",
+        "special_requests": "",
+    })
+    assert errors == {}
+    assert clean == {
+        "customer_name": "Priya",
+        "no_of_guests": 4,
+        "reservation_date": tomorrow,
+        "reservation_time": "20:00",
+        "special_requests": "none",
+    }
+
+
+def test_errors_are_reported_per_field() -> None:
+    clean, errors = validate_booking_fields({
+        "customer_name": "Priya",
+        "customer_phone": "98765",
+        "no_of_guests": 40,
+        "table_colour": "red",
+    })
+    assert clean == {"customer_name": "Priya"}
+    assert set(errors) == {"customer_phone", "no_of_guests", "table_colour"}
+    assert "10 digits" in errors["customer_phone"]
+
+
+def test_time_is_checked_against_the_saved_date() -> None:
+    yesterday = (restaurant_now() - timedelta(days=1)).date().isoformat()
+    clean, errors = validate_booking_fields({"reservation_time": "8 pm"}, saved={"reservation_date": yesterday})
+    assert clean == {}
+    assert "already passed" in errors["reservation_time"]